@@ -0,0 +1,138 @@
+# app/admission.py
+"""
+Request admission control.
+
+Every API request passes through ``AdmissionMiddleware`` before routing:
+
+1. The ``global_ip`` rate-limit budget (see ratelimit.py) is charged to the
+   client IP; over budget gets 429 with Retry-After.
+2. The request takes one of ADMISSION_MAX_INFLIGHT slots. Defaults to twice
+   the DB pool (DB_POOL_SIZE + DB_MAX_OVERFLOW), so requests wait here
+   rather than inside the pool, where a request holding a session and
+   waiting DB_POOL_TIMEOUT for a connection ties up everything behind it.
+   If no slot is free, up to ADMISSION_MAX_QUEUE requests wait for at most
+   ADMISSION_QUEUE_TIMEOUT seconds. Anything beyond that is shed at once
+   with 503 and Retry-After, the same answer the hash pool gives.
+
+Health checks, metrics, static uploads, API docs, CORS preflights and the
+long-lived notification stream bypass both checks. Set
+ADMISSION_MAX_INFLIGHT=0 to disable the gate.
+"""
+import asyncio
+import math
+import os
+import threading
+import time
+
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers
+
+from .database import DB_MAX_OVERFLOW, DB_POOL_SIZE
+from .metrics import register_metrics
+from .ratelimit import client_ip, limiter
+
+ADMISSION_MAX_INFLIGHT = int(os.getenv("ADMISSION_MAX_INFLIGHT", str((DB_POOL_SIZE + DB_MAX_OVERFLOW) * 2)))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", str(ADMISSION_MAX_INFLIGHT * 4)))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "5"))
+
+EXEMPT_PREFIXES = ("/health", "/metrics", "/uploads", "/notifications/stream", "/docs", "/redoc", "/openapi.json")
+
+
+class AdmissionGate:
+    def __init__(self, max_inflight: int = ADMISSION_MAX_INFLIGHT, max_queue: int = ADMISSION_MAX_QUEUE,
+                 queue_timeout: float = ADMISSION_QUEUE_TIMEOUT):
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = None
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "in_flight": 0,
+            "queued": 0,
+            "admitted": 0,
+            "shed": 0,
+            "total_wait_ms": 0.0,
+        }
+
+    def _get_semaphore(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_inflight)
+        return self._semaphore
+
+    def _bump(self, **deltas):
+        with self._metrics_lock:
+            for key, value in deltas.items():
+                self._metrics[key] += value
+
+    async def acquire(self) -> bool:
+        """Take a slot. Returns False if the request should be shed."""
+        sem = self._get_semaphore()
+        if sem.locked() and self._metrics["queued"] >= self.max_queue:
+            self._bump(shed=1)
+            return False
+
+        queued_at = time.perf_counter()
+        self._bump(queued=1)
+        try:
+            await asyncio.wait_for(sem.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._bump(shed=1)
+            return False
+        finally:
+            self._bump(queued=-1)
+        self._bump(in_flight=1, admitted=1, total_wait_ms=(time.perf_counter() - queued_at) * 1000)
+        return True
+
+    def release(self):
+        self._get_semaphore().release()
+        self._bump(in_flight=-1)
+
+    def metrics(self):
+        with self._metrics_lock:
+            data = dict(self._metrics)
+        data.update({
+            "max_inflight": self.max_inflight,
+            "max_queue": self.max_queue,
+            "avg_wait_ms": round(data.pop("total_wait_ms") / (data["admitted"] or 1), 3),
+        })
+        return data
+
+
+gate = AdmissionGate()
+register_metrics("admission", gate.metrics)
+
+
+def _reject(status_code: int, detail: str, retry_after: int):
+    return ORJSONResponse({"detail": detail}, status_code=status_code, headers={"Retry-After": str(retry_after)})
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, gate: AdmissionGate = gate):
+        self.app = app
+        self.gate = gate
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"].startswith(EXEMPT_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        wait = await limiter.hit("global_ip", client_ip(Headers(scope=scope), scope.get("client")))
+        if wait:
+            response = _reject(429, "Too many requests, please slow down", max(1, math.ceil(wait)))
+            await response(scope, receive, send)
+            return
+
+        if self.gate.max_inflight <= 0:
+            await self.app(scope, receive, send)
+            return
+        if not await self.gate.acquire():
+            await _reject(503, "Server busy, please retry", 1)(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.gate.release()
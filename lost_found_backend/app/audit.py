@@ -0,0 +1,221 @@
+# app/audit.py
+"""
+Batched, asynchronous audit log (``history`` and ``session_audit``).
+
+Handlers call ``await audit.history(...)`` / ``await audit.login(...)``
+after their own commit. That only appends to an in-memory buffer; a
+background task writes the buffer with one multi-row INSERT per table
+whenever AUDIT_BATCH_SIZE events are waiting or AUDIT_FLUSH_INTERVAL
+seconds have passed, and once more on shutdown.
+
+Backpressure: at most AUDIT_MAX_PENDING events are buffered. When the
+buffer is full (the database is slow or down) callers wait up to
+AUDIT_MAX_WAIT seconds for the next flush to make room, then the event is
+dropped and counted, so auditing can slow a request down but never hang
+it.
+
+Failures: each table is written in its own transaction. If the database
+is unreachable the rows go back to the buffer (space permitting) for the
+next flush. If it rejects the batch itself (a bad row), the rows are
+retried one by one so the good ones go through. A row rejected
+AUDIT_MAX_ATTEMPTS times is logged as dead-lettered and discarded, so
+it can never hold up the rows behind it.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime
+
+from sqlalchemy import insert, text
+
+from .database import AsyncSessionLocal
+from .metrics import register_metrics
+from .models import History, SessionAudit
+
+logger = logging.getLogger(__name__)
+
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1"))
+AUDIT_MAX_PENDING = int(os.getenv("AUDIT_MAX_PENDING", "10000"))
+AUDIT_MAX_WAIT = float(os.getenv("AUDIT_MAX_WAIT", "0.5"))
+AUDIT_MAX_ATTEMPTS = int(os.getenv("AUDIT_MAX_ATTEMPTS", "3"))
+
+_TABLES = {"history": History, "session_audit": SessionAudit}
+
+
+class AuditWriter:
+    def __init__(self):
+        self._pending = []  # [(table, row, failed_attempts), ...] in arrival order
+        self._wake = None
+        self._space = None
+        self._task = None
+        self._stats = {
+            "recorded": 0, "written": 0, "batches": 0, "dropped": 0, "dead_lettered": 0,
+            "waits": 0, "failures": 0,
+        }
+
+    # --------------------------------------------------------
+    # Recording
+    # --------------------------------------------------------
+    def _ensure_started(self):
+        # One flusher per event loop (a restarted loop, e.g. in tests, gets
+        # a new one)
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._wake = asyncio.Event()
+            self._space = asyncio.Event()
+            self._task = loop.create_task(self._run(self._wake))
+
+    async def record(self, table: str, row: dict):
+        self._ensure_started()
+        if len(self._pending) >= AUDIT_MAX_PENDING:
+            self._stats["waits"] += 1
+            self._wake.set()
+            self._space.clear()
+            try:
+                await asyncio.wait_for(self._space.wait(), AUDIT_MAX_WAIT)
+            except asyncio.TimeoutError:
+                pass
+            if len(self._pending) >= AUDIT_MAX_PENDING:
+                self._stats["dropped"] += 1
+                return
+        self._pending.append((table, row, 0))
+        self._stats["recorded"] += 1
+        if len(self._pending) >= AUDIT_BATCH_SIZE:
+            self._wake.set()
+
+    async def history(self, item_id, action: str, details: str = None, user_id=None):
+        await self.record("history", {
+            "item_id": item_id,
+            "action": action[:80],
+            "action_details": details,
+            "action_by": user_id,
+            "action_on": datetime.now(),
+        })
+
+    async def login(self, user_id, ip_address: str = None):
+        await self.record("session_audit", {
+            "user_id": user_id,
+            "login_time": datetime.now(),
+            "ip_address": (ip_address or "")[:45] or None,
+        })
+
+    # --------------------------------------------------------
+    # Flushing
+    # --------------------------------------------------------
+    async def _run(self, wake: asyncio.Event):
+        while True:
+            try:
+                await asyncio.wait_for(wake.wait(), AUDIT_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+            await self.flush()
+
+    async def _insert(self, table: str, rows):
+        async with AsyncSessionLocal() as db:
+            # One INSERT ... VALUES (...), (...), ... per table
+            await db.execute(insert(_TABLES[table]).values(rows))
+            await db.commit()
+
+    async def _reachable(self):
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(text("SELECT 1"))
+            return True
+        except Exception:
+            return False
+
+    def _requeue(self, entries):
+        room = AUDIT_MAX_PENDING - len(self._pending)
+        self._stats["dropped"] += max(len(entries) - room, 0)
+        self._pending = entries[:max(room, 0)] + self._pending
+
+    def _rejected(self, table: str, row: dict, attempts: int):
+        """A row the database refused: retry later, or dead-letter it."""
+        if attempts >= AUDIT_MAX_ATTEMPTS:
+            self._stats["dead_lettered"] += 1
+            logger.error("Dead-lettered %s audit row after %d attempts: %r", table, attempts, row)
+            return []
+        return [(table, row, attempts)]
+
+    async def _write_table(self, table: str, entries):
+        """
+        Write one table's share of a batch. Returns (written, retry), where
+        retry holds the entries to put back; raises if the database is
+        unreachable.
+        """
+        try:
+            await self._insert(table, [row for _, row, _ in entries])
+            return len(entries), []
+        except Exception:
+            if not await self._reachable():
+                raise
+            self._stats["failures"] += 1
+            logger.exception("Audit insert of %d %s rows failed, retrying them one by one", len(entries), table)
+
+        # The database is up but refused the statement: find the offending rows
+        written, retry = 0, []
+        for _, row, attempts in entries:
+            try:
+                await self._insert(table, [row])
+                written += 1
+            except Exception:
+                if not await self._reachable():
+                    raise
+                retry += self._rejected(table, row, attempts + 1)
+        return written, retry
+
+    async def flush(self):
+        """Write everything buffered so far. Returns the number of rows written."""
+        written = 0
+        while self._pending:
+            batch, self._pending = self._pending[:AUDIT_BATCH_SIZE], self._pending[AUDIT_BATCH_SIZE:]
+            by_table = {}
+            for entry in batch:
+                by_table.setdefault(entry[0], []).append(entry)
+            retry = []
+            try:
+                for table, entries in list(by_table.items()):
+                    done, failed = await self._write_table(table, entries)
+                    del by_table[table]
+                    written += done
+                    self._stats["written"] += done
+                    retry += failed
+            except asyncio.CancelledError:
+                # Interrupted mid-write; close() retries these rows
+                self._pending = retry + [e for entries in by_table.values() for e in entries] + self._pending
+                raise
+            except Exception:
+                # Database unreachable: keep the unwritten rows for the next flush
+                self._stats["failures"] += 1
+                logger.exception("Audit flush failed")
+                self._requeue(retry + [e for entries in by_table.values() for e in entries])
+                break
+            finally:
+                if self._space is not None:
+                    self._space.set()
+            self._stats["batches"] += 1
+            if retry:
+                # Rejected rows wait for the next flush rather than looping now
+                self._requeue(retry)
+                break
+        return written
+
+    async def close(self):
+        """Stop the background task and write what is left (shutdown)."""
+        if self._task is not None and self._task.get_loop() is asyncio.get_running_loop():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self.flush()
+
+    def metrics(self):
+        return {**self._stats, "pending": len(self._pending)}
+
+
+audit = AuditWriter()
+register_metrics("audit", audit.metrics)
@@ -1,15 +1,22 @@
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Optional
 import os
+import threading
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 from dotenv import load_dotenv
 
-from .database import get_db
-from .models import UserAccount
+from .cache import make_cache_backend
+from .database import AppSession, after_commit, get_db
+from .hashing import verify_password_async, get_password_hash_async
+from .metrics import register_metrics
+from .models import Role, UserAccount
 from .schemas import TokenData
 
 load_dotenv()
@@ -17,43 +24,31 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY", "secret")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
-
-pwd_context = CryptContext(
-    schemes=["bcrypt_sha256"],
-    deprecated="auto"
-)
+# Lifetime of a notification stream ticket (see create_stream_ticket)
+STREAM_TICKET_SECONDS = int(os.getenv("STREAM_TICKET_SECONDS", "60"))
+STREAM_TICKET_SCOPE = "notifications:stream"
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "4096"))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-# -------------------------------
-# Password hashing + verification
-# -------------------------------
-def verify_password(plain_password: str, hashed_password: str):
-    try:
-        return pwd_context.verify(plain_password, hashed_password)
-    except Exception:
-        return False
-
-
-def get_password_hash(password: str):
-    # bcrypt only supports up to 72 bytes
-    if len(password) > 72:
-        password = password[:72]
-    return pwd_context.hash(password)
-
-
 # -------------------------------
 # User helpers
 # -------------------------------
-def get_user_by_roll_number(db: Session, roll_number: str):
-    return db.query(UserAccount).filter(UserAccount.roll_number == roll_number).first()
+async def get_user_by_roll_number(db: AsyncSession, roll_number: str):
+    return (await db.scalars(
+        select(UserAccount)
+        .options(joinedload(UserAccount.role))
+        .where(UserAccount.roll_number == roll_number)
+    )).first()
 
 
-def authenticate_user(db: Session, roll_number: str, password: str):
-    user = get_user_by_roll_number(db, roll_number)
+async def authenticate_user(db: AsyncSession, roll_number: str, password: str):
+    # bcrypt runs in the hashing pool so it doesn't block the event loop.
+    user = await get_user_by_roll_number(db, roll_number)
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    if not await verify_password_async(password, user.password_hash):
         return None
     return user
 
@@ -68,7 +63,108 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def create_stream_ticket(user_id: int):
+    """
+    Short-lived token for GET /notifications/stream, which EventSource can
+    only authenticate through the query string. Unlike the access token it
+    may end up in access logs, so it expires after STREAM_TICKET_SECONDS and
+    is accepted by the stream alone.
+    """
+    return create_access_token(
+        {"sub": str(user_id), "scope": STREAM_TICKET_SCOPE},
+        expires_delta=timedelta(seconds=STREAM_TICKET_SECONDS),
+    )
+
+
+# -------------------------------
+# Authenticated principal cache
+# -------------------------------
+@dataclass
+class Principal:
+    """The subset of a user every authenticated request needs."""
+    user_id: int
+    name: str
+    role_name: Optional[str]
+
+
+# Keyed by the token subject (user_id). With CACHE_URL set the cache lives
+# in Redis and is shared by all workers; otherwise each worker keeps its
+# own copy and PRINCIPAL_CACHE_TTL bounds how stale another worker's entry
+# can get after an invalidation.
+principal_cache = make_cache_backend("principal", PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL)
+
+_stats_lock = threading.Lock()
+_principal_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def _count(key: str):
+    with _stats_lock:
+        _principal_stats[key] += 1
+
+
+async def load_principal(db: AsyncSession, user_id: int):
+    row = (await db.execute(
+        select(UserAccount.user_id, UserAccount.name, Role.role_name)
+        .outerjoin(Role, Role.role_id == UserAccount.role_id)
+        .where(UserAccount.user_id == user_id)
+    )).first()
+    return Principal(row.user_id, row.name, row.role_name) if row else None
+
+
+async def invalidate_principal(user_id: int):
+    await principal_cache.delete(str(user_id))
+    _count("invalidations")
+
+
+async def invalidate_all_principals():
+    await principal_cache.clear()
+    _count("invalidations")
+
+
+def principal_cache_metrics():
+    with _stats_lock:
+        data = dict(_principal_stats)
+    data["backend"] = type(principal_cache).__name__
+    return data
+
+
+register_metrics("principal_cache", principal_cache_metrics)
+
+
+# Invalidate after the transaction that changed a user or role commits, so
+# a concurrent request can't re-cache the old row in between.
+@event.listens_for(UserAccount, "after_update")
+@event.listens_for(UserAccount, "after_delete")
+def _queue_user_invalidation(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("invalidate_principals", set()).add(target.user_id)
+
+
+@event.listens_for(Role, "after_update")
+@event.listens_for(Role, "after_delete")
+def _queue_role_invalidation(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info["invalidate_all_principals"] = True
+
+
+@event.listens_for(AppSession, "after_commit")
+def _apply_principal_invalidations(session):
+    if session.info.pop("invalidate_all_principals", False):
+        after_commit(session, invalidate_all_principals)
+    for user_id in session.info.pop("invalidate_principals", ()):
+        after_commit(session, partial(invalidate_principal, user_id))
+
+
+@event.listens_for(AppSession, "after_rollback")
+def _discard_principal_invalidations(session):
+    session.info.pop("invalidate_all_principals", None)
+    session.info.pop("invalidate_principals", None)
+
+
+async def _principal_from_token(token: str, db: AsyncSession, scope: Optional[str] = None):
+    """The user a token names. ``scope`` must match the token's (None for access tokens)."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -78,7 +174,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id_str: str = payload.get("sub")
-        if user_id_str is None:
+        if user_id_str is None or payload.get("scope") != scope:
             raise credentials_exception
 
         token_data = TokenData(user_id=int(user_id_str))
@@ -86,19 +182,36 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except Exception:
         raise credentials_exception
 
-    user = db.query(UserAccount).filter(UserAccount.user_id == token_data.user_id).first()
-    if user is None:
+    key = str(token_data.user_id)
+    cached = await principal_cache.get(key)
+    if cached is not None:
+        _count("hits")
+        return Principal(**cached)
+
+    _count("misses")
+    principal = await load_principal(db, token_data.user_id)
+    if principal is None:
         raise credentials_exception
 
-    return user
+    await principal_cache.set(key, asdict(principal))
+    return principal
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
+    return await _principal_from_token(token, db)
+
+
+async def get_stream_user(ticket: str, db: AsyncSession):
+    """The user a stream ticket was issued to; access tokens are refused."""
+    return await _principal_from_token(ticket, db, scope=STREAM_TICKET_SCOPE)
 
 
-async def get_current_active_user(current_user: UserAccount = Depends(get_current_user)):
+async def get_current_active_user(current_user: Principal = Depends(get_current_user)):
     return current_user
 
 
-def check_admin_permission(current_user: UserAccount = Depends(get_current_active_user)):
-    if current_user.role.role_name != "admin":
+def check_admin_permission(current_user: Principal = Depends(get_current_active_user)):
+    if current_user.role_name != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
@@ -0,0 +1,148 @@
+# app/cache.py
+"""
+Small key/value cache backends shared by the in-process caches.
+
+``MemoryCacheBackend`` is a thread-safe TTL + LRU map local to one worker.
+``RedisCacheBackend`` stores JSON values in Redis so every uvicorn worker
+sees the same entries and invalidations; it needs the optional ``redis``
+package and is selected by setting ``CACHE_URL`` (e.g. ``redis://host:6379/0``).
+
+Both backends are async: Redis is reached through ``redis.asyncio``, so a
+cache lookup on the request path yields the event loop instead of blocking
+it. Connections belong to the event loop that opened them, so a backend
+keeps one client per loop (scripts running ``asyncio.run`` get their own).
+
+Values must be JSON-serialisable so both backends behave the same.
+"""
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+CACHE_URL = os.getenv("CACHE_URL")
+
+
+class CacheBackend:
+    async def get(self, key: str):
+        raise NotImplementedError
+
+    async def set(self, key: str, value, ttl: float = None):
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+    async def clear(self):
+        raise NotImplementedError
+
+    async def incr(self, key: str):
+        """Atomically increment an integer counter and return the new value."""
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    async def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    async def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    async def incr(self, key: str):
+        with self._lock:
+            value, _ = self._data.get(key, (0, None))
+            value += 1
+            self._data[key] = (value, None)
+            return value
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisClients:
+    """One ``redis.asyncio`` client per event loop for ``url``."""
+
+    def __init__(self, url: str, setting: str = "CACHE_URL"):
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            raise RuntimeError(f"{setting} is set but the 'redis' package is not installed")
+        self._from_url = aioredis.Redis.from_url
+        self.url = url
+        self._clients = weakref.WeakKeyDictionary()
+
+    def get(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = self._from_url(self.url)
+        return client
+
+
+class RedisCacheBackend(CacheBackend):
+    def __init__(self, url: str, namespace: str, ttl: float = 60):
+        self._clients = RedisClients(url)
+        self.prefix = f"lf:{namespace}:"
+        self.ttl = ttl
+
+    async def get(self, key: str):
+        raw = await self._clients.get().get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        # Milliseconds, rounded up: sub-second TTLs (e.g. replica pins) must
+        # not become 0, which Redis rejects
+        px = math.ceil(ttl * 1000) if ttl else None
+        await self._clients.get().set(self.prefix + key, json.dumps(value), px=px)
+
+    async def delete(self, key: str):
+        await self._clients.get().delete(self.prefix + key)
+
+    async def clear(self):
+        client = self._clients.get()
+        keys = [key async for key in client.scan_iter(match=self.prefix + "*")]
+        if keys:
+            await client.delete(*keys)
+
+    async def incr(self, key: str):
+        return int(await self._clients.get().incr(self.prefix + key))
+
+
+def make_cache_backend(namespace: str, maxsize: int = 1024, ttl: float = 60) -> CacheBackend:
+    """Shared backend when CACHE_URL is configured, per-process memory otherwise."""
+    if CACHE_URL:
+        return RedisCacheBackend(CACHE_URL, namespace, ttl)
+    return MemoryCacheBackend(maxsize, ttl)
@@ -0,0 +1,159 @@
+# app/compression.py
+"""
+Response compression (Brotli or gzip, whichever the client prefers).
+
+Bodies smaller than COMPRESS_MIN_SIZE bytes are sent as they are: below
+roughly a packet the CPU buys nothing. Only text-like media types are
+compressed (JSON, text/*, JavaScript, SVG); images are already compressed.
+Server-sent event streams are never buffered or compressed, so events
+still reach the client as soon as they are sent.
+
+Brotli needs the optional ``brotli`` package; without it clients get
+gzip. A compressed response's ETag is made weak, since the bytes differ
+from the identity encoding (conditional GETs compare weakly anyway).
+"""
+import gzip
+import os
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+
+_COMPRESSIBLE = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def choose_encoding(accept_encoding: str):
+    """Best supported coding from an Accept-Encoding header, or None."""
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[name.strip()] = q
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best = max(candidates, key=lambda c: (offered.get(c, offered.get("*", 0)), c == "br"))
+    return best if offered.get(best, offered.get("*", 0)) > 0 else None
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._obj = brotli.Compressor(quality=BROTLI_QUALITY)
+            self.compress, self._finish = self._obj.process, self._obj.finish
+        else:
+            self._obj = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self.compress, self._finish = self._obj.compress, self._obj.flush
+
+    def finish(self):
+        return self._finish()
+
+
+def compress(body: bytes, encoding: str):
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _Responder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class _Responder:
+    """Holds back the response start until the first body chunk shows whether to compress."""
+
+    def __init__(self, app, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send = None
+        self.start = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.wrapped_send)
+
+    def _eligible(self, headers: Headers):
+        content_type = headers.get("content-type", "")
+        return (
+            self.start["status"] not in (204, 304)
+            and "content-encoding" not in headers
+            and not content_type.startswith("text/event-stream")
+            and content_type.startswith(_COMPRESSIBLE)
+        )
+
+    def _mark_compressed(self, headers: MutableHeaders):
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+
+    async def wrapped_send(self, message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            if not self._eligible(headers) or (not more and len(body) < self.minimum_size):
+                # Sent as is
+                if self._eligible(headers):
+                    headers.add_vary_header("Accept-Encoding")
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self._mark_compressed(headers)
+            if not more:
+                # Whole body in one message (the usual JSON response)
+                body = compress(body, self.encoding)
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            # Streamed body: compress chunk by chunk
+            del headers["Content-Length"]
+            self.compressor = _Compressor(self.encoding)
+            await self.send(self.start)
+
+        chunk = self.compressor.compress(body)
+        if not more:
+            chunk += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more})
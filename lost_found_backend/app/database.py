@@ -1,33 +1,372 @@
+import asyncio
+import hashlib
+import logging
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.requests import HTTPConnection
 from dotenv import load_dotenv
 
+from .cache import make_cache_backend
+from .instrumentation import instrument_engine
+from .metrics import register_metrics
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str, default: str):
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
 # Database configuration
 DB_USER = os.getenv("DB_USER", "app_user")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "password")
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_NAME = os.getenv("DB_NAME", "lost_found_portal")
 
-SQLALCHEMY_DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}?charset=utf8mb4"
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_recycle=3600,   # Recycle connections after 1 hour
-    echo=False            # Set to True for SQL query logging
+# DATABASE_URL overrides the DB_* settings (e.g. sqlite:///./test.db for tests)
+SQLALCHEMY_DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}?charset=utf8mb4",
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Optional read replica (same URL format). GET requests are served from it.
+DB_REPLICA_URL = os.getenv("DB_REPLICA_URL")
+
+# Connection pool, applied to every engine (per process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+DB_POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", "true")
+# LIFO reuses the most recently returned connection, letting the rest of an
+# oversized pool go idle and be recycled; FIFO spreads use evenly.
+DB_POOL_USE_LIFO = _env_flag("DB_POOL_USE_LIFO", "false")
+
+# After a client commits a write, its reads go to the primary for this long
+# so it always sees its own changes despite replica lag.
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+
+# Blocking driver -> asyncio driver for the same database
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str):
+    url = make_url(url)
+    return url.set(drivername=_ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+
+ASYNC_DATABASE_URL = async_database_url(SQLALCHEMY_DATABASE_URL)
+
+
+# --------------------------------------------------------
+# Pool instrumentation
+# --------------------------------------------------------
+class PoolStats:
+    """Checkout wait times and timeouts for one engine's pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def snapshot(self, pool):
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(1000 * self.wait_total / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(1000 * self.wait_max, 3),
+            }
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        data.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "saturation": round(pool.checkedout() / capacity, 3) if capacity else None,
+        })
+        return data
+
+
+def _timed_pool(base, stats: PoolStats):
+    # A subclass per engine, so the stats survive pool.recreate() (which
+    # builds a new instance of the same class on dispose/invalidation).
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = base._do_get(self)
+        except sa_exc.TimeoutError:
+            stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        stats.record(time.perf_counter() - start)
+        return conn
+
+    return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+_pools = {}
+
+
+def _make_engine(url, label: str, is_async: bool):
+    options = {
+        "pool_pre_ping": DB_POOL_PRE_PING,  # Verify connections before using
+        "pool_recycle": DB_POOL_RECYCLE,    # Recycle connections after this many seconds
+        "echo": False,                      # Set to True for SQL query logging
+    }
+    url = make_url(url)
+    # In-memory SQLite needs its single-connection pool; everything else
+    # gets a sized, instrumented queue pool.
+    if not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")):
+        stats = PoolStats()
+        options.update(
+            poolclass=_timed_pool(AsyncAdaptedQueuePool if is_async else QueuePool, stats),
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_use_lifo=DB_POOL_USE_LIFO,
+        )
+    engine = (create_async_engine if is_async else create_engine)(url, **options)
+    instrument_engine(getattr(engine, "sync_engine", engine))
+    if "poolclass" in options:
+        _pools[label] = (getattr(engine, "sync_engine", engine), stats)
+    return engine
+
+
+def pool_metrics():
+    return {label: stats.snapshot(engine.pool) for label, (engine, stats) in _pools.items()}
+
+
+register_metrics("db_pool", pool_metrics)
+
+
+class AppSession(Session):
+    """
+    Session class behind both factories below. Session events are registered
+    on it so they fire for request (async) and script (sync) sessions alike.
+    """
+
+    def commit(self):
+        super().commit()
+        if not self.info.get("_async"):
+            _run_detached(self.info.pop("after_commit", None))
+
+
+class AppAsyncSession(AsyncSession):
+    """Request sessions: awaits the ``after_commit`` callbacks in commit()."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sync_session.info["_async"] = True
+
+    async def commit(self):
+        await super().commit()
+        await _run_callbacks(self.info.pop("after_commit", None))
+
+
+def after_commit(session, fn):
+    """
+    Run the coroutine function ``fn`` once ``session`` has committed; meant
+    for ``after_commit`` event hooks, which cannot await. A request session
+    awaits it before ``commit()`` returns; a script or worker-thread session
+    runs it on a temporary event loop. Dropped if the transaction rolls back.
+    """
+    session.info.setdefault("after_commit", []).append(fn)
+
+
+async def _run_callbacks(fns):
+    for fn in fns or ():
+        try:
+            await fn()
+        except Exception:
+            # The transaction is already committed; a cache that missed an
+            # update only serves stale data until its TTL runs out
+            logger.exception("after_commit callback failed")
+
+
+_detached_tasks = set()
+
+
+def _run_detached(fns):
+    if not fns:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(_run_callbacks(fns))
+        return
+    task = loop.create_task(_run_callbacks(fns))
+    _detached_tasks.add(task)
+    task.add_done_callback(_detached_tasks.discard)
+
+
+@event.listens_for(AppSession, "after_rollback")
+def _discard_after_commit(session):
+    session.info.pop("after_commit", None)
+
+
+class _Lazy:
+    """
+    Builds the wrapped engine or session factory on first use and then
+    forwards calls and attributes to it. Importing the app therefore loads
+    no DB driver and opens nothing; a worker touches the database only when
+    a request (or script) needs it.
+    """
+
+    def __init__(self, build):
+        self._build = build
+        self._obj = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self):
+        return self._obj is not None
+
+    def get(self):
+        if self._obj is None:
+            with self._lock:
+                if self._obj is None:
+                    self._obj = self._build()
+        return self._obj
+
+    def __call__(self, *args, **kwargs):
+        return self.get()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+# Synchronous engine: init_db.py, maintenance scripts and background tasks
+# that already run in a worker thread (e.g. image processing).
+engine = _Lazy(lambda: _make_engine(SQLALCHEMY_DATABASE_URL, "primary_sync", is_async=False))
+SessionLocal = _Lazy(lambda: sessionmaker(class_=AppSession, autocommit=False, autoflush=False, bind=engine.get()))
+
+# Async engine: everything on the request path. A request waiting on the
+# database yields the event loop instead of holding a threadpool slot.
+async_engine = _Lazy(lambda: _make_engine(ASYNC_DATABASE_URL, "primary", is_async=True))
+# expire_on_commit=False: attributes stay readable after commit without an
+# implicit (and, under asyncio, illegal) lazy refresh.
+AsyncSessionLocal = _Lazy(lambda: async_sessionmaker(
+    async_engine.get(),
+    class_=AppAsyncSession,
+    sync_session_class=AppSession,
+    autoflush=False,
+    expire_on_commit=False,
+))
+
+replica_engine = None
+ReplicaSessionLocal = None
+if DB_REPLICA_URL:
+    replica_engine = _Lazy(lambda: _make_engine(async_database_url(DB_REPLICA_URL), "replica", is_async=True))
+    ReplicaSessionLocal = _Lazy(lambda: async_sessionmaker(
+        replica_engine.get(),
+        class_=AppAsyncSession,
+        sync_session_class=AppSession,
+        autoflush=False,
+        expire_on_commit=False,
+        info={"replica": True},
+    ))
+
+
+async def dispose_engines():
+    """Close the pools of whichever engines this process actually created."""
+    if engine.built:
+        engine.dispose()
+    for lazy in (async_engine, replica_engine):
+        if lazy is not None and lazy.built:
+            await lazy.dispose()
 
 Base = declarative_base()
 
+
+# --------------------------------------------------------
+# Read/write routing
+# --------------------------------------------------------
+READ_METHODS = {"GET", "HEAD"}
+
+# Client keys that recently committed a write. With CACHE_URL set this is
+# shared, so stickiness holds whichever worker serves the next read.
+_pinned = make_cache_backend("primary_pin", maxsize=16384, ttl=DB_REPLICA_STICKY_SECONDS)
+_routing_lock = threading.Lock()
+_routing = {"primary": 0, "replica": 0, "pinned": 0}
+
+
+def _count_route(key: str):
+    with _routing_lock:
+        _routing[key] += 1
+
+
+def _client_key(conn: HTTPConnection):
+    # The bearer token identifies the user without a DB lookup; anonymous
+    # clients (e.g. just registered) fall back to their address.
+    raw = conn.headers.get("authorization") or (conn.client.host if conn.client else "")
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def routing_metrics():
+    with _routing_lock:
+        data = dict(_routing)
+    data["replica_configured"] = ReplicaSessionLocal is not None
+    return data
+
+
+register_metrics("db_routing", routing_metrics)
+
+
+@event.listens_for(AppSession, "after_commit")
+def _pin_client_to_primary(session):
+    key = session.info.get("client_key")
+    if key is not None:
+        after_commit(session, lambda: _pinned.set(key, 1))
+
+
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db(conn: HTTPConnection):
+    """
+    Reads (GET/HEAD) go to the replica when one is configured, unless the
+    same client committed a write in the last DB_REPLICA_STICKY_SECONDS.
+    Everything else goes to the primary.
+    """
+    factory = AsyncSessionLocal
+    key = None
+    if ReplicaSessionLocal is not None:
+        key = _client_key(conn)
+        # Each request counts under one route: "pinned" reads are served by
+        # the primary but are not included in "primary" (writes)
+        route = "primary"
+        if conn.scope.get("method") in READ_METHODS:
+            if await _pinned.get(key):
+                route = "pinned"
+            else:
+                factory = ReplicaSessionLocal
+                key = None
+                route = "replica"
+        _count_route(route)
+
+    async with factory() as db:
+        if key is not None:
+            db.info["client_key"] = key
         yield db
-    finally:
-        db.close()
\ No newline at end of file
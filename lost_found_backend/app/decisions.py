@@ -0,0 +1,239 @@
+# app/decisions.py
+"""
+Claim approval and rejection as one atomic, set-based operation.
+
+``decide_claims`` applies any number of decisions in the caller's
+transaction:
+
+1. The items of the claims being approved are locked (``SELECT ... FOR
+   UPDATE``), so competing approvals for one item queue up behind each
+   other instead of both succeeding. Items are always locked before claims,
+   which keeps concurrent approvals from deadlocking.
+2. The claims themselves are locked and checked: they must exist and still
+   be pending, and only one claim per item may be approved.
+3. Set-based UPDATEs mark the items claimed, the claims approved or
+   rejected, and reject every other pending claim on an approved item.
+
+Every UPDATE also repeats its precondition (``claim_status = 'pending'``,
+item still lost/found). On databases without row locks (SQLite) a racing
+writer therefore shows up as a row count mismatch, and the whole operation
+is abandoned with a 409 rather than half-applied.
+
+Item summaries are refreshed and notifications queued in the same
+transaction; the caller commits once.
+
+``set_report_statuses`` does the same for report status changes (one
+UPDATE per target status, plus one completing the items of resolved
+reports). Both back the admin bulk endpoints, which report an outcome per
+id instead of failing the whole request.
+"""
+import os
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import summary
+from .models import Claim, Item, Report
+from .notifications import notify_claim_decided
+
+APPROVE = "approve"
+REJECT = "reject"
+
+# Per-claim outcomes
+APPROVED = "approved"
+REJECTED = "rejected"
+NOT_FOUND = "not_found"
+ALREADY_DECIDED = "already_decided"
+ITEM_UNAVAILABLE = "item_unavailable"
+CONFLICT = "conflict"
+
+INVALID = "invalid"
+UPDATED = "updated"
+
+CLAIMABLE_ITEM_STATUSES = ("lost", "found")
+REPORT_STATUSES = ("open", "in_review", "resolved")
+
+# Largest batch the bulk endpoints accept
+BULK_MAX_DECISIONS = int(os.getenv("BULK_MAX_DECISIONS", "500"))
+
+
+def check_bulk(pairs, valid_values):
+    """
+    Validate a bulk request's ``[(id, value), ...]``. Returns ``(wanted,
+    results)``: the id -> value map to apply, and the outcome already fixed
+    for ids with an invalid value or listed twice with different values.
+    """
+    if len(pairs) > BULK_MAX_DECISIONS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_DECISIONS} entries per request")
+    wanted, results = {}, {}
+    for key, value in pairs:
+        if key in results:
+            continue
+        if value not in valid_values:
+            results[key] = INVALID
+            wanted.pop(key, None)
+        elif wanted.get(key, value) != value:
+            results[key] = CONFLICT
+            del wanted[key]
+        else:
+            wanted[key] = value
+    return wanted, results
+
+
+def _concurrent_change():
+    return HTTPException(status_code=409, detail="Claims changed concurrently, please retry")
+
+
+async def _set_claim_status(db: AsyncSession, claim_ids, status: str, admin_id: int, now: datetime):
+    if not claim_ids:
+        return
+    result = await db.execute(
+        update(Claim)
+        .where(Claim.claim_id.in_(claim_ids), Claim.claim_status == "pending")
+        .values(claim_status=status, decided_by=admin_id, decided_on=now)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != len(claim_ids):
+        raise _concurrent_change()
+
+
+async def decide_claims(db: AsyncSession, decisions: dict, admin_id: int):
+    """
+    ``decisions`` maps claim id -> APPROVE | REJECT. Returns
+    ``(results, auto_rejected)``: the outcome per requested claim id, and the
+    ids of other pending claims rejected because a claim on the same item
+    was approved. Raises 409 if a concurrent writer got in between.
+    """
+    results = {}
+    now = datetime.now()
+    approve_ids = [cid for cid, d in decisions.items() if d == APPROVE]
+
+    # 1. Lock the items being claimed, in a fixed order
+    items = {}
+    if approve_ids:
+        items = {item.item_id: item for item in await db.execute(
+            select(Item.item_id, Item.title, Item.created_by, Item.current_status)
+            .where(Item.item_id.in_(select(Claim.item_id).where(Claim.claim_id.in_(approve_ids))))
+            .order_by(Item.item_id)
+            .with_for_update()
+        )}
+
+    # 2. Lock and validate the claims
+    claims = {c.claim_id: c for c in await db.execute(
+        select(Claim.claim_id, Claim.item_id, Claim.claimer_id, Claim.claim_status)
+        .where(Claim.claim_id.in_(list(decisions)))
+        .order_by(Claim.claim_id)
+        .with_for_update()
+    )}
+    approvals_per_item = {}
+    for claim_id in approve_ids:
+        claim = claims.get(claim_id)
+        if claim is not None and claim.claim_status == "pending":
+            approvals_per_item.setdefault(claim.item_id, []).append(claim_id)
+
+    approved, rejected = [], []
+    for claim_id, decision in decisions.items():
+        claim = claims.get(claim_id)
+        if claim is None:
+            results[claim_id] = NOT_FOUND
+        elif claim.claim_status != "pending":
+            results[claim_id] = ALREADY_DECIDED
+        elif decision == REJECT:
+            results[claim_id] = REJECTED
+            rejected.append(claim_id)
+        elif len(approvals_per_item[claim.item_id]) > 1:
+            results[claim_id] = CONFLICT
+        elif items.get(claim.item_id) is None or items[claim.item_id].current_status not in CLAIMABLE_ITEM_STATUSES:
+            results[claim_id] = ITEM_UNAVAILABLE
+        else:
+            results[claim_id] = APPROVED
+            approved.append(claim_id)
+
+    # 3. Set-based updates
+    approved_items = sorted({claims[cid].item_id for cid in approved})
+    if approved_items:
+        result = await db.execute(
+            update(Item)
+            .where(Item.item_id.in_(approved_items), Item.current_status.in_(CLAIMABLE_ITEM_STATUSES))
+            .values(current_status="claimed", last_status_change=now)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != len(approved_items):
+            raise _concurrent_change()
+    await _set_claim_status(db, approved, "approved", admin_id, now)
+
+    # Other pending claims on the approved items lose
+    siblings = []
+    if approved_items:
+        siblings = (await db.execute(
+            select(Claim.claim_id, Claim.item_id, Claim.claimer_id)
+            .where(
+                Claim.item_id.in_(approved_items),
+                Claim.claim_status == "pending",
+                Claim.claim_id.notin_(approved + rejected),
+            )
+            .order_by(Claim.claim_id)
+            .with_for_update()
+        )).all()
+    await _set_claim_status(db, rejected + [s.claim_id for s in siblings], "rejected", admin_id, now)
+
+    # Notifications and item summaries commit with the decisions
+    touched = {claims[cid].item_id for cid in approved + rejected} | {s.item_id for s in siblings}
+    if touched:
+        missing = touched - set(items)
+        if missing:
+            items.update({item.item_id: item for item in await db.execute(
+                select(Item.item_id, Item.title, Item.created_by, Item.current_status)
+                .where(Item.item_id.in_(missing))
+            )})
+        for cid in approved:
+            item = items[claims[cid].item_id]
+            notify_claim_decided(db, claims[cid], "approved", item.title, item.created_by)
+        for claim in [claims[cid] for cid in rejected] + siblings:
+            notify_claim_decided(db, claim, "rejected", items[claim.item_id].title)
+        await summary.refresh(db, *touched)
+
+    return results, [s.claim_id for s in siblings]
+
+
+async def set_report_statuses(db: AsyncSession, statuses: dict):
+    """
+    ``statuses`` maps report id -> new status. Resolving a report completes
+    its item. Returns ``(results, item_ids)``: the outcome per report id, and
+    the item id of every updated report.
+    """
+    results = {}
+    found = {r.report_id: r for r in await db.execute(
+        select(Report.report_id, Report.item_id)
+        .where(Report.report_id.in_(list(statuses)))
+        .order_by(Report.report_id)
+        .with_for_update()
+    )}
+    by_status = {}
+    for report_id, status in statuses.items():
+        if report_id not in found:
+            results[report_id] = NOT_FOUND
+        else:
+            results[report_id] = UPDATED
+            by_status.setdefault(status, []).append(report_id)
+
+    for status, report_ids in by_status.items():
+        await db.execute(
+            update(Report)
+            .where(Report.report_id.in_(report_ids))
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+    completed = sorted({found[rid].item_id for rid in by_status.get("resolved", ())})
+    if completed:
+        await db.execute(
+            update(Item)
+            .where(Item.item_id.in_(completed))
+            .values(current_status="completed", last_status_change=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+    item_ids = {rid: found[rid].item_id for rids in by_status.values() for rid in rids}
+    await summary.refresh(db, *set(item_ids.values()))
+    return results, item_ids
@@ -0,0 +1,159 @@
+# app/hashing.py
+"""
+Password hashing off the request path.
+
+bcrypt_sha256 costs hundreds of milliseconds of CPU per call. Running it
+inline in /auth/login and /auth/register pins a worker thread for that long,
+so a burst of logins starves every other endpoint. Here hashing runs in a
+bounded process pool:
+
+- HASH_WORKERS       processes in the pool (0 = use the event loop's
+                     default thread pool instead of processes)
+- HASH_CONCURRENCY   hashes allowed in flight at once
+- HASH_MAX_PENDING   callers allowed to wait for a slot; beyond that the
+                     request is shed with 503 instead of queueing forever
+
+Queue depth and latency counters are exposed through ``hash_metrics()``.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from .metrics import register_metrics
+
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(min(os.cpu_count() or 1, 4))))
+HASH_CONCURRENCY = int(os.getenv("HASH_CONCURRENCY", str(max(HASH_WORKERS, 1))))
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", "64"))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt_sha256"],
+    deprecated="auto"
+)
+
+
+# -------------------------------
+# Pure functions (run in the pool)
+# -------------------------------
+def verify_password(plain_password: str, hashed_password: str):
+    try:
+        return pwd_context.verify(plain_password, hashed_password)
+    except Exception:
+        return False
+
+
+def get_password_hash(password: str):
+    # bcrypt only supports up to 72 bytes
+    if len(password) > 72:
+        password = password[:72]
+    return pwd_context.hash(password)
+
+
+# -------------------------------
+# Pool + admission
+# -------------------------------
+_executor = None
+_executor_lock = threading.Lock()
+_semaphore = None
+
+_metrics_lock = threading.Lock()
+_metrics = {
+    "in_flight": 0,
+    "queued": 0,
+    "completed": 0,
+    "rejected": 0,
+    "total_wait_ms": 0.0,
+    "total_run_ms": 0.0,
+}
+
+
+def _get_executor():
+    global _executor
+    if HASH_WORKERS <= 0:
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _executor
+
+
+def _get_semaphore():
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(HASH_CONCURRENCY)
+    return _semaphore
+
+
+def _bump(**deltas):
+    with _metrics_lock:
+        for key, value in deltas.items():
+            _metrics[key] += value
+
+
+async def _run(fn, *args):
+    sem = _get_semaphore()
+    if sem.locked() and _metrics["queued"] >= HASH_MAX_PENDING:
+        _bump(rejected=1)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    queued_at = time.perf_counter()
+    _bump(queued=1)
+    try:
+        await sem.acquire()
+    finally:
+        _bump(queued=-1)
+
+    started_at = time.perf_counter()
+    _bump(in_flight=1, total_wait_ms=(started_at - queued_at) * 1000)
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+    finally:
+        sem.release()
+        _bump(in_flight=-1, completed=1, total_run_ms=(time.perf_counter() - started_at) * 1000)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    return await _run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str):
+    return await _run(get_password_hash, password)
+
+
+def hash_metrics():
+    with _metrics_lock:
+        data = dict(_metrics)
+    done = data["completed"] or 1
+    data.update({
+        "workers": HASH_WORKERS,
+        "concurrency": HASH_CONCURRENCY,
+        "max_pending": HASH_MAX_PENDING,
+        "avg_wait_ms": round(data.pop("total_wait_ms") / done, 3),
+        "avg_run_ms": round(data.pop("total_run_ms") / done, 3),
+    })
+    return data
+
+
+def shutdown_hash_pool():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+register_metrics("password_hashing", hash_metrics)
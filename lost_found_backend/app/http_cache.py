@@ -0,0 +1,126 @@
+# app/http_cache.py
+"""
+HTTP caching helpers: ETag / Last-Modified validators, conditional 304s
+and per-route Cache-Control policies.
+
+Policies are named and can be overridden from the environment
+(``CACHE_CONTROL_<NAME>``), e.g. ``CACHE_CONTROL_REFERENCE=public, max-age=60``.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.staticfiles import StaticFiles
+
+from .responses import dumps
+
+_DEFAULT_POLICIES = {
+    # categories / locations: change rarely, fine to reuse for a few minutes
+    "reference": "public, max-age=300",
+    # item detail: always revalidate, but a 304 skips the body
+    "item": "private, no-cache",
+    # /uploads files are UUID-named and never rewritten in place
+    "uploads": "public, max-age=31536000, immutable",
+}
+
+CACHE_POLICIES = {
+    name: os.getenv(f"CACHE_CONTROL_{name.upper()}", default)
+    for name, default in _DEFAULT_POLICIES.items()
+}
+
+
+def make_etag(*parts):
+    """Strong ETag from a tuple of version values (ids, timestamps, ...)."""
+    raw = json.dumps(jsonable_encoder(parts), separators=(",", ":"), sort_keys=True)
+    return '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+
+
+def _as_utc(dt: datetime):
+    """Stored timestamps are naive UTC; make them aware for comparisons."""
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def _http_date(dt: datetime):
+    return format_datetime(_as_utc(dt), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str):
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+def is_not_modified(request: Request, etag: Optional[str], last_modified: Optional[datetime] = None):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+    return False
+
+
+def cached_response(
+    request: Request,
+    content,
+    policy: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+):
+    """
+    Return a JSON response carrying validators and the named Cache-Control
+    policy, or a bodiless 304 when the client's copy is current.
+
+    ``content`` may be a zero-argument callable; it is only invoked when a
+    body actually has to be sent. Without an explicit ``etag`` one is derived
+    from a hash of the serialised body.
+    """
+    headers = {"Cache-Control": CACHE_POLICIES[policy]}
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+
+    if etag is not None:
+        headers["ETag"] = etag
+        if is_not_modified(request, etag, last_modified):
+            return Response(status_code=304, headers=headers)
+
+    body = dumps(content() if callable(content) else content)
+
+    if etag is None:
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        headers["ETag"] = etag
+        if is_not_modified(request, etag, last_modified):
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that also sends a long-lived Cache-Control policy."""
+
+    def __init__(self, *args, policy: str = "uploads", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = CACHE_POLICIES[policy]
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = self.cache_control
+        return response
@@ -0,0 +1,82 @@
+# app/images.py
+"""
+Responsive image variants for item photos.
+
+Each uploaded image gets a small ``thumb`` (list cards) and a ``medium``
+(detail page) rendition, stored as WebP next to the original in UPLOAD_DIR.
+``upload_image`` schedules ``process_image`` as a background task; existing
+images are handled by ``backfill_thumbnails.py``.
+"""
+import logging
+import os
+
+from PIL import Image, ImageOps
+
+from .database import SessionLocal
+from .models import ItemImage
+from .summary import refresh_item_summaries
+from .uploads import UPLOAD_DIR
+
+logger = logging.getLogger(__name__)
+
+# variant name -> longest edge in pixels
+VARIANTS = {
+    "thumb": 320,
+    "medium": 1024,
+}
+VARIANT_FORMAT = "WEBP"
+VARIANT_EXT = "webp"
+VARIANT_QUALITY = 80
+
+URL_PREFIX = "/uploads/"
+
+
+def url_to_path(url: str):
+    return os.path.join(UPLOAD_DIR, os.path.basename(url))
+
+
+def make_variants(src_path: str):
+    """
+    Render every variant of ``src_path`` and return ``{variant: url}``.
+    Pure function of the file on disk, so it can run in a worker process.
+    """
+    stem = os.path.splitext(os.path.basename(src_path))[0]
+    urls = {}
+    with Image.open(src_path) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+        for name, edge in VARIANTS.items():
+            variant = img.copy()
+            variant.thumbnail((edge, edge))
+            filename = f"{stem}_{name}.{VARIANT_EXT}"
+            dest = os.path.join(UPLOAD_DIR, filename)
+            tmp = os.path.join(UPLOAD_DIR, f".{filename}.part")
+            variant.save(tmp, VARIANT_FORMAT, quality=VARIANT_QUALITY, method=4)
+            os.replace(tmp, dest)
+            urls[name] = URL_PREFIX + filename
+    return urls
+
+
+def apply_variants(image: ItemImage, urls: dict):
+    image.thumbnail_path = urls.get("thumb")
+    image.medium_path = urls.get("medium")
+
+
+def process_image(image_id: int):
+    """Background task: render variants for one ItemImage and record them."""
+    db = SessionLocal()
+    try:
+        image = db.query(ItemImage).filter(ItemImage.image_id == image_id).first()
+        if image is None:
+            return
+        try:
+            urls = make_variants(url_to_path(image.file_path))
+        except Exception:
+            logger.exception("Could not render variants for image %s", image_id)
+            return
+        apply_variants(image, urls)
+        refresh_item_summaries(db, [image.item_id])
+        db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,230 @@
+# app/instrumentation.py
+"""
+Per-request performance accounting.
+
+``RequestTimingMiddleware`` opens a ``RequestTimings`` record for each HTTP
+request in a context variable. Then:
+
+- ``before/after_cursor_execute`` hooks on every engine (attached in
+  database._make_engine) add each statement's count and time to it;
+- ``responses.dumps`` adds the time spent encoding JSON bodies.
+
+The context variable follows the request into SQLAlchemy's greenlets and
+into run_in_threadpool, so statements run by sync sessions in a worker
+thread count too.
+
+When the response starts, its totals go out in a ``Server-Timing`` header
+(``db``, ``serialize`` and ``app``, the time to the first response byte),
+which browser dev tools show next to the request. The record is closed
+once the last body chunk is sent: BackgroundTasks (e.g. image processing
+after an upload) run after that in the same context, and neither their
+statements nor their time count towards the request. Requests slower than
+SLOW_REQUEST_MS, or running more than SLOW_REQUEST_QUERIES statements, are
+logged with their busiest statement fingerprints. Fingerprints are the SQL
+text with literals and expanded IN lists collapsed, so repeated statements
+(an N+1 loop) show up as one line with a high count. Aggregates are served
+under "requests" on /metrics.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+from .metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING = os.getenv("SERVER_TIMING", "true").strip().lower() in ("1", "true", "yes", "on")
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+SLOW_REQUEST_QUERIES = int(os.getenv("SLOW_REQUEST_QUERIES", "50"))
+# Distinct fingerprints kept per request, and how many a slow-request log shows
+MAX_FINGERPRINTS = 100
+LOGGED_FINGERPRINTS = 5
+
+
+class RequestTimings:
+    __slots__ = ("started", "closed", "queries", "db_seconds", "serialize_seconds", "statements")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.closed = False
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.statements = {}  # fingerprint -> [count, seconds]
+
+    def add_query(self, statement: str, seconds: float):
+        self.queries += 1
+        self.db_seconds += seconds
+        key = fingerprint(statement)
+        entry = self.statements.get(key)
+        if entry is not None:
+            entry[0] += 1
+            entry[1] += seconds
+        elif len(self.statements) < MAX_FINGERPRINTS:
+            self.statements[key] = [1, seconds]
+
+    def top_statements(self, n: int = LOGGED_FINGERPRINTS):
+        return sorted(self.statements.items(), key=lambda kv: -kv[1][1])[:n]
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """The open record of the current request, if any."""
+    timings = _current.get()
+    return None if timings is None or timings.closed else timings
+
+
+def record_serialize(seconds: float):
+    timings = current_timings()
+    if timings is not None:
+        timings.serialize_seconds += seconds
+
+
+# --------------------------------------------------------
+# Statement fingerprints
+# --------------------------------------------------------
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))+\s*\)")
+_VALUES_LIST = re.compile(r"(VALUES\s*\(\?\))(?:\s*,\s*\(\?\))+", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """SQL text with literals, parameter lists and whitespace normalised."""
+    text = _SPACE.sub(" ", statement).strip()
+    text = _STRING.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _PARAM_LIST.sub("(?)", text)
+    return _VALUES_LIST.sub(r"\1, ...", text)
+
+
+# --------------------------------------------------------
+# Engine hooks
+# --------------------------------------------------------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_timings() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = current_timings()
+    started = conn.info.get("query_started")
+    if timings is not None and started:
+        timings.add_query(statement, time.perf_counter() - started.pop())
+
+
+def instrument_engine(sync_engine):
+    """Count statements run on ``sync_engine`` (an async engine's ``.sync_engine``)."""
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# --------------------------------------------------------
+# Aggregates
+# --------------------------------------------------------
+_metrics_lock = threading.Lock()
+_metrics = {
+    "requests": 0,
+    "slow": 0,
+    "queries": 0,
+    "total_db_ms": 0.0,
+    "total_serialize_ms": 0.0,
+    "total_ms": 0.0,
+}
+
+
+def request_metrics():
+    with _metrics_lock:
+        data = dict(_metrics)
+    done = data["requests"] or 1
+    data.update({
+        "slow_request_ms": SLOW_REQUEST_MS,
+        "avg_queries": round(data["queries"] / done, 2),
+        "avg_db_ms": round(data.pop("total_db_ms") / done, 3),
+        "avg_serialize_ms": round(data.pop("total_serialize_ms") / done, 3),
+        "avg_ms": round(data.pop("total_ms") / done, 3),
+    })
+    return data
+
+
+register_metrics("requests", request_metrics)
+
+
+# --------------------------------------------------------
+# Middleware
+# --------------------------------------------------------
+def _server_timing(timings: RequestTimings, total: float):
+    return (
+        f'db;dur={timings.db_seconds * 1000:.1f};desc="{timings.queries} queries", '
+        f"serialize;dur={timings.serialize_seconds * 1000:.1f}, "
+        f"app;dur={total * 1000:.1f}"
+    )
+
+
+class RequestTimingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status_code = 500
+
+        async def wrapped_send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if SERVER_TIMING:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", _server_timing(timings, time.perf_counter() - timings.started))
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                # Response complete; background tasks may still run after this
+                self._finish(scope, timings, status_code)
+
+        try:
+            await self.app(scope, receive, wrapped_send)
+        finally:
+            _current.reset(token)
+            self._finish(scope, timings, status_code)
+
+    def _finish(self, scope, timings: RequestTimings, status_code: int):
+        if timings.closed:
+            return
+        timings.closed = True
+        elapsed_ms = (time.perf_counter() - timings.started) * 1000
+        slow = elapsed_ms >= SLOW_REQUEST_MS or timings.queries > SLOW_REQUEST_QUERIES
+        # Long-lived streams are slow by design
+        if slow and scope["path"].startswith("/notifications/stream"):
+            slow = False
+        with _metrics_lock:
+            _metrics["requests"] += 1
+            _metrics["slow"] += slow
+            _metrics["queries"] += timings.queries
+            _metrics["total_db_ms"] += timings.db_seconds * 1000
+            _metrics["total_serialize_ms"] += timings.serialize_seconds * 1000
+            _metrics["total_ms"] += elapsed_ms
+        if slow:
+            lines = "".join(
+                f"\n  {count}x {seconds * 1000:.1f}ms {statement[:300]}"
+                for statement, (count, seconds) in timings.top_statements()
+            )
+            logger.warning(
+                "Slow request %s %s -> %s: %.1fms, %d queries, db %.1fms, serialize %.1fms%s",
+                scope["method"], scope["path"], status_code, elapsed_ms,
+                timings.queries, timings.db_seconds * 1000, timings.serialize_seconds * 1000, lines,
+            )
@@ -1,45 +1,49 @@
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-import os
-
-from .routers import auth, users, items, reports, categories, locations, claims
-from .database import engine, SessionLocal
-from .models import Base, Role
-
-# Create tables and seed minimal data
-Base.metadata.create_all(bind=engine)
-
-# Seed default roles
-try:
-    db = SessionLocal()
-    existing = db.query(Role).count()
-    if existing == 0:
-        db.add_all([
-            Role(role_name="student"),
-            Role(role_name="staff"),
-            Role(role_name="admin")
-        ])
-        db.commit()
-finally:
-    try:
-        db.close()
-    except Exception:
-        pass
-
-app = FastAPI(title="Lost & Found Portal API", version="1.0.0")
 
+from .routers import auth, users, items, reports, categories, locations, claims, notifications, dashboard, metrics, health
+from .database import dispose_engines
+from .pagination import NEXT_CURSOR_HEADER
+from .hashing import shutdown_hash_pool
+from .uploads import UPLOAD_DIR, UploadSizeLimitMiddleware
+from .compression import CompressionMiddleware
+from .instrumentation import RequestTimingMiddleware
+from .responses import APIJSONResponse
+from .admission import AdmissionMiddleware
+from .http_cache import CachedStaticFiles
+from .notifications import hub
+from .audit import audit
+
+logger = logging.getLogger(__name__)
+
+# Importing the app does no database work: the schema and seed data are
+# managed by init_db.py (Alembic migrations + roles), run once per deploy,
+# and engines connect on first use (the reference-data cache included: it
+# loads on the first request that needs it). GET /health/ready reports
+# whether the database is reachable and migrated.
+
+app = FastAPI(
+    title="Lost & Found Portal API",
+    version="1.0.0",
+    default_response_class=APIJSONResponse,
+)
+
+app.add_middleware(RequestTimingMiddleware)
+app.add_middleware(UploadSizeLimitMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(AdmissionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
-UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
+app.mount("/uploads", CachedStaticFiles(directory=UPLOAD_DIR), name="uploads")
 
 # Routers
 app.include_router(auth.router)
@@ -49,3 +53,16 @@ app.include_router(locations.router)
 app.include_router(items.router)
 app.include_router(reports.router)
 app.include_router(claims.router)
+app.include_router(notifications.router)
+app.include_router(dashboard.router)
+app.include_router(metrics.router)
+app.include_router(health.router)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    hub.close()
+    shutdown_hash_pool()
+    # Write buffered audit events before the pools close
+    await audit.close()
+    await dispose_engines()
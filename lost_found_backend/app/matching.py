@@ -0,0 +1,260 @@
+# app/matching.py
+"""
+Lost <-> found report matching.
+
+Every open report is kept in a process-wide candidate index: an inverted
+index from text tokens (item title + report details) to report ids, split
+by report type, plus a (category, location) bucket for reports with little
+text. Matching a report only scores the counterpart reports that share a
+token or a bucket with it, so the cost grows with the number of plausible
+candidates rather than with the size of the report table.
+
+Each worker has its own index, and writes handled by another worker only
+reach it through the database, so a lookup does not trust it blindly:
+
+- the report being matched is always re-read from the database;
+- reports newer than the newest one indexed are pulled in first;
+- the shortlist is re-read before it is scored, so a candidate resolved
+  or edited elsewhere is scored on its current data (or dropped);
+- the whole index is rebuilt every MATCH_INDEX_TTL seconds, which picks up
+  edits that change which candidates a report has.
+
+Scores combine:
+- text similarity (Jaccard over title/details tokens)
+- same category
+- same location
+- how close the two reported dates are
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import AsyncSessionLocal
+from .models import Item, Report
+from .notifications import notify_matches
+from .search import tokenize
+
+TEXT_WEIGHT = 0.5
+CATEGORY_WEIGHT = 0.2
+LOCATION_WEIGHT = 0.15
+DATE_WEIGHT = 0.15
+DATE_WINDOW_DAYS = 30
+
+MIN_SCORE = 0.25
+MAX_MATCHES = 20
+# Tokens carried by more than this many reports are too common to narrow
+# the candidate set and are skipped during lookup.
+MAX_POSTINGS = 500
+
+COUNTERPART = {"lost": "found", "found": "lost"}
+
+MATCH_INDEX_TTL = float(os.getenv("MATCH_INDEX_TTL", "300"))
+
+
+@dataclass
+class ReportDoc:
+    report_id: int
+    report_type: str
+    item_id: int
+    tokens: frozenset
+    category_id: Optional[int]
+    location_id: Optional[int]
+    day: Optional[date]
+
+
+def score(a: ReportDoc, b: ReportDoc):
+    s = 0.0
+    if a.tokens and b.tokens:
+        s += TEXT_WEIGHT * len(a.tokens & b.tokens) / len(a.tokens | b.tokens)
+    if a.category_id and a.category_id == b.category_id:
+        s += CATEGORY_WEIGHT
+    if a.location_id and a.location_id == b.location_id:
+        s += LOCATION_WEIGHT
+    if a.day and b.day:
+        days = abs((a.day - b.day).days)
+        s += DATE_WEIGHT * max(0.0, 1 - days / DATE_WINDOW_DAYS)
+    return s
+
+
+class ReportMatcher:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built_at = None
+        # Highest report id the index has seen; newer ones are pulled in
+        # before each lookup
+        self._max_id = 0
+        self._reset()
+
+    def _reset(self):
+        self._docs = {}
+        # report_type -> token -> {report_id}
+        self._postings = {"lost": defaultdict(set), "found": defaultdict(set)}
+        # report_type -> (category_id, location_id) -> {report_id}
+        self._buckets = {"lost": defaultdict(set), "found": defaultdict(set)}
+
+    # --------------------------------------------------------
+    # Index maintenance
+    # --------------------------------------------------------
+    @staticmethod
+    def _open_reports():
+        return (
+            select(Report.report_id, Report.report_type, Report.item_id, Report.location_id,
+                     Report.reported_date, Report.reported_on, Report.details,
+                     Item.title, Item.category_id)
+            .join(Item, Item.item_id == Report.item_id)
+            .where(Report.status != "resolved", Report.report_type.in_(COUNTERPART))
+        )
+
+    @staticmethod
+    def _to_doc(row):
+        day = row.reported_date or (row.reported_on.date() if row.reported_on else None)
+        return ReportDoc(
+            report_id=row.report_id,
+            report_type=row.report_type,
+            item_id=row.item_id,
+            tokens=frozenset(tokenize(row.title) + tokenize(row.details)),
+            category_id=row.category_id,
+            location_id=row.location_id,
+            day=day,
+        )
+
+    def _add(self, doc: ReportDoc):
+        self._remove(doc.report_id)
+        self._docs[doc.report_id] = doc
+        for tok in doc.tokens:
+            self._postings[doc.report_type][tok].add(doc.report_id)
+        self._buckets[doc.report_type][(doc.category_id, doc.location_id)].add(doc.report_id)
+
+    def _remove(self, report_id: int):
+        doc = self._docs.pop(report_id, None)
+        if doc is None:
+            return
+        postings = self._postings[doc.report_type]
+        for tok in doc.tokens:
+            postings[tok].discard(report_id)
+            if not postings[tok]:
+                del postings[tok]
+        self._buckets[doc.report_type][(doc.category_id, doc.location_id)].discard(report_id)
+
+    async def ensure_built(self, db: AsyncSession):
+        """Build the index, or rebuild it once it is older than MATCH_INDEX_TTL."""
+        if self._built_at is not None and time.monotonic() - self._built_at < MATCH_INDEX_TTL:
+            return
+        max_id = await db.scalar(select(func.max(Report.report_id))) or 0
+        docs = [self._to_doc(row) for row in await db.execute(
+            self._open_reports().where(Report.report_id <= max_id)
+        )]
+        with self._lock:
+            self._reset()
+            for doc in docs:
+                self._add(doc)
+            self._max_id = max(self._max_id, max_id)
+            self._built_at = time.monotonic()
+
+    async def _load_new(self, db: AsyncSession):
+        """Index reports created (by any worker) since the newest one seen."""
+        docs = [self._to_doc(row) for row in await db.execute(
+            self._open_reports().where(Report.report_id > self._max_id)
+        )]
+        if docs:
+            with self._lock:
+                for doc in docs:
+                    self._add(doc)
+                self._max_id = max(self._max_id, max(doc.report_id for doc in docs))
+
+    async def index_report(self, db: AsyncSession, report_id: int):
+        await self.index_reports(db, [report_id])
+
+    async def index_reports(self, db: AsyncSession, report_ids):
+        """
+        Re-read the given reports; ones no longer open drop out of the index.
+        Returns ``{report_id: ReportDoc}`` for the ones still open.
+        """
+        await self.ensure_built(db)
+        report_ids = set(report_ids)
+        docs = [self._to_doc(row) for row in await db.execute(
+            self._open_reports().where(Report.report_id.in_(report_ids))
+        )]
+        with self._lock:
+            for report_id in report_ids:
+                self._remove(report_id)
+            for doc in docs:
+                self._add(doc)
+        return {doc.report_id: doc for doc in docs}
+
+    async def index_item(self, db: AsyncSession, item_id: int):
+        """Re-read the reports of an item whose title or category changed."""
+        report_ids = (await db.scalars(select(Report.report_id).where(Report.item_id == item_id))).all()
+        if report_ids:
+            await self.index_reports(db, report_ids)
+
+    def remove_report(self, report_id: int):
+        with self._lock:
+            self._remove(report_id)
+
+    # --------------------------------------------------------
+    # Lookup
+    # --------------------------------------------------------
+    def _candidates(self, doc: ReportDoc):
+        other = COUNTERPART[doc.report_type]
+        postings = self._postings[other]
+        ids = set()
+        for tok in doc.tokens:
+            hits = postings.get(tok)
+            if hits and len(hits) <= MAX_POSTINGS:
+                ids |= hits
+        if doc.category_id or doc.location_id:
+            ids |= self._buckets[other].get((doc.category_id, doc.location_id), set())
+        return ids
+
+    def _score_candidates(self, doc: ReportDoc, docs: dict, cand_ids):
+        scored = []
+        for cand_id in cand_ids:
+            cand = docs.get(cand_id)
+            if cand is None or cand.item_id == doc.item_id:
+                continue
+            s = score(doc, cand)
+            if s >= MIN_SCORE:
+                scored.append((cand_id, round(s, 4)))
+        scored.sort(key=lambda kv: (-kv[1], -kv[0]))
+        return scored
+
+    async def matches(self, db: AsyncSession, report_id: int, limit: int = MAX_MATCHES):
+        """Return ``[(report_id, score), ...]`` best first."""
+        await self.ensure_built(db)
+        await self._load_new(db)
+        doc = (await self.index_reports(db, [report_id])).get(report_id)
+        if doc is None:
+            # Resolved, deleted or not a lost/found report
+            return []
+        with self._lock:
+            shortlist = self._score_candidates(doc, self._docs, self._candidates(doc))[:limit * 2]
+        if not shortlist:
+            return []
+        # Score the shortlist on current data
+        fresh = await self.index_reports(db, [cand_id for cand_id, _ in shortlist])
+        return self._score_candidates(doc, fresh, fresh)[:limit]
+
+
+matcher = ReportMatcher()
+
+
+async def match_new_report(report_id: int):
+    """
+    Background task run after a report is created: index it, notify the
+    reporters involved in any matches, and return the matches.
+    """
+    async with AsyncSessionLocal() as db:
+        await matcher.index_report(db, report_id)
+        found = await matcher.matches(db, report_id)
+        if found:
+            await notify_matches(db, report_id, found)
+            await db.commit()
+        return found
@@ -0,0 +1,16 @@
+# app/metrics.py
+"""
+Registry of in-process runtime metrics served at GET /metrics.
+
+Subsystems call ``register_metrics(name, fn)`` at import time with a
+zero-argument function returning a JSON-serialisable dict.
+"""
+_sources = {}
+
+
+def register_metrics(name: str, fn):
+    _sources[name] = fn
+
+
+def collect_metrics():
+    return {name: fn() for name, fn in _sources.items()}
@@ -1,5 +1,5 @@
 # app/models.py
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, TIMESTAMP, Enum, Boolean, SmallInteger, Date, UniqueConstraint
+from sqlalchemy import BigInteger, Column, Integer, String, Text, ForeignKey, TIMESTAMP, Enum, Boolean, SmallInteger, Date, UniqueConstraint, Index, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -11,6 +11,9 @@ class Role(Base):
 
 class UserAccount(Base):
     __tablename__ = "user_account"
+    __table_args__ = (
+        Index('idx_user_created', 'created_at', 'user_id'),
+    )
     user_id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(100), nullable=False)
     branch = Column(String(50))
@@ -43,6 +46,7 @@ class Item(Base):
     __tablename__ = "item"
     __table_args__ = (
         UniqueConstraint('title', 'created_by', name='uk_title_createdby'),
+        Index('ft_item_title_description', 'title', 'description', mysql_prefix='FULLTEXT'),
     )
     item_id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String(150), nullable=False)
@@ -60,6 +64,16 @@ class Item(Base):
 
 class Report(Base):
     __tablename__ = "report"
+    __table_args__ = (
+        Index('ft_report_details', 'details', mysql_prefix='FULLTEXT'),
+        # Composite indexes: equality filter first, then the keyset sort
+        # columns (see migrations/versions/0002_composite_indexes.py)
+        Index('idx_report_item_reported', 'item_id', 'reported_on', 'report_id'),
+        Index('idx_report_reporter_reported', 'reporter_id', 'reported_on'),
+        Index('idx_report_type_reported', 'report_type', 'reported_on', 'report_id'),
+        Index('idx_report_status_reported', 'status', 'reported_on', 'report_id'),
+        Index('idx_report_reported', 'reported_on', 'report_id'),
+    )
     report_id = Column(Integer, primary_key=True, autoincrement=True)
     item_id = Column(Integer, ForeignKey("item.item_id"), nullable=False)
     reporter_id = Column(Integer, ForeignKey("user_account.user_id"), nullable=False)
@@ -79,12 +93,19 @@ class ItemImage(Base):
     image_id = Column(Integer, primary_key=True, autoincrement=True)
     item_id = Column(Integer, ForeignKey("item.item_id"), nullable=False)
     file_path = Column(String(255), nullable=False)
+    thumbnail_path = Column(String(255))
+    medium_path = Column(String(255))
     uploaded_on = Column(TIMESTAMP, server_default=func.now())
 
     item = relationship("Item", back_populates="images")
 
 class Claim(Base):
     __tablename__ = "claim"
+    __table_args__ = (
+        Index('idx_claim_status_claimed', 'claim_status', 'claimed_on', 'claim_id'),
+        Index('idx_claim_claimed', 'claimed_on', 'claim_id'),
+        Index('idx_claim_item_status', 'item_id', 'claim_status'),
+    )
     claim_id = Column(Integer, primary_key=True, autoincrement=True)
     item_id = Column(Integer, ForeignKey("item.item_id"), nullable=False)
     claimer_id = Column(Integer, ForeignKey("user_account.user_id"), nullable=False)
@@ -93,3 +114,90 @@ class Claim(Base):
     claimed_on = Column(TIMESTAMP, server_default=func.now())
     decided_by = Column(Integer, ForeignKey("user_account.user_id"))
     decided_on = Column(TIMESTAMP)
+
+class Notification(Base):
+    __tablename__ = "notification"
+    __table_args__ = (
+        # Unread inbox: one user's unread rows, newest first
+        Index('idx_notification_user_read_created', 'user_id', 'is_read', 'created_on', 'notification_id'),
+    )
+    notification_id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("user_account.user_id"), nullable=False)
+    kind = Column(String(30))
+    message = Column(Text, nullable=False)
+    item_id = Column(Integer)
+    claim_id = Column(Integer)
+    report_id = Column(Integer)
+    is_read = Column(Boolean, default=False)
+    created_on = Column(TIMESTAMP, server_default=func.now())
+
+class History(Base):
+    """Item audit trail. Written in batches by app/audit.py."""
+    __tablename__ = "history"
+    __table_args__ = (
+        Index('idx_history_item', 'item_id'),
+    )
+    history_id = Column(Integer, primary_key=True, autoincrement=True)
+    item_id = Column(Integer, ForeignKey("item.item_id", ondelete="SET NULL"))
+    action = Column(String(80), nullable=False)
+    action_details = Column(Text)
+    action_by = Column(Integer, ForeignKey("user_account.user_id"))
+    action_on = Column(TIMESTAMP, server_default=func.now())
+
+class SessionAudit(Base):
+    """One row per login. Written in batches by app/audit.py."""
+    __tablename__ = "session_audit"
+    # SQLite only autoincrements an INTEGER PRIMARY KEY
+    session_id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("user_account.user_id"))
+    login_time = Column(TIMESTAMP, nullable=True)
+    logout_time = Column(TIMESTAMP, nullable=True)
+    ip_address = Column(String(45))
+
+class ItemSummary(Base):
+    """
+    Denormalised, one-row-per-item projection behind the browse and detail
+    pages. Maintained by app/summary.py; never written directly.
+    """
+    __tablename__ = "item_summary"
+    __table_args__ = (
+        Index('idx_summary_created', 'created_on', 'item_id'),
+        Index('idx_summary_status_created', 'current_status', 'created_on', 'item_id'),
+    )
+    item_id = Column(Integer, ForeignKey("item.item_id", ondelete="CASCADE"), primary_key=True, autoincrement=False)
+    title = Column(String(150), nullable=False)
+    description = Column(Text)
+    category_id = Column(Integer)
+    category_name = Column(String(50))
+    created_by = Column(Integer)
+    creator_name = Column(String(100))
+    created_on = Column(TIMESTAMP)
+    current_status = Column(Enum("lost","found","claimed","completed","discarded", name="item_status"))
+    last_status_change = Column(TIMESTAMP)
+    last_report_id = Column(Integer)
+    last_report_type = Column(Enum("lost","found", name="report_type"))
+    last_report_status = Column(Enum("open","in_review","resolved", name="report_status"))
+    last_report_date = Column(Date)
+    last_location_id = Column(Integer)
+    last_location_name = Column(String(100))
+    thumbnail_url = Column(String(255))
+    images = Column(JSON)
+    pending_claims = Column(Integer, nullable=False, default=0)
+    # This item's contribution to stat_counter ({"scope|metric|bucket": n})
+    stat_keys = Column(JSON)
+    # When the row was last recomputed (naive UTC); the item's Last-Modified
+    refreshed_on = Column(TIMESTAMP)
+
+class StatCounter(Base):
+    """
+    Dashboard counters, e.g. (0, "items_by_status", "lost") -> 12. Scope 0
+    is site-wide, any other scope is a user id. Maintained incrementally by
+    app/stats.py whenever an item summary is refreshed. A counter is the sum
+    of its rows over ``shard`` (site-wide counters are split by item id).
+    """
+    __tablename__ = "stat_counter"
+    scope = Column(Integer, primary_key=True, autoincrement=False)
+    metric = Column(String(30), primary_key=True)
+    bucket = Column(String(30), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True, autoincrement=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,260 @@
+# app/notifications.py
+"""
+Notifications: a persistent per-user inbox plus live push.
+
+Write paths call ``notify`` (or one of the fan-out helpers below) inside
+their transaction; the rows commit or roll back with the change. Once the
+transaction commits, every new notification is published on its user's
+channel of the in-process ``hub``, and GET /notifications/stream relays it
+to that user's open connections as a server-sent event. ``broadcast``
+publishes a transient event (nothing stored) the same way, e.g. to tell
+every admin dashboard that a claim was decided.
+
+The hub is per worker: with several uvicorn workers a client only gets
+live events from the worker that handled the write. The inbox is the
+source of truth; clients load it when they connect and whenever the stream
+reconnects.
+"""
+import asyncio
+import logging
+import os
+import threading
+from datetime import datetime
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .database import AppSession
+from .metrics import register_metrics
+from .models import Item, Notification, Report, Role, UserAccount
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per open stream; a client that falls further behind
+# misses the overflow and catches up from the inbox.
+NOTIFY_QUEUE_SIZE = int(os.getenv("NOTIFY_QUEUE_SIZE", "100"))
+
+ADMINS = "admins"
+
+
+def user_channel(user_id: int):
+    return f"user:{user_id}"
+
+
+def notification_to_dict(n: Notification):
+    return {
+        "notification_id": n.notification_id,
+        "user_id": n.user_id,
+        "kind": n.kind,
+        "message": n.message,
+        "item_id": n.item_id,
+        "claim_id": n.claim_id,
+        "report_id": n.report_id,
+        "is_read": bool(n.is_read),
+        "created_on": n.created_on.isoformat() if n.created_on else None,
+    }
+
+
+# --------------------------------------------------------
+# In-process pub/sub
+# --------------------------------------------------------
+class Subscription:
+    def __init__(self, channels, loop):
+        self.channels = frozenset(channels)
+        self.loop = loop
+        self.queue = asyncio.Queue(NOTIFY_QUEUE_SIZE)
+
+
+class NotificationHub:
+    """
+    Channel -> open subscriptions. ``publish`` may be called from any
+    thread (sync sessions commit in worker threads); delivery always happens
+    on the subscriber's event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels = {}
+        self._stats = {"published": 0, "delivered": 0, "dropped": 0}
+
+    def subscribe(self, channels):
+        sub = Subscription(channels, asyncio.get_running_loop())
+        with self._lock:
+            for channel in sub.channels:
+                self._channels.setdefault(channel, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            for channel in sub.channels:
+                subs = self._channels.get(channel)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._channels[channel]
+
+    def _deliver(self, sub: Subscription, payload):
+        try:
+            sub.queue.put_nowait(payload)
+            self._stats["delivered"] += 1
+        except asyncio.QueueFull:
+            self._stats["dropped"] += 1
+
+    def publish(self, channel: str, payload):
+        with self._lock:
+            subs = list(self._channels.get(channel, ()))
+            self._stats["published"] += 1
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(self._deliver, sub, payload)
+            except RuntimeError:
+                # Loop already closed (shutdown)
+                pass
+
+    def close(self):
+        """End every open stream (``None`` tells the consumer to stop)."""
+        with self._lock:
+            subs = {sub for subs in self._channels.values() for sub in subs}
+            self._channels.clear()
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub.queue.put_nowait, None)
+            except RuntimeError:
+                pass
+
+    def metrics(self):
+        with self._lock:
+            return {
+                **self._stats,
+                "channels": len(self._channels),
+                "subscriptions": len({sub for subs in self._channels.values() for sub in subs}),
+            }
+
+
+hub = NotificationHub()
+register_metrics("notifications", hub.metrics)
+
+
+# --------------------------------------------------------
+# Publishing after commit
+# --------------------------------------------------------
+@event.listens_for(Notification, "after_insert")
+def _queue_notification(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("notify_events", []).append(
+            (user_channel(target.user_id), notification_to_dict(target))
+        )
+
+
+def broadcast(session, channel: str, kind: str, **data):
+    """Publish a transient event on ``channel`` once ``session`` commits."""
+    if isinstance(session, AsyncSession):
+        session = session.sync_session
+    session.info.setdefault("notify_events", []).append((channel, {"kind": kind, **data}))
+
+
+@event.listens_for(AppSession, "after_commit")
+def _publish_notifications(session):
+    for channel, payload in session.info.pop("notify_events", ()):
+        hub.publish(channel, payload)
+
+
+@event.listens_for(AppSession, "after_rollback")
+def _discard_notifications(session):
+    session.info.pop("notify_events", None)
+
+
+# --------------------------------------------------------
+# Fan-out
+# --------------------------------------------------------
+def notify(session, user_ids, kind: str, message: str, item_id=None, claim_id=None, report_id=None):
+    """Add one notification per distinct user to the session's transaction."""
+    now = datetime.now()
+    session.add_all([
+        Notification(
+            user_id=user_id,
+            kind=kind,
+            message=message,
+            item_id=item_id,
+            claim_id=claim_id,
+            report_id=report_id,
+            is_read=False,
+            created_on=now,
+        )
+        for user_id in dict.fromkeys(u for u in user_ids if u is not None)
+    ])
+
+
+async def admin_ids(db: AsyncSession):
+    return list(await db.scalars(
+        select(UserAccount.user_id).join(Role, Role.role_id == UserAccount.role_id).where(Role.role_name == "admin")
+    ))
+
+
+async def notify_new_claim(db: AsyncSession, claim, item: Item, claimer_name: str):
+    notify(
+        db, await admin_ids(db), "claim_new",
+        f"{claimer_name} claimed '{item.title}'",
+        item_id=item.item_id, claim_id=claim.claim_id,
+    )
+
+
+def notify_claim_decided(db: AsyncSession, claim, claim_status: str, title: str, item_owner=None):
+    """
+    Tell the claimer (and, on approval, the item's creator ``item_owner``)
+    and refresh admin dashboards. ``claim`` needs claim_id, item_id and
+    claimer_id.
+    """
+    title = title or f"item #{claim.item_id}"
+    notify(
+        db, [claim.claimer_id], f"claim_{claim_status}",
+        f"Your claim for '{title}' was {claim_status}",
+        item_id=claim.item_id, claim_id=claim.claim_id,
+    )
+    if claim_status == "approved" and item_owner is not None and item_owner != claim.claimer_id:
+        notify(
+            db, [item_owner], "item_claimed",
+            f"'{title}' was claimed",
+            item_id=claim.item_id, claim_id=claim.claim_id,
+        )
+    broadcast(
+        db, ADMINS, "claim_decided",
+        claim_id=claim.claim_id, item_id=claim.item_id, claim_status=claim_status,
+    )
+
+
+async def notify_matches(db: AsyncSession, report_id: int, matches):
+    """
+    After a new report is matched: tell its reporter how many candidates
+    were found, and each candidate's reporter that a new report may match
+    their item.
+    """
+    if not matches:
+        return
+    ids = [report_id] + [match_id for match_id, _ in matches]
+    rows = {r.report_id: r for r in await db.execute(
+        select(Report.report_id, Report.reporter_id, Report.report_type, Report.item_id, Item.title)
+        .join(Item, Item.item_id == Report.item_id)
+        .where(Report.report_id.in_(ids))
+    )}
+    new = rows.get(report_id)
+    if new is None:
+        return
+    found = [rows[i] for i in ids[1:] if i in rows]
+    if not found:
+        return
+    notify(
+        db, [new.reporter_id], "match",
+        f"{len(found)} possible match{'es' if len(found) != 1 else ''} for your {new.report_type} report of '{new.title}'",
+        item_id=new.item_id, report_id=new.report_id,
+    )
+    for r in found:
+        if r.reporter_id == new.reporter_id:
+            continue
+        notify(
+            db, [r.reporter_id], "match",
+            f"A new {new.report_type} report may match '{r.title}'",
+            item_id=r.item_id, report_id=r.report_id,
+        )
@@ -0,0 +1,86 @@
+# app/pagination.py
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Lists are ordered newest first on a (timestamp, primary key) pair. A cursor
+is an opaque token encoding that pair for the last row of a page; the next
+page is fetched with ``WHERE (ts, id) < (cursor_ts, cursor_id)`` so the
+database seeks straight to it instead of scanning every skipped row.
+"""
+import base64
+import json
+import os
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def clamp_limit(limit: int):
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def encode_cursor(ts: Optional[datetime], row_id: int):
+    raw = json.dumps([ts.isoformat() if ts else None, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        ts, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return (datetime.fromisoformat(ts) if ts else None), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _selects_entity(stmt):
+    descriptions = stmt.column_descriptions
+    return len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]
+
+
+async def paginate(db: AsyncSession, stmt, ts_col, id_col, limit: int, skip: int = 0, cursor: Optional[str] = None):
+    """
+    Apply newest-first ordering and either keyset (``cursor``) or offset
+    (``skip``) pagination to ``stmt`` and run it. ``stmt`` is an entity
+    select (rows are ORM objects) or a column projection that includes
+    ``ts_col`` and ``id_col`` (rows are result rows).
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    limit = clamp_limit(limit)
+    stmt = stmt.order_by(ts_col.desc(), id_col.desc())
+
+    if cursor:
+        ts, row_id = decode_cursor(cursor)
+        if ts is None:
+            stmt = stmt.where(ts_col.is_(None), id_col < row_id)
+        else:
+            stmt = stmt.where(or_(
+                ts_col < ts,
+                and_(ts_col == ts, id_col < row_id),
+                ts_col.is_(None),
+            ))
+    elif skip:
+        stmt = stmt.offset(skip)
+
+    result = await db.execute(stmt.limit(limit + 1))
+    if _selects_entity(stmt):
+        result = result.scalars()
+    rows = result.all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, ts_col.key), getattr(last, id_col.key))
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,256 @@
+# app/queries.py
+"""
+Shared query builders for list/detail endpoints.
+
+List and detail reads select exactly the columns a response shows, with
+the names it uses (``*_columns`` / ``*_rows``), joined to the tables that
+supply display names. One query per page, no ORM identity map or attribute
+instrumentation, and the resulting rows turn into response dicts with a
+plain key copy. Items are read from the ``item_summary`` projection (see
+summary.py). Report location names come from the in-process reference-data
+cache instead of a join; handlers that serialise through it refresh it
+first with ``await refdata.get(db)``.
+
+The ``*_to_dict`` helpers produce exactly the fields of the matching
+response schema, so handlers can return them through ``json_response``
+without re-validation (see responses.py).
+
+List endpoints accept ``view=card`` (a short, fixed set of fields for list
+rows) and ``fields=a,b,c`` (any subset). ``select_fields`` turns those into
+a field tuple, and the builders then select only those columns (plus the
+pagination keys) and join only the tables they need.
+"""
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload
+
+from .models import Claim, Item, ItemImage, ItemSummary, Report, Role, UserAccount
+from .refdata import refdata
+
+
+def image_to_dict(image: ItemImage):
+    return {
+        "image_id": image.image_id,
+        "item_id": image.item_id,
+        "file_path": image.file_path,
+        "thumbnail_path": image.thumbnail_path,
+        "medium_path": image.medium_path,
+        "uploaded_on": image.uploaded_on,
+    }
+
+
+def card_image_url(images):
+    """Smallest available rendition of an item's first image."""
+    if not images:
+        return None
+    first = min(images, key=lambda img: img.image_id)
+    return first.thumbnail_path or first.file_path
+
+
+FULL = "full"
+CARD = "card"
+
+
+def select_fields(fields: Optional[str], view: Optional[str], all_fields, card_fields, key: str):
+    """
+    Response fields for ``fields=`` (comma-separated, always including the
+    ``key`` field) or ``view=card|full``. Unknown names are a 400.
+    """
+    if fields:
+        wanted = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = sorted(set(wanted) - set(all_fields))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        # Response order, key first
+        return (key,) + tuple(f for f in all_fields if f in wanted and f != key)
+    if view in (None, FULL):
+        return all_fields
+    if view == CARD:
+        return card_fields
+    raise HTTPException(status_code=400, detail="view must be 'card' or 'full'")
+
+
+def _columns(columns: dict, names):
+    """The distinct columns behind ``names`` (several fields may share one)."""
+    selected = {}
+    for name in names:
+        selected.setdefault(id(columns[name]), columns[name])
+    return list(selected.values())
+
+
+# ItemSummary columns an item response shows
+ITEM_FIELDS = (
+    "item_id", "title", "category_id", "description", "created_by", "created_on",
+    "current_status", "creator_name", "category_name", "images", "thumbnail_url",
+    "last_report_type", "last_report_date", "last_location_name",
+)
+ITEM_CARD_FIELDS = (
+    "item_id", "title", "created_on", "current_status", "creator_name", "category_name",
+    "thumbnail_url", "last_report_type", "last_report_date", "last_location_name",
+)
+_ITEM_COLUMNS = {field: getattr(ItemSummary, field) for field in ITEM_FIELDS}
+
+
+def item_columns(fields=ITEM_FIELDS):
+    """Select of the ``item_summary`` columns behind an item response (plus the pagination keys)."""
+    return select(*_columns(_ITEM_COLUMNS, fields + ("created_on", "item_id")))
+
+
+def summary_to_dict(summary, extras: dict = None, fields=ITEM_FIELDS):
+    """Item response body from an ``ItemSummary`` row (ORM object, result row or dict)."""
+    if isinstance(summary, ItemSummary):
+        summary = {c.key: getattr(summary, c.key) for c in ItemSummary.__table__.columns}
+    elif isinstance(summary, Row):
+        summary = summary._mapping
+    data = {field: summary[field] for field in fields}
+    if "images" in data:
+        data["images"] = data["images"] or []
+    if extras:
+        data.update(extras)
+    return data
+
+
+def report_query():
+    """Report select with reporter and item eager-loaded (for handlers that modify the report)."""
+    return select(Report).options(
+        joinedload(Report.reporter),
+        joinedload(Report.item),
+    )
+
+
+REPORT_FIELDS = (
+    "report_id", "item_id", "reporter_id", "report_type", "location_id", "reported_date",
+    "reported_on", "details", "status", "reporter_name", "item_title", "location_name",
+)
+REPORT_CARD_FIELDS = (
+    "report_id", "item_id", "report_type", "status", "reported_on", "item_title", "location_name",
+)
+_REPORT_COLUMNS = {
+    "report_id": Report.report_id,
+    "item_id": Report.item_id,
+    "reporter_id": Report.reporter_id,
+    "report_type": Report.report_type,
+    "location_id": Report.location_id,
+    "reported_date": Report.reported_date,
+    "reported_on": Report.reported_on,
+    "details": Report.details,
+    "status": Report.status,
+    "reporter_name": UserAccount.name.label("reporter_name"),
+    "item_title": Item.title.label("item_title"),
+    # location_name comes from the reference-data cache
+    "location_name": Report.location_id,
+}
+
+
+def report_rows(fields=REPORT_FIELDS):
+    """Report columns plus reporter_name and item_title, one row per report."""
+    stmt = select(*_columns(_REPORT_COLUMNS, fields + ("reported_on", "report_id")))
+    if "reporter_name" in fields:
+        stmt = stmt.outerjoin(UserAccount, UserAccount.user_id == Report.reporter_id)
+    if "item_title" in fields:
+        stmt = stmt.outerjoin(Item, Item.item_id == Report.item_id)
+    return stmt
+
+
+def report_to_dict(report, extras: dict = None, fields=REPORT_FIELDS):
+    """
+    Report response body from a ``report_rows(fields)`` row, or from a
+    ``Report`` loaded with ``report_query()`` (all fields).
+    """
+    if isinstance(report, Row):
+        row = report._mapping
+        data = {
+            field: refdata.location_name(row["location_id"]) if field == "location_name" else row[field]
+            for field in fields
+        }
+    else:
+        data = {
+            "report_id": report.report_id,
+            "item_id": report.item_id,
+            "reporter_id": report.reporter_id,
+            "report_type": report.report_type,
+            "location_id": report.location_id,
+            "reported_date": report.reported_date,
+            "reported_on": report.reported_on,
+            "details": report.details,
+            "status": report.status,
+            "reporter_name": report.reporter.name if report.reporter else None,
+            "item_title": report.item.title if report.item else None,
+            "location_name": refdata.location_name(report.location_id),
+        }
+    if extras:
+        data.update(extras)
+    return data
+
+
+_claimer = aliased(UserAccount)
+_decider = aliased(UserAccount)
+
+CLAIM_FIELDS = (
+    "claim_id", "item_id", "claimer_id", "claim_text", "claim_status", "claimed_on",
+    "decided_by", "decided_on", "item_title", "claimer_name", "decider_name",
+)
+CLAIM_CARD_FIELDS = ("claim_id", "item_id", "claim_status", "claimed_on", "item_title", "claimer_name")
+_CLAIM_COLUMNS = {
+    "claim_id": Claim.claim_id,
+    "item_id": Claim.item_id,
+    "claimer_id": Claim.claimer_id,
+    "claim_text": Claim.claim_text,
+    "claim_status": Claim.claim_status,
+    "claimed_on": Claim.claimed_on,
+    "decided_by": Claim.decided_by,
+    "decided_on": Claim.decided_on,
+    "item_title": Item.title.label("item_title"),
+    "claimer_name": _claimer.name.label("claimer_name"),
+    "decider_name": _decider.name.label("decider_name"),
+}
+
+
+def claim_rows(fields=CLAIM_FIELDS):
+    """Claim columns plus item_title, claimer_name and decider_name, one row per claim."""
+    stmt = select(*_columns(_CLAIM_COLUMNS, fields + ("claimed_on", "claim_id")))
+    if "item_title" in fields:
+        stmt = stmt.outerjoin(Item, Item.item_id == Claim.item_id)
+    if "claimer_name" in fields:
+        stmt = stmt.outerjoin(_claimer, _claimer.user_id == Claim.claimer_id)
+    if "decider_name" in fields:
+        stmt = stmt.outerjoin(_decider, _decider.user_id == Claim.decided_by)
+    return stmt
+
+
+def claim_to_dict(row, extras: dict = None, fields=CLAIM_FIELDS):
+    """Claim response body from a ``claim_rows(fields)`` row."""
+    row = row._mapping
+    data = {field: row[field] for field in fields}
+    if extras:
+        data.update(extras)
+    return data
+
+
+async def load_claim(db: AsyncSession, claim_id: int):
+    row = (await db.execute(claim_rows().where(Claim.claim_id == claim_id))).first()
+    return claim_to_dict(row) if row is not None else None
+
+
+# Columns of a user response (never the password hash)
+USER_FIELDS = ("user_id", "name", "branch", "roll_number", "school", "email", "phone", "role_id", "role_name")
+
+
+def user_rows():
+    """User columns plus role_name; ``created_at`` is included for pagination."""
+    return (
+        select(
+            UserAccount.user_id, UserAccount.name, UserAccount.branch, UserAccount.roll_number,
+            UserAccount.school, UserAccount.email, UserAccount.phone, UserAccount.role_id,
+            Role.role_name, UserAccount.created_at,
+        )
+        .outerjoin(Role, Role.role_id == UserAccount.role_id)
+    )
+
+
+def user_to_dict(row):
+    return {field: getattr(row, field) for field in USER_FIELDS}
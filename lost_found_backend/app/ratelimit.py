@@ -0,0 +1,245 @@
+# app/ratelimit.py
+"""
+Per-client rate limiting with token buckets.
+
+Each named budget allows ``count`` requests per ``period`` seconds and
+bursts of up to ``count``. A request takes one token from the bucket of
+its (budget, key) pair, where the key is a client IP, a roll number or a
+user id. Once the bucket is empty the request gets a 429 with Retry-After
+until it refills. Budgets default to the values in ``_DEFAULT_BUDGETS``
+and can be overridden from the environment as ``RATE_LIMIT_<NAME>=count/
+seconds`` (e.g. ``RATE_LIMIT_LOGIN_IP=20/60``), or turned off with ``off``.
+
+Buckets live in one of two stores:
+
+- ``MemoryBucketStore``: per worker, bounded LRU of buckets. With several
+  uvicorn workers each one enforces its own budget.
+- ``RedisBucketStore``: shared by every worker, updated atomically by a
+  Lua script (awaited through ``redis.asyncio``). Selected by
+  ``RATE_LIMIT_URL`` (falling back to ``CACHE_URL``) and needs the
+  optional ``redis`` package. If Redis is unreachable, requests are
+  allowed rather than failed.
+
+Routes attach budgets as dependencies (``limit_login``, ``limit_register``,
+``limit_user(name)``); admission.py applies the site-wide ``global_ip``
+budget to every request.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+
+from .auth import Principal, get_current_active_user
+from .cache import RedisClients
+from .metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+RATE_LIMIT_URL = os.getenv("RATE_LIMIT_URL") or os.getenv("CACHE_URL")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# Take the client IP from the first X-Forwarded-For entry (only behind a
+# proxy that sets it)
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").strip().lower() in ("1", "true", "yes", "on")
+
+_DEFAULT_BUDGETS = {
+    # every request from one IP (applied by the admission middleware)
+    "global_ip": "600/60",
+    # login attempts per IP, and per account whatever the IP
+    "login_ip": "20/60",
+    "login_account": "10/300",
+    # new accounts per IP
+    "register_ip": "10/3600",
+    # writes per signed-in user
+    "write": "120/60",
+    "report": "20/60",
+}
+
+
+@dataclass(frozen=True)
+class Budget:
+    name: str
+    count: int
+    period: float
+
+    @property
+    def rate(self):
+        return self.count / self.period
+
+
+def _parse_budget(name: str, spec: str) -> Optional[Budget]:
+    spec = spec.strip().lower()
+    if spec in ("", "0", "off", "none"):
+        return None
+    count, _, period = spec.partition("/")
+    return Budget(name, int(count), float(period or 1))
+
+
+BUDGETS = {
+    name: _parse_budget(name, os.getenv(f"RATE_LIMIT_{name.upper()}", default))
+    for name, default in _DEFAULT_BUDGETS.items()
+}
+
+
+# --------------------------------------------------------
+# Bucket stores
+# --------------------------------------------------------
+class BucketStore:
+    async def take(self, key: str, budget: Budget) -> float:
+        """Take a token. Returns 0 if allowed, else seconds until one is available."""
+        raise NotImplementedError
+
+
+class MemoryBucketStore(BucketStore):
+    def __init__(self, maxsize: int = RATE_LIMIT_MAX_KEYS):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, budget: Budget) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (budget.count, now))
+            tokens = min(budget.count, tokens + (now - updated_at) * budget.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / budget.rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                # Least recently seen bucket; it was refilling anyway
+                self._buckets.popitem(last=False)
+        return wait
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+_TAKE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - ts, 0) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBucketStore(BucketStore):
+    def __init__(self, url: str):
+        self._clients = RedisClients(url, "RATE_LIMIT_URL / CACHE_URL")
+        self.prefix = "lf:ratelimit:"
+
+    async def take(self, key: str, budget: Budget) -> float:
+        try:
+            # EVALSHA, falling back to EVAL the first time a server sees it
+            script = self._clients.get().register_script(_TAKE_SCRIPT)
+            return float(await script(keys=[self.prefix + key], args=[budget.count, budget.rate]))
+        except Exception:
+            # Fail open: losing the limiter must not take the API down
+            logger.exception("Rate limit store unavailable")
+            return 0.0
+
+
+def make_bucket_store() -> BucketStore:
+    if RATE_LIMIT_URL:
+        return RedisBucketStore(RATE_LIMIT_URL)
+    return MemoryBucketStore()
+
+
+# --------------------------------------------------------
+# Limiter
+# --------------------------------------------------------
+class RateLimiter:
+    def __init__(self, store: BucketStore = None, budgets: dict = None):
+        self._store = store
+        self.budgets = BUDGETS if budgets is None else budgets
+        self._lock = threading.Lock()
+        self._stats = {name: {"allowed": 0, "limited": 0} for name in self.budgets}
+
+    @property
+    def store(self):
+        if self._store is None:
+            with self._lock:
+                if self._store is None:
+                    self._store = make_bucket_store()
+        return self._store
+
+    async def hit(self, budget_name: str, key) -> float:
+        """Count a request against a budget. Returns 0 if allowed, else the Retry-After seconds."""
+        budget = self.budgets.get(budget_name)
+        if not RATE_LIMIT_ENABLED or budget is None or key is None:
+            return 0.0
+        wait = await self.store.take(f"{budget_name}:{key}", budget)
+        with self._lock:
+            self._stats[budget_name]["limited" if wait else "allowed"] += 1
+        return wait
+
+    async def check(self, budget_name: str, key):
+        wait = await self.hit(budget_name, key)
+        if wait:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please slow down",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+
+    def metrics(self):
+        with self._lock:
+            data = {name: dict(counts) for name, counts in self._stats.items()}
+        data["enabled"] = RATE_LIMIT_ENABLED
+        if isinstance(self._store, MemoryBucketStore):
+            data["buckets"] = len(self._store)
+        return data
+
+
+limiter = RateLimiter()
+register_metrics("rate_limit", limiter.metrics)
+
+
+def client_ip(headers, client) -> Optional[str]:
+    """Client address from request headers and the ASGI ``client`` tuple."""
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return client[0] if client else None
+
+
+# --------------------------------------------------------
+# Route dependencies
+# --------------------------------------------------------
+async def limit_login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    await limiter.check("login_ip", client_ip(request.headers, request.client))
+    await limiter.check("login_account", form_data.username.strip().lower())
+
+
+async def limit_register(request: Request):
+    await limiter.check("register_ip", client_ip(request.headers, request.client))
+
+
+def limit_user(budget_name: str):
+    """Dependency charging ``budget_name`` to the signed-in user."""
+    async def dependency(current_user: Principal = Depends(get_current_active_user)):
+        await limiter.check(budget_name, current_user.user_id)
+    return dependency
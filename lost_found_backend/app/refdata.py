@@ -0,0 +1,168 @@
+# app/refdata.py
+"""
+Process-wide cache of reference data (categories and locations).
+
+The tables are tiny and rarely change, so each worker keeps a sorted copy
+plus id -> name maps and answers lookups without touching the database.
+A snapshot is reloaded when:
+
+- it is older than REFDATA_TTL seconds, or
+- the shared version counter moved. Any commit that touches Category or
+  Location bumps it (e.g. ``create_report`` adding a location on the fly).
+  With CACHE_URL set the counter lives in Redis, so every worker notices
+  within REFDATA_VERSION_CHECK seconds.
+"""
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .cache import make_cache_backend
+from .database import AppSession, AsyncSessionLocal, after_commit
+from .http_cache import make_etag
+from .metrics import register_metrics
+from .models import Category, Location
+
+logger = logging.getLogger(__name__)
+
+REFDATA_TTL = float(os.getenv("REFDATA_TTL", "300"))
+REFDATA_VERSION_CHECK = float(os.getenv("REFDATA_VERSION_CHECK", "1"))
+
+_VERSION_KEY = "version"
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: int
+    loaded_at: float
+    categories: list = field(default_factory=list)
+    locations: list = field(default_factory=list)
+    category_names: dict = field(default_factory=dict)
+    location_names: dict = field(default_factory=dict)
+    categories_etag: str = ""
+    locations_etag: str = ""
+
+
+_EMPTY = Snapshot(version=-1, loaded_at=float("-inf"))
+
+
+class RefDataCache:
+    def __init__(self):
+        self._shared = make_cache_backend("refdata", ttl=0)
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._stats = {"loads": 0, "invalidations": 0}
+
+    async def _shared_version(self):
+        return int(await self._shared.get(_VERSION_KEY) or 0)
+
+    async def _load(self, db: AsyncSession):
+        version = await self._shared_version()
+        categories = [
+            {"category_id": c.category_id, "category_name": c.category_name}
+            for c in await db.scalars(select(Category).order_by(Category.category_name))
+        ]
+        locations = [
+            {"location_id": l.location_id, "location_name": l.location_name,
+             "building": l.building, "floor": l.floor}
+            for l in await db.scalars(select(Location).order_by(Location.location_name))
+        ]
+        self._snapshot = Snapshot(
+            version=version,
+            loaded_at=time.monotonic(),
+            categories=categories,
+            locations=locations,
+            category_names={c["category_id"]: c["category_name"] for c in categories},
+            location_names={l["location_id"]: l["location_name"] for l in locations},
+            categories_etag=make_etag(categories),
+            locations_etag=make_etag(locations),
+        )
+        self._checked_at = time.monotonic()
+        self._stats["loads"] += 1
+        return self._snapshot
+
+    async def _is_stale(self, snap: Snapshot):
+        now = time.monotonic()
+        if now - snap.loaded_at > REFDATA_TTL:
+            return True
+        if now - self._checked_at > REFDATA_VERSION_CHECK:
+            self._checked_at = now
+            return await self._shared_version() != snap.version
+        return False
+
+    async def get(self, db: AsyncSession = None) -> Snapshot:
+        """
+        Current snapshot, reloaded first if stale. Two requests racing on a
+        stale snapshot may both reload; the loads are identical, so the
+        later one simply wins.
+        """
+        snap = self._snapshot
+        if snap is not None and not await self._is_stale(snap):
+            return snap
+        # Always reload from the primary: a lagging replica could hand back
+        # the pre-invalidation rows and pin them for REFDATA_TTL.
+        if db is not None and not db.info.get("replica"):
+            return await self._load(db)
+        return await self.load()
+
+    async def load(self):
+        async with AsyncSessionLocal() as db:
+            return await self._load(db)
+
+    async def invalidate(self):
+        """Bump the shared version so every worker reloads on next use."""
+        await self._shared.incr(_VERSION_KEY)
+        self._stats["invalidations"] += 1
+        self._checked_at = 0.0
+
+    # Name lookups read whatever snapshot is loaded and never touch the
+    # database, so serialisers can stay synchronous.
+    def category_name(self, category_id):
+        if category_id is None:
+            return None
+        return (self._snapshot or _EMPTY).category_names.get(category_id)
+
+    def location_name(self, location_id):
+        if location_id is None:
+            return None
+        return (self._snapshot or _EMPTY).location_names.get(location_id)
+
+    def metrics(self):
+        snap = self._snapshot
+        return {
+            **self._stats,
+            "version": snap.version if snap else None,
+            "categories": len(snap.categories) if snap else 0,
+            "locations": len(snap.locations) if snap else 0,
+        }
+
+
+refdata = RefDataCache()
+register_metrics("refdata", refdata.metrics)
+
+
+@event.listens_for(Category, "after_insert")
+@event.listens_for(Category, "after_update")
+@event.listens_for(Category, "after_delete")
+@event.listens_for(Location, "after_insert")
+@event.listens_for(Location, "after_update")
+@event.listens_for(Location, "after_delete")
+def _queue_refdata_invalidation(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info["invalidate_refdata"] = True
+
+
+@event.listens_for(AppSession, "after_commit")
+def _apply_refdata_invalidation(session):
+    if session.info.pop("invalidate_refdata", False):
+        after_commit(session, refdata.invalidate)
+
+
+@event.listens_for(AppSession, "after_rollback")
+def _discard_refdata_invalidation(session):
+    session.info.pop("invalidate_refdata", None)
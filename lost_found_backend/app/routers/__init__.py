@@ -1 +1 @@
-from . import auth, users, items, reports, categories, locations, claims
+from . import auth, users, items, reports, categories, locations, claims, notifications, metrics, health
@@ -1,17 +1,21 @@
 # app/routers/auth.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db
 from ..auth import (
+    Principal,
     authenticate_user,
     create_access_token,
-    get_password_hash,
+    get_password_hash_async,
     get_current_active_user,
+    get_user_by_roll_number,
 )
 from ..models import UserAccount
+from ..audit import audit
+from ..ratelimit import limit_login, limit_register
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -19,8 +23,8 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 # ------------------------------------------------------------
 # REGISTER  (Frontend sends normal JSON)
 # ------------------------------------------------------------
-@router.post("/register")
-def register(user: dict, db: Session = Depends(get_db)):
+@router.post("/register", dependencies=[Depends(limit_register)])
+async def register(user: dict, db: AsyncSession = Depends(get_db)):
 
     # Validate required fields
     required_fields = ["name", "roll_number", "password"]
@@ -29,11 +33,7 @@ def register(user: dict, db: Session = Depends(get_db)):
             raise HTTPException(400, f"'{field}' is required")
 
     # Check roll number exists
-    existing = (
-        db.query(UserAccount)
-        .filter(UserAccount.roll_number == user["roll_number"])
-        .first()
-    )
+    existing = await get_user_by_roll_number(db, user["roll_number"])
     if existing:
         raise HTTPException(
             status_code=400,
@@ -42,7 +42,7 @@ def register(user: dict, db: Session = Depends(get_db)):
 
     # FIX: Trim + enforce 72-char bcrypt limit
     password = user["password"].strip()[:72]
-    hashed_pw = get_password_hash(password)
+    hashed_pw = await get_password_hash_async(password)
 
     # Create user account
     new_user = UserAccount(
@@ -57,8 +57,7 @@ def register(user: dict, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
 
     return {"message": "Registration successful"}
 
@@ -66,16 +65,17 @@ def register(user: dict, db: Session = Depends(get_db)):
 # ------------------------------------------------------------
 # LOGIN  (OAuth2PasswordRequestForm expects username + password)
 # ------------------------------------------------------------
-@router.post("/login")
-def login(
+@router.post("/login", dependencies=[Depends(limit_login)])
+async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
 
     roll_number = form_data.username.strip()
     password = form_data.password.strip()
 
-    user = authenticate_user(db, roll_number, password)
+    user = await authenticate_user(db, roll_number, password)
 
     if not user:
         raise HTTPException(
@@ -87,6 +87,7 @@ def login(
     access_token = create_access_token(
         data={"sub": str(user.user_id)}
     )
+    await audit.login(user.user_id, request.client.host if request.client else None)
 
     return {
         "access_token": access_token,
@@ -109,16 +110,25 @@ def login(
 # GET CURRENT USER  (Used by AuthContext.js)
 # ------------------------------------------------------------
 @router.get("/me")
-def get_me(current_user: UserAccount = Depends(get_current_active_user)):
+async def get_me(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+
+    # The cached principal only carries id/name/role; the profile page needs
+    # the full row.
+    user = await db.get(UserAccount, current_user.user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
 
     return {
-        "user_id": current_user.user_id,
-        "name": current_user.name,
-        "email": current_user.email,
-        "branch": current_user.branch,
-        "roll_number": current_user.roll_number,
-        "school": current_user.school,
-        "phone": current_user.phone,
-        "role_name": current_user.role.role_name,
-        "created_at": current_user.created_at,
+        "user_id": user.user_id,
+        "name": user.name,
+        "email": user.email,
+        "branch": user.branch,
+        "roll_number": user.roll_number,
+        "school": user.school,
+        "phone": user.phone,
+        "role_name": current_user.role_name,
+        "created_at": user.created_at,
     }
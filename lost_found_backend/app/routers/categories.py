@@ -1,14 +1,16 @@
 # app/routers/categories.py
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from ..database import get_db
-from ..models import Category
 from ..schemas import Category as CategorySchema
+from ..http_cache import cached_response
+from ..refdata import refdata
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
 @router.get("/", response_model=List[CategorySchema])
-def get_categories(db: Session = Depends(get_db)):
+async def get_categories(request: Request, db: AsyncSession = Depends(get_db)):
     """Return all categories (convenience route)."""
-    return db.query(Category).order_by(Category.category_name).all()
+    snap = await refdata.get(db)
+    return cached_response(request, snap.categories, "reference", etag=snap.categories_etag)
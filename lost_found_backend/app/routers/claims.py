@@ -1,154 +1,168 @@
 # app/routers/claims.py
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..database import get_db
-from ..models import Claim, Item, UserAccount
-from ..schemas import Claim as ClaimSchema, ClaimCreate
-from ..auth import get_current_active_user, check_admin_permission
-from datetime import datetime
+from ..models import Claim, Item
+from ..schemas import Claim as ClaimSchema, ClaimCreate, BulkClaimDecisions, BulkClaimDecisionResults
+from ..auth import Principal, get_current_active_user, check_admin_permission
+from ..queries import CLAIM_CARD_FIELDS, CLAIM_FIELDS, claim_rows, claim_to_dict, load_claim, select_fields
+from .. import decisions, summary
+from ..notifications import notify_new_claim
+from ..audit import audit
+from ..pagination import DEFAULT_PAGE_SIZE, paginate
+from ..responses import json_response
+from ..ratelimit import limit_user
 
 router = APIRouter(prefix="/claims", tags=["claims"])
 
-@router.post("/", response_model=ClaimSchema, status_code=status.HTTP_201_CREATED)
-def create_claim(payload: ClaimCreate, db: Session = Depends(get_db), current_user: UserAccount = Depends(get_current_active_user)):
-    item = db.query(Item).filter(Item.item_id == payload.item_id).first()
+@router.post("/", response_model=ClaimSchema, status_code=status.HTTP_201_CREATED, dependencies=[Depends(limit_user("write"))])
+async def create_claim(payload: ClaimCreate, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_active_user)):
+    item = await db.get(Item, payload.item_id)
     if not item:
         raise HTTPException(404, "Item not found")
     claim = Claim(item_id=payload.item_id, claimer_id=current_user.user_id, claim_text=payload.claim_text)
-    db.add(claim); db.commit(); db.refresh(claim)
-    return {
-        **claim.__dict__,
-        "item_title": item.title,
-        "claimer_name": current_user.name,
-    }
+    db.add(claim)
+    await db.flush()
+    await notify_new_claim(db, claim, item, current_user.name)
+    await summary.refresh(db, payload.item_id)
+    await db.commit()
+    return json_response(await load_claim(db, claim.claim_id), status_code=status.HTTP_201_CREATED)
 
 @router.get("/", response_model=List[ClaimSchema])
-def list_claims(
+async def list_claims(
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(get_current_active_user)
+    skip: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    view: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    query = db.query(Claim)
+    """Claims, newest first; ``view=card`` / ``fields=a,b,c`` narrow each row."""
+    fields = select_fields(fields, view, CLAIM_FIELDS, CLAIM_CARD_FIELDS, "claim_id")
+    stmt = claim_rows(fields)
     if status:
-        query = query.filter(Claim.claim_status == status)
-    claims = query.order_by(Claim.claimed_on.desc()).all()
-
-    result = []
-    for cl in claims:
-        item = db.query(Item).filter(Item.item_id == cl.item_id).first()
-        claimer = db.query(UserAccount).filter(UserAccount.user_id == cl.claimer_id).first()
-        decider = db.query(UserAccount).filter(UserAccount.user_id == cl.decided_by).first() if cl.decided_by else None
-        result.append({
-            **cl.__dict__,
-            "item_title": item.title if item else None,
-            "claimer_name": claimer.name if claimer else None,
-            "decider_name": decider.name if decider else None,
-        })
-    return result
+        stmt = stmt.where(Claim.claim_status == status)
+    claims, next_cursor = await paginate(db, stmt, Claim.claimed_on, Claim.claim_id, limit, skip, cursor)
+    return json_response([claim_to_dict(cl, fields=fields) for cl in claims], next_cursor=next_cursor)
 
 @router.get("/{claim_id}", response_model=ClaimSchema)
-def get_claim(claim_id: int, db: Session = Depends(get_db), current_user: UserAccount = Depends(get_current_active_user)):
-    cl = db.query(Claim).filter(Claim.claim_id == claim_id).first()
+async def get_claim(claim_id: int, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_active_user)):
+    cl = await load_claim(db, claim_id)
     if not cl:
         raise HTTPException(status_code=404, detail="Claim not found")
-    item = db.query(Item).filter(Item.item_id == cl.item_id).first()
-    claimer = db.query(UserAccount).filter(UserAccount.user_id == cl.claimer_id).first()
-    decider = db.query(UserAccount).filter(UserAccount.user_id == cl.decided_by).first() if cl.decided_by else None
-    return {
-        **cl.__dict__,
-        "item_title": item.title if item else None,
-        "claimer_name": claimer.name if claimer else None,
-        "decider_name": decider.name if decider else None,
-    }
+    return json_response(cl)
 
 @router.put("/{claim_id}", response_model=ClaimSchema)
-def update_claim(
+async def update_claim(
     claim_id: int,
     payload: ClaimCreate,
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    cl = db.query(Claim).filter(Claim.claim_id == claim_id).first()
+    cl = await db.get(Claim, claim_id)
     if not cl:
         raise HTTPException(status_code=404, detail="Claim not found")
-    if cl.claimer_id != current_user.user_id and current_user.role.role_name != "admin":
+    if cl.claimer_id != current_user.user_id and current_user.role_name != "admin":
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    if cl.claim_status != "pending" and current_user.role.role_name != "admin":
+    if cl.claim_status != "pending" and current_user.role_name != "admin":
         raise HTTPException(status_code=400, detail="Only pending claims can be edited")
     cl.claim_text = payload.claim_text
-    db.commit(); db.refresh(cl)
-    item = db.query(Item).filter(Item.item_id == cl.item_id).first()
-    decider = db.query(UserAccount).filter(UserAccount.user_id == cl.decided_by).first() if cl.decided_by else None
+    await db.commit()
+    return json_response(await load_claim(db, claim_id))
+
+# Outcome of a single decision -> HTTP error
+_DECISION_ERRORS = {
+    decisions.NOT_FOUND: (404, "Claim not found"),
+    decisions.ALREADY_DECIDED: (409, "Claim already decided"),
+    decisions.ITEM_UNAVAILABLE: (409, "Item is no longer available to claim"),
+}
+
+async def _decide_one(db: AsyncSession, claim_id: int, decision: str, admin_id: int):
+    results, auto_rejected = await decisions.decide_claims(db, {claim_id: decision}, admin_id)
+    error = _DECISION_ERRORS.get(results[claim_id])
+    if error:
+        await db.rollback()
+        raise HTTPException(status_code=error[0], detail=error[1])
+    await db.commit()
+    action = "claim_approved" if decision == decisions.APPROVE else "claim_rejected"
+    cl = await load_claim(db, claim_id)
+    await audit.history(cl["item_id"], action, f"Claim #{claim_id} {results[claim_id]}", admin_id)
+    for sibling_id in auto_rejected:
+        await audit.history(cl["item_id"], "claim_rejected", f"Claim #{sibling_id} rejected: claim #{claim_id} approved", admin_id)
+    return json_response(cl)
+
+@router.post("/bulk-decide", response_model=BulkClaimDecisionResults)
+async def bulk_decide_claims(
+    payload: BulkClaimDecisions,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(check_admin_permission)
+):
+    """
+    Approve and reject many claims in one transaction. Each claim gets its
+    own result: approved, rejected, not_found, already_decided,
+    item_unavailable, invalid (unknown decision) or conflict (two approvals
+    for one item, or one claim listed with different decisions). Pending
+    claims rejected because another claim on their item was approved are
+    listed in ``auto_rejected``.
+    """
+    wanted, results = decisions.check_bulk(
+        [(d.claim_id, d.decision) for d in payload.decisions], (decisions.APPROVE, decisions.REJECT)
+    )
+    auto_rejected = []
+    if wanted:
+        applied, auto_rejected = await decisions.decide_claims(db, wanted, current_user.user_id)
+        results.update(applied)
+        await db.commit()
+        decided = [cid for cid, r in applied.items() if r in (decisions.APPROVED, decisions.REJECTED)]
+        items = dict((await db.execute(
+            select(Claim.claim_id, Claim.item_id).where(Claim.claim_id.in_(decided + auto_rejected))
+        )).all()) if decided else {}
+        for claim_id in decided:
+            action = "claim_approved" if applied[claim_id] == decisions.APPROVED else "claim_rejected"
+            await audit.history(items[claim_id], action, f"Claim #{claim_id} {applied[claim_id]}", current_user.user_id)
+        for claim_id in auto_rejected:
+            await audit.history(items[claim_id], "claim_rejected", f"Claim #{claim_id} rejected: another claim approved", current_user.user_id)
     return {
-        **cl.__dict__,
-        "item_title": item.title if item else None,
-        "claimer_name": current_user.name,
-        "decider_name": decider.name if decider else None,
+        "results": [
+            {"claim_id": claim_id, "result": results[claim_id]}
+            for claim_id in dict.fromkeys(d.claim_id for d in payload.decisions)
+        ],
+        "auto_rejected": auto_rejected,
     }
 
 @router.post("/{claim_id}/approve", response_model=ClaimSchema)
-def approve_claim(
+async def approve_claim(
     claim_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(check_admin_permission)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(check_admin_permission)
 ):
-    cl = db.query(Claim).filter(Claim.claim_id == claim_id).first()
-    if not cl:
-        raise HTTPException(status_code=404, detail="Claim not found")
-    if cl.claim_status != "pending":
-        raise HTTPException(status_code=400, detail="Claim already decided")
-    cl.claim_status = "approved"
-    cl.decided_by = current_user.user_id
-    cl.decided_on = datetime.now()
-    # Update item status to claimed
-    item = db.query(Item).filter(Item.item_id == cl.item_id).first()
-    if item:
-        item.current_status = "claimed"
-        item.last_status_change = datetime.now()
-    db.commit(); db.refresh(cl)
-    claimer = db.query(UserAccount).filter(UserAccount.user_id == cl.claimer_id).first()
-    return {
-        **cl.__dict__,
-        "item_title": item.title if item else None,
-        "claimer_name": claimer.name if claimer else None,
-        "decider_name": current_user.name,
-    }
+    """Approve a pending claim, mark its item claimed and reject the item's other pending claims."""
+    return await _decide_one(db, claim_id, decisions.APPROVE, current_user.user_id)
 
 @router.post("/{claim_id}/reject", response_model=ClaimSchema)
-def reject_claim(
+async def reject_claim(
     claim_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(check_admin_permission)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(check_admin_permission)
 ):
-    cl = db.query(Claim).filter(Claim.claim_id == claim_id).first()
-    if not cl:
-        raise HTTPException(status_code=404, detail="Claim not found")
-    if cl.claim_status != "pending":
-        raise HTTPException(status_code=400, detail="Claim already decided")
-    cl.claim_status = "rejected"
-    cl.decided_by = current_user.user_id
-    cl.decided_on = datetime.now()
-    db.commit(); db.refresh(cl)
-    item = db.query(Item).filter(Item.item_id == cl.item_id).first()
-    claimer = db.query(UserAccount).filter(UserAccount.user_id == cl.claimer_id).first()
-    return {
-        **cl.__dict__,
-        "item_title": item.title if item else None,
-        "claimer_name": claimer.name if claimer else None,
-        "decider_name": current_user.name,
-    }
+    return await _decide_one(db, claim_id, decisions.REJECT, current_user.user_id)
 
 @router.delete("/{claim_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_claim(
+async def delete_claim(
     claim_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    cl = db.query(Claim).filter(Claim.claim_id == claim_id).first()
+    cl = await db.get(Claim, claim_id)
     if not cl:
         raise HTTPException(status_code=404, detail="Claim not found")
-    if cl.claimer_id != current_user.user_id and current_user.role.role_name != "admin":
+    if cl.claimer_id != current_user.user_id and current_user.role_name != "admin":
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    db.delete(cl); db.commit()
+    await db.delete(cl)
+    await summary.refresh(db, cl.item_id)
+    await db.commit()
     return None
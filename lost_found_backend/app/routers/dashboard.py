@@ -0,0 +1,26 @@
+# app/routers/dashboard.py
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_db
+from ..schemas import AdminDashboardStats, StudentDashboardStats
+from ..auth import Principal, get_current_active_user, check_admin_permission
+from .. import stats
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+@router.get("/stats/student", response_model=StudentDashboardStats)
+async def get_student_stats(db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_active_user)):
+    """The current user's items, reports and claims counted by status and type."""
+    return await stats.student_stats(db, current_user.user_id)
+
+@router.get("/stats/admin", response_model=AdminDashboardStats)
+async def get_admin_stats(
+    days: int = stats.DEFAULT_TREND_DAYS,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(check_admin_permission)
+):
+    """
+    Site-wide counts by status, category and location, the pending-claim
+    queue depth, and per-day trends over the last ``days`` days.
+    """
+    return await stats.admin_stats(db, days)
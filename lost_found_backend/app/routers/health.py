@@ -0,0 +1,60 @@
+# app/routers/health.py
+import asyncio
+import os
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from ..database import async_engine, replica_engine
+from ..schema import current_revisions, expected_heads
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+HEALTH_DB_TIMEOUT = float(os.getenv("HEALTH_DB_TIMEOUT", "2"))
+
+
+async def _check_primary():
+    async with async_engine.connect() as conn:
+        revisions = await conn.run_sync(current_revisions)
+    expected = expected_heads()
+    if revisions != expected:
+        return f"schema at {sorted(revisions) or 'none'}, expected {sorted(expected)}; run init_db.py"
+    return "ok"
+
+
+async def _check_replica():
+    async with replica_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    return "ok"
+
+
+async def _run(check):
+    try:
+        return await asyncio.wait_for(check(), HEALTH_DB_TIMEOUT)
+    except asyncio.TimeoutError:
+        return f"timed out after {HEALTH_DB_TIMEOUT}s"
+    except Exception as e:
+        return f"unavailable: {e.__class__.__name__}"
+
+
+@router.get("/live")
+async def liveness():
+    """The process is up and serving; never touches the database."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def readiness():
+    """
+    Ready once the primary (and the replica, if configured) answers and the
+    schema is at the migration head this code expects. 503 otherwise.
+    """
+    checks = {"database": await _run(_check_primary)}
+    if replica_engine is not None:
+        checks["replica"] = await _run(_check_replica)
+    ready = all(result == "ok" for result in checks.values())
+    return JSONResponse(
+        {"status": "ready" if ready else "unavailable", "checks": checks},
+        status_code=200 if ready else 503,
+    )
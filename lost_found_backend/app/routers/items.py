@@ -1,26 +1,31 @@
 # app/routers/items.py
-import os
-import uuid
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..database import get_db
-from ..models import Item, UserAccount, Category, ItemImage, Location, Report
+from ..models import Item, ItemImage, ItemSummary
 from ..schemas import Item as ItemSchema, ItemCreate, ItemUpdate, ItemImage as ItemImageSchema, Category as CategorySchema, Location as LocationSchema
-from ..auth import get_current_active_user
-from datetime import datetime
+from ..auth import Principal, get_current_active_user
+from ..queries import ITEM_CARD_FIELDS, ITEM_FIELDS, item_columns, select_fields, summary_to_dict
+from ..pagination import DEFAULT_PAGE_SIZE, clamp_limit, paginate
+from ..responses import json_response
+from .. import search, summary
+from ..uploads import save_upload
+from ..images import process_image
+from ..http_cache import cached_response
+from ..refdata import refdata
+from ..matching import matcher
+from ..audit import audit
+from ..ratelimit import limit_user
+from datetime import date, datetime
 
 router = APIRouter(prefix="/items", tags=["items"])
 
-UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
-if not os.path.exists(UPLOAD_DIR):
-    os.makedirs(UPLOAD_DIR)
-
-@router.post("/", response_model=ItemSchema, status_code=status.HTTP_201_CREATED)
-def create_item(
+@router.post("/", response_model=ItemSchema, status_code=status.HTTP_201_CREATED, dependencies=[Depends(limit_user("write"))])
+async def create_item(
     item: ItemCreate,
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     db_item = Item(
         title=item.title,
@@ -30,108 +35,128 @@ def create_item(
         current_status=item.current_status
     )
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
-
-    category = db.query(Category).filter(Category.category_id == db_item.category_id).first()
+    await db.flush()
+    rows = await summary.refresh(db, db_item.item_id)
+    await db.commit()
+    await search.index_item(db, db_item.item_id)
 
-    return {
-        **db_item.__dict__,
-        "creator_name": current_user.name,
-        "category_name": category.category_name if category else None,
-        "images": []
-    }
+    return summary_to_dict(rows[db_item.item_id])
 
-@router.post("/{item_id}/images", response_model=ItemImageSchema, status_code=status.HTTP_201_CREATED)
+@router.post("/{item_id}/images", response_model=ItemImageSchema, status_code=status.HTTP_201_CREATED, dependencies=[Depends(limit_user("write"))])
 async def upload_image(
     item_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_item = db.query(Item).filter(Item.item_id == item_id).first()
+    db_item = await db.get(Item, item_id)
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    if db_item.created_by != current_user.user_id and current_user.role.role_name != "admin":
+    if db_item.created_by != current_user.user_id and current_user.role_name != "admin":
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    file_extension = file.filename.split(".")[-1]
-    unique_filename = f"{uuid.uuid4()}.{file_extension}"
-    file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-    with open(file_path, "wb") as buffer:
-        contents = await file.read()
-        buffer.write(contents)
+    unique_filename = await save_upload(file)
 
     db_image = ItemImage(
         item_id=item_id,
         file_path=f"/uploads/{unique_filename}"
     )
     db.add(db_image)
-    db.commit()
-    db.refresh(db_image)
-
+    await summary.refresh(db, item_id)
+    await db.commit()
+    await db.refresh(db_image)
+    background_tasks.add_task(process_image, db_image.image_id)
     return db_image
 
 @router.get("/", response_model=List[ItemSchema])
-def read_items(
+async def read_items(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    view: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(Item).join(UserAccount, Item.created_by == UserAccount.user_id).outerjoin(Category, Item.category_id == Category.category_id)
+    """
+    Items, newest first. ``view=card`` returns only what a list row shows;
+    ``fields=a,b,c`` picks any subset of the item fields.
+    """
+    fields = select_fields(fields, view, ITEM_FIELDS, ITEM_CARD_FIELDS, "item_id")
+    stmt = item_columns(fields)
 
     if status:
-        query = query.filter(Item.current_status == status)
+        stmt = stmt.where(ItemSummary.current_status == status)
 
-    items = query.offset(skip).limit(limit).all()
+    items, next_cursor = await paginate(db, stmt, ItemSummary.created_on, ItemSummary.item_id, limit, skip, cursor)
+    return json_response([summary_to_dict(item, fields=fields) for item in items], next_cursor=next_cursor)
 
-    result = []
-    for item in items:
-        images = db.query(ItemImage).filter(ItemImage.item_id == item.item_id).all()
-        result.append({
-            **item.__dict__,
-            "creator_name": item.creator.name if item.creator else None,
-            "category_name": item.category.category_name if item.category else None,
-            "images": images
-        })
+@router.get("/search", response_model=List[ItemSchema])
+async def search_items(
+    q: str,
+    category_id: Optional[int] = None,
+    location_id: Optional[int] = None,
+    status: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    skip: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+    view: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Ranked full-text search over item titles, descriptions and report details."""
+    fields = select_fields(fields, view, ITEM_FIELDS, ITEM_CARD_FIELDS, "item_id")
+    filters = search.SearchFilters(
+        category_id=category_id,
+        location_id=location_id,
+        status=status,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    ranked = await search.get_search_backend(db).search(db, q, filters, clamp_limit(limit), max(skip, 0))
+    if not ranked:
+        return []
 
-    return result
+    items = {item.item_id: item for item in await db.execute(
+        item_columns(fields).where(ItemSummary.item_id.in_([i for i, _ in ranked]))
+    )}
+    return json_response([summary_to_dict(items[i], fields=fields) for i, _ in ranked if i in items])
 
 @router.get("/{item_id}", response_model=ItemSchema)
-def read_item(item_id: int, db: Session = Depends(get_db)):
-    db_item = db.query(Item).filter(Item.item_id == item_id).first()
-    if db_item is None:
+async def read_item(item_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    row = await db.get(ItemSummary, item_id)
+    if row is None:
+        # Not summarised yet (e.g. before the first rebuild): compute it live.
+        row = await summary.preview(db, item_id)
+    if row is None:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    images = db.query(ItemImage).filter(ItemImage.item_id == item_id).all()
-    last_report = db.query(Report).filter(Report.item_id == item_id).order_by(Report.reported_on.desc()).first()
-    last_loc = db.query(Location).filter(Location.location_id == last_report.location_id).first() if last_report and last_report.location_id else None
-
-    return {
-        **db_item.__dict__,
-        "creator_name": db_item.creator.name if db_item.creator else None,
-        "category_name": db_item.category.category_name if db_item.category else None,
-        "images": images,
-        "last_report_type": last_report.report_type if last_report else None,
-        "last_report_date": last_report.reported_date if last_report else None,
-        "last_location_name": last_loc.location_name if last_loc else None
-    }
+    body = summary_to_dict(row)
+    # The summary row is recomputed whenever anything shown on the page
+    # changes, so a hash of the body is an exact validator and its
+    # refresh time (None for a live preview) a safe Last-Modified.
+    return cached_response(
+        request,
+        body,
+        "item",
+        last_modified=row.refreshed_on,
+    )
 
 @router.put("/{item_id}", response_model=ItemSchema)
-def update_item(
+async def update_item(
     item_id: int,
     item: ItemUpdate,
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_item = db.query(Item).filter(Item.item_id == item_id).first()
+    db_item = await db.get(Item, item_id)
     if db_item is None:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    if db_item.created_by != current_user.user_id and current_user.role.role_name != "admin":
+    if db_item.created_by != current_user.user_id and current_user.role_name != "admin":
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
     update_data = item.model_dump(exclude_unset=True)
@@ -139,41 +164,42 @@ def update_item(
         setattr(db_item, key, value)
 
     db_item.last_status_change = datetime.now()
-    db.commit()
-    db.refresh(db_item)
-
-    category = db.query(Category).filter(Category.category_id == db_item.category_id).first()
-    images = db.query(ItemImage).filter(ItemImage.item_id == item_id).all()
+    rows = await summary.refresh(db, item_id)
+    await db.commit()
+    await search.index_item(db, item_id)
+    if {"title", "category_id"} & update_data.keys():
+        # Report matching scores on the item's title and category
+        await matcher.index_item(db, item_id)
+    await audit.history(item_id, "item_updated", "Updated " + ", ".join(sorted(update_data)), current_user.user_id)
 
-    return {
-        **db_item.__dict__,
-        "creator_name": db_item.creator.name if db_item.creator else None,
-        "category_name": category.category_name if category else None,
-        "images": images
-    }
+    return summary_to_dict(rows[item_id])
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_item(
+async def delete_item(
     item_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_item = db.query(Item).filter(Item.item_id == item_id).first()
+    db_item = await db.get(Item, item_id)
     if db_item is None:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    if db_item.created_by != current_user.user_id and current_user.role.role_name != "admin":
+    if db_item.created_by != current_user.user_id and current_user.role_name != "admin":
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    db.delete(db_item)
-    db.commit()
+    await db.delete(db_item)
+    await summary.refresh(db, item_id)
+    await db.commit()
+    search.remove_item(db, item_id)
     return None
 
 # --- Backwards-compatible endpoints for frontend ---
 @router.get("/categories/all", response_model=List[CategorySchema])
-def get_categories_all(db: Session = Depends(get_db)):
-    return db.query(Category).order_by(Category.category_name).all()
+async def get_categories_all(request: Request, db: AsyncSession = Depends(get_db)):
+    snap = await refdata.get(db)
+    return cached_response(request, snap.categories, "reference", etag=snap.categories_etag)
 
 @router.get("/locations/all", response_model=List[LocationSchema])
-def get_locations_all(db: Session = Depends(get_db)):
-    return db.query(Location).order_by(Location.location_name).all()
+async def get_locations_all(request: Request, db: AsyncSession = Depends(get_db)):
+    snap = await refdata.get(db)
+    return cached_response(request, snap.locations, "reference", etag=snap.locations_etag)
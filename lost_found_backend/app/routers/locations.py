@@ -1,14 +1,16 @@
 # app/routers/locations.py
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from ..database import get_db
-from ..models import Location
 from ..schemas import Location as LocationSchema
+from ..http_cache import cached_response
+from ..refdata import refdata
 
 router = APIRouter(prefix="/locations", tags=["locations"])
 
 @router.get("/", response_model=List[LocationSchema])
-def get_locations(db: Session = Depends(get_db)):
+async def get_locations(request: Request, db: AsyncSession = Depends(get_db)):
     """Return all locations."""
-    return db.query(Location).order_by(Location.location_name).all()
+    snap = await refdata.get(db)
+    return cached_response(request, snap.locations, "reference", etag=snap.locations_etag)
@@ -0,0 +1,16 @@
+# app/routers/metrics.py
+import os
+
+from fastapi import APIRouter, Depends
+from ..auth import check_admin_permission
+from ..metrics import collect_metrics
+
+# Serve /metrics without a token, for a scraper on an internal network only
+METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "false").strip().lower() in ("1", "true", "yes", "on")
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("/", dependencies=[] if METRICS_PUBLIC else [Depends(check_admin_permission)])
+def get_metrics():
+    """Per-process runtime counters (hashing pool, caches, DB pool, ...). Admins only by default."""
+    return collect_metrics()
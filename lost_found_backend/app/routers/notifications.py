@@ -1,30 +1,139 @@
 # app/routers/notifications.py
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ..database import get_db
-from ..auth import get_current_active_user
-from ..models import UserAccount
+import asyncio
+import json
+import os
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import AsyncSessionLocal, get_db
+from ..models import Notification
+from ..schemas import Notification as NotificationSchema, StreamTicket, UnreadCount
+from ..auth import (
+    STREAM_TICKET_SECONDS,
+    Principal,
+    create_stream_ticket,
+    get_current_active_user,
+    get_current_user,
+    get_stream_user,
+)
+from ..pagination import DEFAULT_PAGE_SIZE, paginate
+from ..responses import json_response
+from ..notifications import ADMINS, hub, user_channel
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
-@router.get("/")
-def get_notifications(
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(get_current_active_user)
+# Comment line sent on idle streams so proxies don't time them out
+NOTIFY_KEEPALIVE = float(os.getenv("NOTIFY_KEEPALIVE", "15"))
+
+@router.get("/", response_model=List[NotificationSchema])
+async def get_notifications(
+    unread_only: bool = True,
+    skip: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """The current user's inbox, newest first (unread only by default)."""
+    stmt = select(*Notification.__table__.columns).where(Notification.user_id == current_user.user_id)
+    if unread_only:
+        stmt = stmt.where(Notification.is_read == False)  # noqa: E712
+    notifications, next_cursor = await paginate(
+        db, stmt, Notification.created_on, Notification.notification_id, limit, skip, cursor
+    )
+    return json_response([dict(n._mapping) for n in notifications], next_cursor=next_cursor)
+
+@router.get("/unread-count", response_model=UnreadCount)
+async def get_unread_count(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    count = await db.scalar(
+        select(func.count()).select_from(Notification)
+        .where(Notification.user_id == current_user.user_id, Notification.is_read == False)  # noqa: E712
+    )
+    return {"unread": count}
+
+@router.post("/{notification_id}/read", status_code=status.HTTP_204_NO_CONTENT)
+async def mark_read(
+    notification_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    result = await db.execute(
+        update(Notification)
+        .where(Notification.notification_id == notification_id, Notification.user_id == current_user.user_id)
+        .values(is_read=True)
+    )
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Notification not found")
+    await db.commit()
+    return None
+
+@router.post("/read-all", status_code=status.HTTP_204_NO_CONTENT)
+async def mark_all_read(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
+    await db.execute(
+        update(Notification)
+        .where(Notification.user_id == current_user.user_id, Notification.is_read == False)  # noqa: E712
+        .values(is_read=True)
+    )
+    await db.commit()
+    return None
+
+def _sse(payload):
+    return f"event: {payload.get('kind') or 'message'}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+@router.post("/stream-ticket", response_model=StreamTicket)
+async def get_stream_ticket(current_user: Principal = Depends(get_current_active_user)):
+    """A ticket for GET /notifications/stream, valid for STREAM_TICKET_SECONDS."""
+    return {"ticket": create_stream_ticket(current_user.user_id), "expires_in": STREAM_TICKET_SECONDS}
+
+@router.get("/stream")
+async def stream_notifications(request: Request, ticket: Optional[str] = None):
     """
-    Get notifications for the current user.
-    This is a placeholder endpoint for future notification features.
+    Server-sent events: the current user's new notifications (and, for
+    admins, dashboard events such as ``claim_decided``) as they commit.
+    EventSource can't send headers, so browsers pass a ticket from POST
+    /notifications/stream-ticket as ``?ticket=`` (an access token is refused
+    there); other clients may send the access token as a bearer header.
+    Fetch a new ticket and load GET /notifications/ on every reconnect.
     """
-    # TODO: Implement notification system
-    # This could include:
-    # - Claim status updates
-    # - Item status changes
-    # - New reports on user's items
-    # - Admin notifications
-    return {
-        "message": "Notifications feature coming soon",
-        "notifications": []
-    }
+    header = request.headers.get("authorization", "")
+    token = header[7:] if header.lower().startswith("bearer ") else None
+    if not token and not ticket:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    # Authenticate with a short-lived session: a Depends(get_db) session
+    # would hold its connection for as long as the stream stays open.
+    async with AsyncSessionLocal() as db:
+        user = await (get_current_user(token, db) if token else get_stream_user(ticket, db))
+
+    channels = [user_channel(user.user_id)]
+    if user.role_name == "admin":
+        channels.append(ADMINS)
+    sub = hub.subscribe(channels)
+
+    async def events():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    payload = await asyncio.wait_for(sub.queue.get(), NOTIFY_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if payload is None:
+                    return
+                yield _sse(payload)
+        finally:
+            hub.unsubscribe(sub)
 
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
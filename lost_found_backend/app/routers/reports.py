@@ -1,19 +1,31 @@
 # app/routers/reports.py
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..database import get_db
-from ..models import Report, Item, UserAccount, Location
-from ..schemas import Report as ReportSchema, ReportCreate
-from ..auth import get_current_active_user
+from ..models import Report, Item, Location
+from ..schemas import (
+    Report as ReportSchema, ReportCreate, ReportMatch as ReportMatchSchema,
+    BulkReportStatus, BulkReportStatusResults,
+)
+from ..auth import Principal, get_current_active_user, check_admin_permission
+from ..queries import REPORT_CARD_FIELDS, REPORT_FIELDS, report_query, report_rows, report_to_dict, select_fields
+from ..pagination import DEFAULT_PAGE_SIZE, paginate
+from ..responses import json_response
+from .. import decisions, search, summary
+from ..matching import matcher, match_new_report
+from ..refdata import refdata
+from ..audit import audit
+from ..ratelimit import limit_user
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
-@router.post("/", response_model=ReportSchema)
-def create_report(report: ReportCreate, db: Session = Depends(get_db), current_user: UserAccount = Depends(get_current_active_user)):
+@router.post("/", response_model=ReportSchema, dependencies=[Depends(limit_user("report")), Depends(limit_user("write"))])
+async def create_report(report: ReportCreate, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_active_user)):
     item = None
     if report.item_id:
-        item = db.query(Item).filter(Item.item_id == report.item_id).first()
+        item = await db.get(Item, report.item_id)
     if not item and report.item_title:
         title = report.item_title.strip()
         if not title:
@@ -25,20 +37,18 @@ def create_report(report: ReportCreate, db: Session = Depends(get_db), current_u
             current_status="lost" if report.report_type == "lost" else "found"
         )
         db.add(item)
-        db.commit()
-        db.refresh(item)
+        await db.flush()
     if not item:
         raise HTTPException(404, "Item not found")
     loc_id = report.location_id
     if not loc_id and report.location_name:
         name = report.location_name.strip()
         if name:
-            loc = db.query(Location).filter(Location.location_name == name).first()
+            loc = (await db.scalars(select(Location).where(Location.location_name == name))).first()
             if not loc:
                 loc = Location(location_name=name)
                 db.add(loc)
-                db.commit()
-                db.refresh(loc)
+                await db.flush()
             loc_id = loc.location_id
     db_report = Report(
         item_id=item.item_id,
@@ -49,84 +59,122 @@ def create_report(report: ReportCreate, db: Session = Depends(get_db), current_u
         details=report.details,
         status=report.status
     )
-    db.add(db_report); db.commit(); db.refresh(db_report)
-    return {
-        **db_report.__dict__,
-        "reporter_name": current_user.name,
-        "item_title": item.title,
-        "location_name": db_report.location.location_name if db_report.location else None
-    }
+    db.add(db_report)
+    await summary.refresh(db, item.item_id)
+    await db.commit()
+    await search.index_item(db, item.item_id)
+    await refdata.get(db)
+    background_tasks.add_task(match_new_report, db_report.report_id)
+    row = (await db.execute(report_rows().where(Report.report_id == db_report.report_id))).first()
+    return json_response(report_to_dict(row))
 
 @router.get("/", response_model=List[ReportSchema])
-def read_reports(
+async def read_reports(
     report_type: Optional[str] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    skip: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    view: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(Report)
+    """Reports, newest first; ``view=card`` / ``fields=a,b,c`` narrow each row."""
+    fields = select_fields(fields, view, REPORT_FIELDS, REPORT_CARD_FIELDS, "report_id")
+    stmt = report_rows(fields)
     if report_type:
-        query = query.filter(Report.report_type == report_type)
+        stmt = stmt.where(Report.report_type == report_type)
     if status:
-        query = query.filter(Report.status == status)
-    reports = query.all()
-    result = []
-    for r in reports:
-        loc = db.query(Location).filter(Location.location_id == r.location_id).first() if r.location_id else None
-        result.append({
-            **r.__dict__,
-            "reporter_name": r.reporter.name if r.reporter else None,
-            "item_title": r.item.title if r.item else None,
-            "location_name": loc.location_name if loc else None
-        })
-    return result
+        stmt = stmt.where(Report.status == status)
+    reports, next_cursor = await paginate(db, stmt, Report.reported_on, Report.report_id, limit, skip, cursor)
+    await refdata.get(db)
+    return json_response([report_to_dict(r, fields=fields) for r in reports], next_cursor=next_cursor)
 
 @router.get("/{report_id}", response_model=ReportSchema)
-def read_report(report_id: int, db: Session = Depends(get_db)):
-    r = db.query(Report).filter(Report.report_id == report_id).first()
+async def read_report(report_id: int, db: AsyncSession = Depends(get_db)):
+    r = (await db.execute(report_rows().where(Report.report_id == report_id))).first()
     if not r:
         raise HTTPException(status_code=404, detail="Report not found")
-    loc = db.query(Location).filter(Location.location_id == r.location_id).first() if r.location_id else None
-    return {
-        **r.__dict__,
-        "reporter_name": r.reporter.name if r.reporter else None,
-        "item_title": r.item.title if r.item else None,
-        "location_name": loc.location_name if loc else None
-    }
+    await refdata.get(db)
+    return json_response(report_to_dict(r))
+
+@router.get("/{report_id}/matches", response_model=List[ReportMatchSchema])
+async def read_report_matches(report_id: int, db: AsyncSession = Depends(get_db)):
+    """Open counterpart reports (lost <-> found) ranked by match score."""
+    r = await db.scalar(select(Report.report_id).where(Report.report_id == report_id))
+    if not r:
+        raise HTTPException(status_code=404, detail="Report not found")
+    ranked = await matcher.matches(db, report_id)
+    if not ranked:
+        return []
+    reports = {m.report_id: m for m in await db.execute(report_rows().where(Report.report_id.in_([i for i, _ in ranked])))}
+    await refdata.get(db)
+    return json_response([report_to_dict(reports[i], {"score": s}) for i, s in ranked if i in reports])
+
+@router.put("/bulk-status", response_model=BulkReportStatusResults)
+async def bulk_update_report_status(
+    payload: BulkReportStatus,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(check_admin_permission)
+):
+    """
+    Set the status of many reports in one transaction. Each report gets its
+    own result: updated, not_found, invalid (unknown status) or conflict
+    (listed twice with different statuses).
+    """
+    wanted, results = decisions.check_bulk(
+        [(u.report_id, u.status) for u in payload.updates], decisions.REPORT_STATUSES
+    )
+    item_ids = {}
+    if wanted:
+        applied, item_ids = await decisions.set_report_statuses(db, wanted)
+        results.update(applied)
+        await db.commit()
+        for report_id, item_id in item_ids.items():
+            status = wanted[report_id]
+            await audit.history(item_id, f"report_status:{status}", f"Report #{report_id} set to {status}", current_user.user_id)
+        await matcher.index_reports(db, item_ids)
+        await refdata.get(db)
+    return {"results": [
+        {"report_id": report_id, "result": results[report_id]}
+        for report_id in dict.fromkeys(u.report_id for u in payload.updates)
+    ]}
 
 @router.put("/{report_id}/status", response_model=ReportSchema)
-def update_report_status(
+async def update_report_status(
     report_id: int,
     status: str,
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Update report status. Users can mark their own reports as completed."""
-    r = db.query(Report).filter(Report.report_id == report_id).first()
+    r = (await db.scalars(report_query().where(Report.report_id == report_id))).first()
     if not r:
         raise HTTPException(status_code=404, detail="Report not found")
     
     # Users can only update their own reports, unless they're admin
-    if r.reporter_id != current_user.user_id and current_user.role.role_name != "admin":
+    if r.reporter_id != current_user.user_id and current_user.role_name != "admin":
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    if status not in ["open", "in_review", "resolved"]:
+    if status not in decisions.REPORT_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid status")
     
     r.status = status
-    db.commit()
-    db.refresh(r)
     
     # If marking as resolved, also update item status to completed
     if status == "resolved" and r.item:
         r.item.current_status = "completed"
         from datetime import datetime
         r.item.last_status_change = datetime.now()
-        db.commit()
+
+    await summary.refresh(db, r.item_id)
+    await db.commit()
+    await audit.history(r.item_id, f"report_status:{status}", f"Report #{report_id} set to {status}", current_user.user_id)
+
+    if status == "resolved":
+        matcher.remove_report(report_id)
+    else:
+        await matcher.index_report(db, report_id)
+    await refdata.get(db)
     
-    loc = db.query(Location).filter(Location.location_id == r.location_id).first() if r.location_id else None
-    return {
-        **r.__dict__,
-        "reporter_name": r.reporter.name if r.reporter else None,
-        "item_title": r.item.title if r.item else None,
-        "location_name": loc.location_name if loc else None
-    }
\ No newline at end of file
+    return report_to_dict(r)
\ No newline at end of file
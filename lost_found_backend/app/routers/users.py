@@ -1,42 +1,40 @@
 # app/routers/users.py
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..database import get_db
 from ..models import UserAccount
 from ..schemas import User as UserSchema
-from ..auth import get_current_active_user, check_admin_permission
+from ..auth import Principal, get_current_active_user, check_admin_permission
+from ..pagination import DEFAULT_PAGE_SIZE, paginate
+from ..queries import user_rows, user_to_dict
+from ..responses import json_response
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/me", response_model=UserSchema)
-def read_user_me(current_user: UserAccount = Depends(get_current_active_user)):
-    return {
-        **current_user.__dict__,
-        "role_name": current_user.role.role_name if current_user.role else None
-    }
+async def read_user_me(db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_active_user)):
+    user = (await db.execute(user_rows().where(UserAccount.user_id == current_user.user_id))).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return json_response(user_to_dict(user))
 
 @router.get("/", response_model=List[UserSchema])
-def read_users(
+async def read_users(
     skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(check_admin_permission)
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(check_admin_permission)
 ):
-    users = db.query(UserAccount).offset(skip).limit(limit).all()
-    result = []
-    for user in users:
-        result.append({
-            **user.__dict__,
-            "role_name": user.role.role_name if user.role else None
-        })
-    return result
+    users, next_cursor = await paginate(db, user_rows(), UserAccount.created_at, UserAccount.user_id, limit, skip, cursor)
+    return json_response([user_to_dict(user) for user in users], next_cursor=next_cursor)
 
 @router.get("/dashboard/student")
-def get_student_dashboard(
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(get_current_active_user)
+async def get_student_dashboard(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     query = text("""
     SELECT 
@@ -55,13 +53,13 @@ def get_student_dashboard(
     WHERE r.reporter_id = :uid
     ORDER BY r.reported_on DESC
     """)
-    rows = db.execute(query, {"uid": current_user.user_id}).fetchall()
+    rows = (await db.execute(query, {"uid": current_user.user_id})).fetchall()
     return [dict(r._mapping) for r in rows]
 
 @router.get("/dashboard/admin/pending_claims")
-def get_admin_pending_claims(
-    db: Session = Depends(get_db),
-    current_user: UserAccount = Depends(check_admin_permission)
+async def get_admin_pending_claims(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(check_admin_permission)
 ):
     query = text("""
     SELECT cl.claim_id, cl.item_id, i.title, cl.claimer_id, cu.name AS claimer_name, cl.claimed_on, i.current_status
@@ -71,5 +69,5 @@ def get_admin_pending_claims(
     WHERE cl.claim_status = 'pending'
     ORDER BY cl.claimed_on DESC
     """)
-    rows = db.execute(query).fetchall()
-    return [dict(r) for r in rows]
+    rows = (await db.execute(query)).fetchall()
+    return [dict(r._mapping) for r in rows]
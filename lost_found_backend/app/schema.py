@@ -0,0 +1,35 @@
+# app/schema.py
+"""
+Schema version helpers shared by ``init_db.py`` (which applies the Alembic
+migrations) and the readiness probe (which refuses traffic until the
+database is at the revision this code expects).
+"""
+import os
+from functools import lru_cache
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+VERSION_TABLE = "alembic_version"
+
+
+def alembic_config(url: str = None):
+    config = Config(ALEMBIC_INI)
+    if url:
+        config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    return config
+
+
+@lru_cache(maxsize=1)
+def expected_heads():
+    """Head revision(s) of the migrations shipped with this code."""
+    return frozenset(ScriptDirectory.from_config(alembic_config()).get_heads())
+
+
+def current_revisions(connection):
+    """Revision(s) recorded in the database; empty if never migrated or stamped."""
+    if not inspect(connection).has_table(VERSION_TABLE):
+        return frozenset()
+    return frozenset(connection.execute(text(f"SELECT version_num FROM {VERSION_TABLE}")).scalars())
@@ -1,6 +1,6 @@
 # app/schemas.py
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime, date
 
 # Auth
@@ -76,6 +76,10 @@ class Item(BaseModel):
     creator_name: Optional[str] = None
     category_name: Optional[str] = None
     images: Optional[List[dict]] = []
+    thumbnail_url: Optional[str] = None
+    last_report_type: Optional[str] = None
+    last_report_date: Optional[date] = None
+    last_location_name: Optional[str] = None
 
 # Report
 class ReportCreate(BaseModel):
@@ -104,6 +108,9 @@ class Report(BaseModel):
     item_title: Optional[str] = None
     location_name: Optional[str] = None
 
+class ReportMatch(Report):
+    score: float
+
 # ItemImage
 class ItemImage(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -111,6 +118,8 @@ class ItemImage(BaseModel):
     image_id: int
     item_id: int
     file_path: str
+    thumbnail_path: Optional[str] = None
+    medium_path: Optional[str] = None
     uploaded_on: Optional[datetime] = None
 
 # Claim
@@ -132,3 +141,85 @@ class Claim(BaseModel):
     item_title: Optional[str] = None
     claimer_name: Optional[str] = None
     decider_name: Optional[str] = None
+
+# Notification
+class Notification(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    notification_id: int
+    user_id: int
+    kind: Optional[str] = None
+    message: str
+    item_id: Optional[int] = None
+    claim_id: Optional[int] = None
+    report_id: Optional[int] = None
+    is_read: Optional[bool] = False
+    created_on: Optional[datetime] = None
+
+class UnreadCount(BaseModel):
+    unread: int
+
+class StreamTicket(BaseModel):
+    ticket: str
+    expires_in: int
+
+# Bulk admin decisions
+class ClaimDecision(BaseModel):
+    claim_id: int
+    decision: str  # "approve" | "reject"
+
+class BulkClaimDecisions(BaseModel):
+    decisions: List[ClaimDecision]
+
+class ClaimDecisionResult(BaseModel):
+    claim_id: int
+    result: str
+
+class BulkClaimDecisionResults(BaseModel):
+    results: List[ClaimDecisionResult]
+    auto_rejected: List[int] = []
+
+class ReportStatusUpdate(BaseModel):
+    report_id: int
+    status: str
+
+class BulkReportStatus(BaseModel):
+    updates: List[ReportStatusUpdate]
+
+class ReportStatusResult(BaseModel):
+    report_id: int
+    result: str
+
+class BulkReportStatusResults(BaseModel):
+    results: List[ReportStatusResult]
+
+# Dashboard statistics
+class CategoryCount(BaseModel):
+    category_id: Optional[int] = None
+    category_name: Optional[str] = None
+    count: int
+
+class LocationCount(BaseModel):
+    location_id: Optional[int] = None
+    location_name: Optional[str] = None
+    count: int
+
+class TrendPoint(BaseModel):
+    date: date
+    count: int
+
+class StudentDashboardStats(BaseModel):
+    items_by_status: Dict[str, int]
+    reports_by_status: Dict[str, int]
+    reports_by_type: Dict[str, int]
+    claims_by_status: Dict[str, int]
+
+class AdminDashboardStats(BaseModel):
+    items_by_status: Dict[str, int]
+    items_by_category: List[CategoryCount]
+    items_by_location: List[LocationCount]
+    reports_by_status: Dict[str, int]
+    reports_by_type: Dict[str, int]
+    claims_by_status: Dict[str, int]
+    pending_claims: int
+    trends: Dict[str, List[TrendPoint]]
@@ -0,0 +1,229 @@
+# app/search.py
+"""
+Full-text item search.
+
+Items are indexed on ``Item.title``, ``Item.description`` and the
+``Report.details`` of every report filed against them. Two backends share
+one interface:
+
+- ``MySQLFulltextBackend`` ranks with ``MATCH ... AGAINST`` over the
+  FULLTEXT indexes declared in ``models.py`` (production).
+- ``InvertedIndexBackend`` keeps a TF-IDF inverted index in process memory
+  for databases without full-text support (SQLite test runs).
+
+``get_search_backend`` picks one from the session's dialect. Write paths
+call ``index_item`` / ``remove_item`` after committing so the in-process
+index stays current; both are no-ops for MySQL, which maintains its own
+index. Database reads are awaited outside the index lock; the lock only
+guards the in-memory structures.
+"""
+import math
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Item, Report
+
+MAX_CANDIDATES = 1000
+
+TITLE_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.0
+DETAILS_WEIGHT = 1.0
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = {
+    "a", "an", "and", "at", "by", "for", "from", "in", "is", "it", "my",
+    "near", "of", "on", "or", "the", "to", "was", "with",
+}
+
+
+def tokenize(text: Optional[str]):
+    if not text:
+        return []
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+@dataclass
+class SearchFilters:
+    category_id: Optional[int] = None
+    location_id: Optional[int] = None
+    status: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+    def apply(self, query):
+        if self.category_id is not None:
+            query = query.filter(Item.category_id == self.category_id)
+        if self.status:
+            query = query.filter(Item.current_status == self.status)
+        if self.location_id is not None:
+            query = query.filter(exists().where(
+                Report.item_id == Item.item_id,
+                Report.location_id == self.location_id,
+            ))
+        if self.date_from:
+            query = query.filter(Item.created_on >= datetime.combine(self.date_from, time.min))
+        if self.date_to:
+            query = query.filter(Item.created_on < datetime.combine(self.date_to + timedelta(days=1), time.min))
+        return query
+
+    def is_empty(self):
+        return all(v is None for v in (self.category_id, self.location_id, self.status, self.date_from, self.date_to))
+
+
+class SearchBackend:
+    """Return ``[(item_id, score), ...]`` ranked best first."""
+
+    async def search(self, db: AsyncSession, q: str, filters: SearchFilters, limit: int, offset: int = 0):
+        raise NotImplementedError
+
+    async def index_item(self, db: AsyncSession, item_id: int):
+        pass
+
+    def remove_item(self, item_id: int):
+        pass
+
+
+class MySQLFulltextBackend(SearchBackend):
+    async def search(self, db: AsyncSession, q: str, filters: SearchFilters, limit: int, offset: int = 0):
+        from sqlalchemy.dialects.mysql import match
+
+        item_match = match(Item.title, Item.description, against=q).in_natural_language_mode()
+        details_match = match(Report.details, against=q).in_natural_language_mode()
+
+        report_scores = (
+            select(Report.item_id.label("item_id"), func.max(details_match).label("score"))
+            .where(details_match)
+            .group_by(Report.item_id)
+            .subquery()
+        )
+        score = (item_match * TITLE_WEIGHT + func.coalesce(report_scores.c.score, 0) * DETAILS_WEIGHT).label("score")
+
+        stmt = (
+            select(Item.item_id, score)
+            .outerjoin(report_scores, report_scores.c.item_id == Item.item_id)
+            .where(item_match | report_scores.c.item_id.isnot(None))
+        )
+        stmt = filters.apply(stmt)
+        rows = (await db.execute(
+            stmt.order_by(score.desc(), Item.item_id.desc()).offset(offset).limit(limit)
+        )).all()
+        return [(row.item_id, float(row.score)) for row in rows]
+
+
+class InvertedIndexBackend(SearchBackend):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = False
+        # token -> {item_id: weighted term frequency}
+        self._postings = defaultdict(dict)
+        # item_id -> tokens it contributes, for cheap removal
+        self._doc_tokens = {}
+
+    def _add(self, item_id: int, title: Optional[str], description: Optional[str], details):
+        weights = defaultdict(float)
+        for tok in tokenize(title):
+            weights[tok] += TITLE_WEIGHT
+        for tok in tokenize(description):
+            weights[tok] += DESCRIPTION_WEIGHT
+        for text in details:
+            for tok in tokenize(text):
+                weights[tok] += DETAILS_WEIGHT
+        for tok, weight in weights.items():
+            self._postings[tok][item_id] = weight
+        self._doc_tokens[item_id] = set(weights)
+
+    def _remove(self, item_id: int):
+        for tok in self._doc_tokens.pop(item_id, ()):
+            postings = self._postings.get(tok)
+            if postings is not None:
+                postings.pop(item_id, None)
+                if not postings:
+                    del self._postings[tok]
+
+    async def _ensure_built(self, db: AsyncSession):
+        if self._built:
+            return
+        details = defaultdict(list)
+        for item_id, text in await db.execute(select(Report.item_id, Report.details).where(Report.details.isnot(None))):
+            details[item_id].append(text)
+        items = (await db.execute(select(Item.item_id, Item.title, Item.description))).all()
+        with self._lock:
+            if self._built:
+                return
+            for item_id, title, description in items:
+                self._add(item_id, title, description, details.get(item_id, ()))
+            self._built = True
+
+    async def index_item(self, db: AsyncSession, item_id: int):
+        if not self._built:
+            return
+        row = (await db.execute(
+            select(Item.item_id, Item.title, Item.description).where(Item.item_id == item_id)
+        )).first()
+        details = list(await db.scalars(
+            select(Report.details).where(Report.item_id == item_id, Report.details.isnot(None))
+        ))
+        with self._lock:
+            self._remove(item_id)
+            if row:
+                self._add(row.item_id, row.title, row.description, details)
+
+    def remove_item(self, item_id: int):
+        with self._lock:
+            self._remove(item_id)
+
+    async def search(self, db: AsyncSession, q: str, filters: SearchFilters, limit: int, offset: int = 0):
+        await self._ensure_built(db)
+        terms = set(tokenize(q))
+        if not terms:
+            return []
+
+        scores = defaultdict(float)
+        with self._lock:
+            n_docs = max(len(self._doc_tokens), 1)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + n_docs / len(postings))
+                for item_id, tf in postings.items():
+                    scores[item_id] += tf * idf
+
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], -kv[0]))[:MAX_CANDIDATES]
+        if ranked and not filters.is_empty():
+            allowed = set(await db.scalars(
+                filters.apply(select(Item.item_id).where(Item.item_id.in_([i for i, _ in ranked])))
+            ))
+            ranked = [(i, s) for i, s in ranked if i in allowed]
+        return ranked[offset:offset + limit]
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_search_backend(db: AsyncSession) -> SearchBackend:
+    dialect = db.get_bind().dialect.name
+    backend = _backends.get(dialect)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.get(dialect)
+            if backend is None:
+                backend = MySQLFulltextBackend() if dialect == "mysql" else InvertedIndexBackend()
+                _backends[dialect] = backend
+    return backend
+
+
+async def index_item(db: AsyncSession, item_id: int):
+    await get_search_backend(db).index_item(db, item_id)
+
+
+def remove_item(db: AsyncSession, item_id: int):
+    get_search_backend(db).remove_item(item_id)
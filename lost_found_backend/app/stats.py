@@ -0,0 +1,278 @@
+# app/stats.py
+"""
+Dashboard statistics served from incrementally maintained counters.
+
+Every item contributes a small set of counter keys (``scope|metric|bucket``)
+derived from the item, its reports and its claims. These cover:
+
+- its status, category, location and creation day;
+- each report's status, type and day;
+- each claim's status and day.
+
+Each key is counted site-wide (scope 0) and for the user who owns the item,
+report or claim. ``summary.refresh`` computes an item's keys together with
+its summary row and stores them in ``item_summary.stat_keys``. It then
+applies the difference from the previously stored keys to ``stat_counter``,
+with one upsert per changed counter, in the same transaction. A dashboard
+therefore reads a few dozen counter rows instead of scanning items,
+reports and claims.
+
+Every write would otherwise update the same few site-wide rows (e.g.
+``0|items_by_status|lost``) and queue behind their row locks, so those
+counters are split over STAT_SHARDS rows picked by item id and summed on
+read. Counters that drop to zero are deleted rather than kept.
+
+``rebuild_item_summary.py`` recomputes every counter from the stored keys
+(``--check`` compares them without writing).
+"""
+from datetime import date, timedelta
+
+from sqlalchemy import and_, delete, func, insert, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import ItemSummary, StatCounter
+from .refdata import refdata
+
+GLOBAL = 0
+NONE = "none"
+# Rows each site-wide counter is spread over (per-user counters use one)
+STAT_SHARDS = 16
+
+ITEM_STATUSES = ("lost", "found", "claimed", "completed", "discarded")
+REPORT_STATUSES = ("open", "in_review", "resolved")
+REPORT_TYPES = ("lost", "found")
+CLAIM_STATUSES = ("pending", "approved", "rejected")
+
+TRENDS = {
+    "items": "items_per_day",
+    "lost_reports": "lost_reports_per_day",
+    "found_reports": "found_reports_per_day",
+    "claims": "claims_per_day",
+}
+DEFAULT_TREND_DAYS = 30
+MAX_TREND_DAYS = 365
+
+
+def _key(scope, metric: str, bucket):
+    return f"{scope or GLOBAL}|{metric}|{NONE if bucket is None else bucket}"
+
+
+def _row_key(key: str, item_id: int):
+    """``(scope, metric, bucket, shard)`` of the counter row an item's key goes to."""
+    scope, metric, bucket = key.split("|", 2)
+    scope = int(scope)
+    return scope, metric, bucket, item_id % STAT_SHARDS if scope == GLOBAL else 0
+
+
+def _day(ts):
+    return ts.date().isoformat() if ts else None
+
+
+def item_keys(row: dict, reports, claims):
+    """
+    Counter keys for one item. ``row`` is its summary row, ``reports`` its
+    (reporter_id, report_type, status, reported_on) rows and ``claims`` its
+    (claimer_id, claim_status, claimed_on) rows.
+    """
+    keys = {}
+
+    def add(scope, metric, bucket):
+        key = _key(scope, metric, bucket)
+        keys[key] = keys.get(key, 0) + 1
+
+    status = row["current_status"]
+    add(GLOBAL, "items_by_status", status)
+    add(GLOBAL, "items_by_category", row["category_id"])
+    add(GLOBAL, "items_by_location", row["last_location_id"])
+    add(GLOBAL, "items_per_day", _day(row["created_on"]))
+    if row["created_by"]:
+        add(row["created_by"], "items_by_status", status)
+    for reporter_id, report_type, report_status, reported_on in reports:
+        for scope in {GLOBAL, reporter_id or GLOBAL}:
+            add(scope, "reports_by_status", report_status)
+            add(scope, "reports_by_type", report_type)
+        add(GLOBAL, f"{report_type}_reports_per_day", _day(reported_on))
+    for claimer_id, claim_status, claimed_on in claims:
+        for scope in {GLOBAL, claimer_id or GLOBAL}:
+            add(scope, "claims_by_status", claim_status)
+        add(GLOBAL, "claims_per_day", _day(claimed_on))
+    return keys
+
+
+# --------------------------------------------------------
+# Maintenance (sync sessions, inside summary.refresh)
+# --------------------------------------------------------
+_ROW_KEY = ("scope", "metric", "bucket", "shard")
+
+
+def _upsert(session: Session, rows):
+    if session.get_bind().dialect.name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as upsert
+        stmt = upsert(StatCounter)
+        stmt = stmt.on_duplicate_key_update(count=StatCounter.count + stmt.inserted["count"])
+    else:
+        from sqlalchemy.dialects.sqlite import insert as upsert
+        stmt = upsert(StatCounter)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(_ROW_KEY),
+            set_={"count": StatCounter.count + stmt.excluded["count"]},
+        )
+    session.execute(stmt, rows)
+
+
+def apply(session: Session, old_keys: dict, new_keys: dict):
+    """
+    Move the counters from ``old_keys`` to ``new_keys``, both
+    ``{item_id: key dict}``.
+    """
+    deltas = {}
+    for keys, sign in ((old_keys, -1), (new_keys, 1)):
+        for item_id, item_keys in keys.items():
+            for key, n in (item_keys or {}).items():
+                row_key = _row_key(key, item_id)
+                deltas[row_key] = deltas.get(row_key, 0) + sign * n
+    rows = []
+    # Sorted, so concurrent refreshes take the counter row locks in the same order
+    for row_key in sorted(deltas):
+        if deltas[row_key]:
+            rows.append({**dict(zip(_ROW_KEY, row_key)), "count": deltas[row_key]})
+    if not rows:
+        return
+    _upsert(session, rows)
+    # Only a decrement can bring a counter to zero
+    decremented = [tuple(row[c] for c in _ROW_KEY) for row in rows if row["count"] < 0]
+    if decremented:
+        session.execute(delete(StatCounter).where(
+            tuple_(*(getattr(StatCounter, c) for c in _ROW_KEY)).in_(decremented),
+            StatCounter.count == 0,
+        ))
+
+
+def _expected(session: Session, sharded: bool):
+    """Counter totals computed from the keys stored in item_summary."""
+    totals = {}
+    for item_id, keys in session.execute(
+        select(ItemSummary.item_id, ItemSummary.stat_keys).where(ItemSummary.stat_keys.isnot(None))
+    ):
+        for key, n in keys.items():
+            row_key = _row_key(key, item_id)
+            if not sharded:
+                row_key = row_key[:3]
+            totals[row_key] = totals.get(row_key, 0) + n
+    return {row_key: n for row_key, n in totals.items() if n}
+
+
+def rebuild(session: Session):
+    """Recompute every counter from the keys stored in item_summary."""
+    session.execute(delete(StatCounter))
+    rows = [
+        {**dict(zip(_ROW_KEY, row_key)), "count": n}
+        for row_key, n in _expected(session, sharded=True).items()
+    ]
+    if rows:
+        session.execute(insert(StatCounter), rows)
+    return len(rows)
+
+
+def check(session: Session):
+    """
+    Compare stat_counter with the totals of the stored keys. Returns a list
+    of ``(key, stored, expected)`` for every counter that differs.
+    """
+    expected = _expected(session, sharded=False)
+    stored = {
+        (scope, metric, bucket): count
+        for scope, metric, bucket, count in session.execute(
+            select(StatCounter.scope, StatCounter.metric, StatCounter.bucket, func.sum(StatCounter.count))
+            .group_by(StatCounter.scope, StatCounter.metric, StatCounter.bucket)
+        )
+        if count
+    }
+    return [
+        ("|".join(map(str, row_key)), stored.get(row_key, 0), expected.get(row_key, 0))
+        for row_key in sorted(expected.keys() | stored.keys())
+        if stored.get(row_key, 0) != expected.get(row_key, 0)
+    ]
+
+
+# --------------------------------------------------------
+# Reading
+# --------------------------------------------------------
+async def _counters(db: AsyncSession, scope: int, metrics, trend_since: date = None):
+    """``{metric: {bucket: count}}`` for ``scope``; trend metrics from ``trend_since`` on."""
+    conditions = [StatCounter.metric.in_(metrics)]
+    if trend_since is not None:
+        conditions.append(and_(
+            StatCounter.metric.in_(TRENDS.values()),
+            StatCounter.bucket >= trend_since.isoformat(),
+            StatCounter.bucket != NONE,
+        ))
+    total = func.sum(StatCounter.count)
+    result = {}
+    for metric, bucket, count in await db.execute(
+        select(StatCounter.metric, StatCounter.bucket, total)
+        .where(StatCounter.scope == scope, or_(*conditions))
+        .group_by(StatCounter.metric, StatCounter.bucket)
+        .having(total != 0)
+    ):
+        result.setdefault(metric, {})[bucket] = count
+    return result
+
+
+def _by_value(counts: dict, values):
+    return {value: counts.get(value, 0) for value in values}
+
+
+def _by_id(counts: dict, id_field: str, name_field: str, name_of):
+    rows = []
+    for bucket, count in sorted(counts.items(), key=lambda kv: -kv[1]):
+        ref_id = None if bucket == NONE else int(bucket)
+        rows.append({
+            id_field: ref_id,
+            name_field: name_of(ref_id) if ref_id is not None else None,
+            "count": count,
+        })
+    return rows
+
+
+def _series(counts: dict, since: date, days: int):
+    return [
+        {"date": day, "count": counts.get(day.isoformat(), 0)}
+        for day in (since + timedelta(days=n) for n in range(days))
+    ]
+
+
+async def admin_stats(db: AsyncSession, days: int = DEFAULT_TREND_DAYS):
+    days = max(1, min(days, MAX_TREND_DAYS))
+    since = date.today() - timedelta(days=days - 1)
+    counts = await _counters(db, GLOBAL, [
+        "items_by_status", "items_by_category", "items_by_location",
+        "reports_by_status", "reports_by_type", "claims_by_status",
+    ], since)
+    await refdata.get(db)
+    claims_by_status = _by_value(counts.get("claims_by_status", {}), CLAIM_STATUSES)
+    return {
+        "items_by_status": _by_value(counts.get("items_by_status", {}), ITEM_STATUSES),
+        "items_by_category": _by_id(counts.get("items_by_category", {}), "category_id", "category_name", refdata.category_name),
+        "items_by_location": _by_id(counts.get("items_by_location", {}), "location_id", "location_name", refdata.location_name),
+        "reports_by_status": _by_value(counts.get("reports_by_status", {}), REPORT_STATUSES),
+        "reports_by_type": _by_value(counts.get("reports_by_type", {}), REPORT_TYPES),
+        "claims_by_status": claims_by_status,
+        "pending_claims": claims_by_status["pending"],
+        "trends": {
+            name: _series(counts.get(metric, {}), since, days) for name, metric in TRENDS.items()
+        },
+    }
+
+
+async def student_stats(db: AsyncSession, user_id: int):
+    counts = await _counters(db, user_id, [
+        "items_by_status", "reports_by_status", "reports_by_type", "claims_by_status",
+    ])
+    return {
+        "items_by_status": _by_value(counts.get("items_by_status", {}), ITEM_STATUSES),
+        "reports_by_status": _by_value(counts.get("reports_by_status", {}), REPORT_STATUSES),
+        "reports_by_type": _by_value(counts.get("reports_by_type", {}), REPORT_TYPES),
+        "claims_by_status": _by_value(counts.get("claims_by_status", {}), CLAIM_STATUSES),
+    }
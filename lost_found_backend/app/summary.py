@@ -0,0 +1,233 @@
+# app/summary.py
+"""
+Maintenance of the ``item_summary`` projection.
+
+``item_summary`` holds everything an item card or the detail page shows
+(creator and category names, latest report and its location, images and
+the card thumbnail, pending claim count) in one row per item, so reads are
+a single-table lookup or index scan.
+
+Write paths that touch an item, its reports, images or claims call
+``refresh`` (or ``refresh_item_summaries`` with a sync session) after their
+changes and before committing. The row is recomputed from the source tables
+inside the same transaction, so it commits or rolls back with the change.
+``rebuild_item_summary.py`` rebuilds the table and checks it for drift.
+
+Each row also carries the item's contribution to the dashboard counters
+(``stat_keys``); a refresh moves ``stat_counter`` from the old contribution
+to the new one (see stats.py).
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from . import stats
+from .models import Category, Claim, Item, ItemImage, ItemSummary, Location, Report, UserAccount
+from .queries import card_image_url, image_to_dict
+
+# Columns compared by the consistency checker (everything but bookkeeping).
+COMPARED_FIELDS = [c.key for c in ItemSummary.__table__.columns if c.key != "refreshed_on"]
+
+
+def _image_json(image: ItemImage):
+    data = image_to_dict(image)
+    data["uploaded_on"] = image.uploaded_on.isoformat() if image.uploaded_on else None
+    return data
+
+
+def compute_rows(session: Session, item_ids):
+    """Build ``{item_id: row}`` for the given items from the source tables."""
+    ids = set(item_ids)
+    if not ids:
+        return {}
+
+    rows = {}
+    items = session.execute(
+        select(Item, UserAccount.name, Category.category_name)
+        .outerjoin(UserAccount, UserAccount.user_id == Item.created_by)
+        .outerjoin(Category, Category.category_id == Item.category_id)
+        .where(Item.item_id.in_(ids))
+    )
+    for item, creator_name, category_name in items:
+        rows[item.item_id] = {
+            "item_id": item.item_id,
+            "title": item.title,
+            "description": item.description,
+            "category_id": item.category_id,
+            "category_name": category_name,
+            "created_by": item.created_by,
+            "creator_name": creator_name,
+            "created_on": item.created_on,
+            "current_status": item.current_status,
+            "last_status_change": item.last_status_change,
+            "last_report_id": None,
+            "last_report_type": None,
+            "last_report_status": None,
+            "last_report_date": None,
+            "last_location_id": None,
+            "last_location_name": None,
+            "thumbnail_url": None,
+            "images": [],
+            "pending_claims": 0,
+            "stat_keys": {},
+        }
+    if not rows:
+        return rows
+    ids = set(rows)
+
+    # Latest report per item: same ordering as the report list.
+    rank = func.row_number().over(
+        partition_by=Report.item_id,
+        order_by=(Report.reported_on.desc(), Report.report_id.desc()),
+    ).label("rank")
+    ranked = (
+        select(Report.item_id, Report.report_id, Report.report_type, Report.status,
+               Report.reported_date, Report.location_id, rank)
+        .where(Report.item_id.in_(ids))
+        .subquery()
+    )
+    latest = session.execute(
+        select(ranked, Location.location_name)
+        .outerjoin(Location, Location.location_id == ranked.c.location_id)
+        .where(ranked.c.rank == 1)
+    )
+    for r in latest:
+        rows[r.item_id].update({
+            "last_report_id": r.report_id,
+            "last_report_type": r.report_type,
+            "last_report_status": r.status,
+            "last_report_date": r.reported_date,
+            "last_location_id": r.location_id,
+            "last_location_name": r.location_name,
+        })
+
+    images = {}
+    for image in session.scalars(
+        select(ItemImage).where(ItemImage.item_id.in_(ids)).order_by(ItemImage.image_id)
+    ):
+        images.setdefault(image.item_id, []).append(image)
+    for item_id, item_images in images.items():
+        rows[item_id]["images"] = [_image_json(img) for img in item_images]
+        rows[item_id]["thumbnail_url"] = card_image_url(item_images)
+
+    reports = {}
+    for r in session.execute(
+        select(Report.item_id, Report.reporter_id, Report.report_type, Report.status, Report.reported_on)
+        .where(Report.item_id.in_(ids))
+    ):
+        reports.setdefault(r.item_id, []).append(tuple(r)[1:])
+
+    claims = {}
+    for c in session.execute(
+        select(Claim.item_id, Claim.claimer_id, Claim.claim_status, Claim.claimed_on)
+        .where(Claim.item_id.in_(ids))
+    ):
+        claims.setdefault(c.item_id, []).append(tuple(c)[1:])
+
+    for item_id, row in rows.items():
+        item_claims = claims.get(item_id, ())
+        row["pending_claims"] = sum(1 for _, status, _ in item_claims if status == "pending")
+        row["stat_keys"] = stats.item_keys(row, reports.get(item_id, ()), item_claims)
+
+    return rows
+
+
+def refresh_item_summaries(session: Session, item_ids):
+    """
+    Recompute the summary rows for ``item_ids`` inside the session's current
+    transaction. Items that no longer exist lose their row. Returns the new
+    rows keyed by item id.
+    """
+    ids = {i for i in item_ids if i is not None}
+    if not ids:
+        return {}
+    # The current counter contributions, read (and locked) before flushing:
+    # deleting an item cascades to its summary row.
+    with session.no_autoflush:
+        old_keys = dict(session.execute(
+            select(ItemSummary.item_id, ItemSummary.stat_keys)
+            .where(ItemSummary.item_id.in_(ids))
+            .order_by(ItemSummary.item_id)
+            .with_for_update()
+        ).all())
+    session.flush()
+    rows = compute_rows(session, ids)
+    # Naive UTC, whatever the server's zone: served as the item's Last-Modified
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    session.execute(delete(ItemSummary).where(ItemSummary.item_id.in_(ids)))
+    if rows:
+        session.execute(insert(ItemSummary), [{**row, "refreshed_on": now} for row in rows.values()])
+    stats.apply(session, old_keys, {item_id: row["stat_keys"] for item_id, row in rows.items()})
+    return rows
+
+
+async def refresh(db: AsyncSession, *item_ids):
+    """Async write paths: ``await summary.refresh(db, item_id)`` before commit."""
+    return await db.run_sync(refresh_item_summaries, item_ids)
+
+
+async def preview(db: AsyncSession, item_id: int):
+    """
+    Compute one item's row without storing it (a transient ``ItemSummary``),
+    for items not yet summarised.
+    """
+    row = (await db.run_sync(compute_rows, [item_id])).get(item_id)
+    return ItemSummary(**row) if row else None
+
+
+# --------------------------------------------------------
+# Rebuild / consistency check
+# --------------------------------------------------------
+def _id_batches(session: Session, column, batch_size: int):
+    last = 0
+    while True:
+        ids = list(session.scalars(select(column).where(column > last).order_by(column).limit(batch_size)))
+        if not ids:
+            return
+        yield ids
+        last = ids[-1]
+
+
+def rebuild(session: Session, batch_size: int = 500):
+    """Rebuild every row, committing per batch. Returns the number of rows."""
+    total = 0
+    for ids in _id_batches(session, Item.item_id, batch_size):
+        total += len(refresh_item_summaries(session, ids))
+        session.commit()
+    # Rows whose item was removed behind the application's back
+    session.execute(delete(ItemSummary).where(~ItemSummary.item_id.in_(select(Item.item_id))))
+    stats.rebuild(session)
+    session.commit()
+    return total
+
+
+def _stored_row(summary: ItemSummary):
+    return {key: getattr(summary, key) for key in COMPARED_FIELDS}
+
+
+def check(session: Session, batch_size: int = 500):
+    """
+    Compare stored rows with freshly computed ones. Returns a list of
+    ``(item_id, problem)`` where problem is "missing", "orphan" or the list
+    of fields that differ.
+    """
+    problems = []
+    for ids in _id_batches(session, Item.item_id, batch_size):
+        expected = compute_rows(session, ids)
+        stored = {s.item_id: s for s in session.scalars(select(ItemSummary).where(ItemSummary.item_id.in_(ids)))}
+        for item_id, row in expected.items():
+            if item_id not in stored:
+                problems.append((item_id, "missing"))
+                continue
+            actual = _stored_row(stored[item_id])
+            diff = [key for key in COMPARED_FIELDS if actual[key] != row[key]]
+            if diff:
+                problems.append((item_id, diff))
+        session.expunge_all()
+    for item_id in session.scalars(
+        select(ItemSummary.item_id).where(~ItemSummary.item_id.in_(select(Item.item_id)))
+    ):
+        problems.append((item_id, "orphan"))
+    return problems
@@ -0,0 +1,149 @@
+# app/uploads.py
+"""
+Streaming image upload storage.
+
+Uploads are copied to disk in fixed-size chunks with every blocking file
+operation pushed to the threadpool, so a large photo neither sits in memory
+whole nor stalls the event loop. The size cap is enforced while streaming,
+the file type is taken from the magic bytes rather than the client's
+filename, and the file only appears under its final name (via an atomic
+rename) once it has been written completely.
+"""
+import os
+import uuid
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Multipart framing adds a little on top of the file itself.
+_MULTIPART_OVERHEAD = 64 * 1024
+
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """Return the file extension for a supported image, or None."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+class _BodyTooLarge(HTTPException):
+    # An HTTPException so FastAPI's body parsing re-raises it as a 413
+    # instead of wrapping it in a generic 400.
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large")
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Cap request bodies on upload routes before the multipart parser spools
+    them to disk: reject on Content-Length up front, and abort partway
+    through the stream for chunked bodies that run over.
+    """
+
+    def __init__(self, app, path_suffix: str = "/images", max_body: int = MAX_UPLOAD_BYTES + _MULTIPART_OVERHEAD):
+        self.app = app
+        self.path_suffix = path_suffix
+        self.max_body = max_body
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].rstrip("/").endswith(self.path_suffix):
+            await self.app(scope, receive, send)
+            return
+
+        too_large = JSONResponse({"detail": "File too large"}, status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        length = dict(scope["headers"]).get(b"content-length")
+        if length and length.isdigit() and int(length) > self.max_body:
+            await too_large(scope, receive, send)
+            return
+
+        received = 0
+        started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body:
+                    raise _BodyTooLarge()
+            return message
+
+        async def tracking_send(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            if not started:
+                await too_large(scope, receive, send)
+
+
+def _too_large():
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large")
+
+
+def _unsupported():
+    return HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Only JPEG, PNG, GIF or WebP images are allowed")
+
+
+def _discard(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def save_upload(file: UploadFile) -> str:
+    """
+    Stream ``file`` into UPLOAD_DIR and return the stored file name
+    (``<uuid>.<ext>``).
+    """
+    if file.content_type and not file.content_type.startswith("image/"):
+        raise _unsupported()
+
+    first = await file.read(UPLOAD_CHUNK_SIZE)
+    ext = sniff_image_type(first)
+    if ext is None:
+        raise _unsupported()
+
+    name = f"{uuid.uuid4()}.{ext}"
+    final_path = os.path.join(UPLOAD_DIR, name)
+    tmp_path = os.path.join(UPLOAD_DIR, f".{name}.part")
+
+    out = await run_in_threadpool(open, tmp_path, "wb")
+    try:
+        total = 0
+        chunk = first
+        while chunk:
+            total += len(chunk)
+            if total > MAX_UPLOAD_BYTES:
+                raise _too_large()
+            await run_in_threadpool(out.write, chunk)
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        await run_in_threadpool(out.close)
+        await run_in_threadpool(os.replace, tmp_path, final_path)
+    except BaseException:
+        await run_in_threadpool(out.close)
+        await run_in_threadpool(_discard, tmp_path)
+        raise
+    finally:
+        await file.close()
+
+    return name
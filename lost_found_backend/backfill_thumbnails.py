@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Thumbnail backfill script.
+Renders the thumb/medium variants for item images uploaded before variant
+generation existed (or whose background processing failed). Rendering runs
+in parallel on a process pool; database updates are committed in batches.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal
+from app.images import apply_variants, make_variants, url_to_path
+from app.models import ItemImage
+from app.summary import refresh_item_summaries
+
+
+def backfill(workers: int, batch_size: int, force: bool):
+    db = SessionLocal()
+    try:
+        query = db.query(ItemImage)
+        if not force:
+            query = query.filter(ItemImage.thumbnail_path.is_(None))
+        images = {img.image_id: img for img in query.all()}
+        if not images:
+            print("✓ No images need variants")
+            return
+
+        print(f"Rendering variants for {len(images)} images with {workers} workers...")
+        done = failed = 0
+        touched = set()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(make_variants, url_to_path(img.file_path)): image_id
+                for image_id, img in images.items()
+            }
+            for future in as_completed(futures):
+                image_id = futures[future]
+                try:
+                    apply_variants(images[image_id], future.result())
+                    touched.add(images[image_id].item_id)
+                    done += 1
+                except Exception as e:
+                    failed += 1
+                    print(f"  ✗ image {image_id}: {e}")
+                if done and done % batch_size == 0:
+                    refresh_item_summaries(db, touched)
+                    touched.clear()
+                    db.commit()
+        refresh_item_summaries(db, touched)
+        db.commit()
+        print(f"✓ {done} images updated, {failed} failed")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="rendering processes")
+    parser.add_argument("--batch-size", type=int, default=100, help="rows per commit")
+    parser.add_argument("--force", action="store_true", help="re-render images that already have variants")
+    args = parser.parse_args()
+    try:
+        backfill(args.workers, args.batch_size, args.force)
+    except Exception as e:
+        print(f"\n✗ Backfill failed: {e}")
+        sys.exit(1)
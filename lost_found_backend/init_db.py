@@ -1,29 +1,89 @@
 #!/usr/bin/env python3
 """
 Database initialization script.
-Creates the database tables and seeds initial data (roles).
-Run this script after setting up your MySQL database.
+Brings the schema up to date with the Alembic migrations and seeds initial
+data (roles). Run it once after setting up your MySQL database and again on
+every deploy, before starting the API workers; it is safe to re-run.
 """
+import argparse
 import os
 import sys
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from alembic import command
+from sqlalchemy import inspect
 from dotenv import load_dotenv
 
 # Add the app directory to the path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app.database import engine, SessionLocal
-from app.models import Base, Role
+from app.database import engine, SessionLocal, SQLALCHEMY_DATABASE_URL
+from app.models import Role
+from app.schema import alembic_config, current_revisions, expected_heads
 
 load_dotenv()
 
-def init_database():
-    """Initialize database with tables and seed data."""
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("✓ Tables created successfully")
-    
+BASELINE_REVISION = "0001_baseline"
+
+# Tables and columns created by 0001_baseline. A database that has them but
+# no migration history is stamped there; every later revision checks what
+# already exists, so the rest is filled in by the upgrade.
+BASELINE_SCHEMA = {
+    "role": {"role_id", "role_name"},
+    "user_account": {"user_id", "name", "branch", "roll_number", "school", "email", "phone",
+                     "password_hash", "role_id", "created_at", "updated_at"},
+    "category": {"category_id", "category_name"},
+    "location": {"location_id", "location_name", "building", "floor"},
+    "item": {"item_id", "title", "category_id", "description", "created_by", "created_on",
+             "current_status", "last_status_change"},
+    "report": {"report_id", "item_id", "reporter_id", "report_type", "location_id",
+               "reported_date", "reported_on", "details", "status"},
+    "item_image": {"image_id", "item_id", "file_path", "uploaded_on"},
+    "claim": {"claim_id", "item_id", "claimer_id", "claim_text", "claim_status", "claimed_on",
+              "decided_by", "decided_on"},
+}
+
+
+def baseline_differences(inspector):
+    """What a database lacks compared to 0001_baseline (empty if it matches)."""
+    problems = []
+    tables = set(inspector.get_table_names())
+    for table, columns in BASELINE_SCHEMA.items():
+        if table not in tables:
+            problems.append(f"table {table} is missing")
+            continue
+        missing = columns - {c["name"] for c in inspector.get_columns(table)}
+        if missing:
+            problems.append(f"{table} lacks {', '.join(sorted(missing))}")
+    return problems
+
+
+def migrate_database():
+    """Apply pending migrations (creating every table on an empty database)."""
+    config = alembic_config(SQLALCHEMY_DATABASE_URL)
+    with engine.connect() as conn:
+        revisions = current_revisions(conn)
+        inspector = inspect(conn)
+        legacy = not revisions and inspector.has_table(Role.__tablename__)
+        problems = baseline_differences(inspector) if legacy else []
+
+    if legacy:
+        # Created by the SQL file or an older create_all(). Only stamp it if
+        # it really holds the baseline, otherwise later revisions would be
+        # applied on top of tables that are not there.
+        if problems:
+            raise RuntimeError(
+                "Existing schema without migration history does not match "
+                f"{BASELINE_REVISION}: " + "; ".join(problems)
+            )
+        print("Existing schema without migration history, stamping baseline...")
+        command.stamp(config, BASELINE_REVISION)
+
+    print("Applying migrations...")
+    command.upgrade(config, "head")
+    print(f"✓ Schema at {', '.join(sorted(expected_heads()))}")
+
+
+def seed_database():
+    """Seed initial data (roles)."""
     db = SessionLocal()
     try:
         # Check if roles already exist
@@ -31,7 +91,7 @@ def init_database():
         if existing_roles > 0:
             print(f"✓ Roles already exist ({existing_roles} roles found)")
             return
-        
+
         # Seed initial roles
         print("Seeding initial roles...")
         roles = [
@@ -39,15 +99,15 @@ def init_database():
             Role(role_name="staff"),
             Role(role_name="admin"),
         ]
-        
+
         for role in roles:
             db.add(role)
-        
+
         db.commit()
         print("✓ Roles seeded successfully:")
         for role in roles:
             print(f"  - {role.role_name}")
-            
+
     except Exception as e:
         db.rollback()
         print(f"✗ Error initializing database: {e}")
@@ -55,11 +115,21 @@ def init_database():
     finally:
         db.close()
 
+
+def init_database(seed: bool = True):
+    """Initialize database with tables and seed data."""
+    migrate_database()
+    if seed:
+        seed_database()
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--no-seed", action="store_true", help="only apply migrations")
+    args = parser.parse_args()
     try:
-        init_database()
+        init_database(seed=not args.no_seed)
         print("\n✓ Database initialization completed successfully!")
     except Exception as e:
         print(f"\n✗ Database initialization failed: {e}")
         sys.exit(1)
-
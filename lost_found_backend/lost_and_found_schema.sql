@@ -11,6 +11,8 @@ USE lost_found_portal;
 DROP TABLE IF EXISTS session_audit;
 DROP TABLE IF EXISTS history;
 DROP TABLE IF EXISTS notification;
+DROP TABLE IF EXISTS stat_counter;
+DROP TABLE IF EXISTS item_summary;
 DROP TABLE IF EXISTS claim;
 DROP TABLE IF EXISTS item_image;
 DROP TABLE IF EXISTS report;
@@ -143,6 +145,8 @@ CREATE TABLE item_image (
   image_id INT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
   item_id INT UNSIGNED NOT NULL,
   file_path VARCHAR(255) NOT NULL,
+  thumbnail_path VARCHAR(255),
+  medium_path VARCHAR(255),
   uploaded_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   FOREIGN KEY (item_id) REFERENCES item(item_id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
@@ -164,13 +168,60 @@ CREATE TABLE claim (
   FOREIGN KEY (decided_by) REFERENCES user_account(user_id)
 ) ENGINE=InnoDB;
 
+-- --------------------------------------------------
+-- Item summary (denormalised read model for item cards / detail page,
+-- maintained by the API; rebuild with rebuild_item_summary.py)
+-- --------------------------------------------------
+CREATE TABLE item_summary (
+  item_id INT UNSIGNED PRIMARY KEY,
+  title VARCHAR(150) NOT NULL,
+  description TEXT,
+  category_id SMALLINT UNSIGNED,
+  category_name VARCHAR(50),
+  created_by INT UNSIGNED,
+  creator_name VARCHAR(100),
+  created_on TIMESTAMP NULL,
+  current_status ENUM('lost','found','claimed','completed','discarded'),
+  last_status_change TIMESTAMP NULL,
+  last_report_id INT UNSIGNED,
+  last_report_type ENUM('lost','found'),
+  last_report_status ENUM('open','in_review','resolved'),
+  last_report_date DATE,
+  last_location_id SMALLINT UNSIGNED,
+  last_location_name VARCHAR(100),
+  thumbnail_url VARCHAR(255),
+  images JSON,
+  pending_claims INT UNSIGNED NOT NULL DEFAULT 0,
+  stat_keys JSON,
+  refreshed_on TIMESTAMP NULL,
+  INDEX idx_summary_created (created_on, item_id),
+  INDEX idx_summary_status_created (current_status, created_on, item_id),
+  FOREIGN KEY (item_id) REFERENCES item(item_id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- --------------------------------------------------
+-- Dashboard counters (maintained with item_summary; scope 0 is site-wide,
+-- otherwise a user id)
+-- --------------------------------------------------
+CREATE TABLE stat_counter (
+  scope INT UNSIGNED NOT NULL,
+  metric VARCHAR(30) NOT NULL,
+  bucket VARCHAR(30) NOT NULL,
+  count INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (scope, metric, bucket)
+) ENGINE=InnoDB;
+
 -- --------------------------------------------------
 -- Notifications
 -- --------------------------------------------------
 CREATE TABLE notification (
   notification_id INT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
   user_id INT UNSIGNED NOT NULL,
+  kind VARCHAR(30),
   message TEXT NOT NULL,
+  item_id INT UNSIGNED,
+  claim_id INT UNSIGNED,
+  report_id INT UNSIGNED,
   is_read BOOLEAN DEFAULT FALSE,
   created_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   FOREIGN KEY (user_id) REFERENCES user_account(user_id)
@@ -186,7 +237,7 @@ CREATE TABLE history (
   action_details TEXT,
   action_by INT UNSIGNED,
   action_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-  FOREIGN KEY (item_id) REFERENCES item(item_id),
+  FOREIGN KEY (item_id) REFERENCES item(item_id) ON DELETE SET NULL,
   FOREIGN KEY (action_by) REFERENCES user_account(user_id)
 ) ENGINE=InnoDB;
 
@@ -207,15 +258,23 @@ CREATE TABLE session_audit (
 -- --------------------------------------------------
 CREATE INDEX idx_item_status ON item (current_status);
 CREATE INDEX idx_item_created_by ON item (created_by);
-CREATE INDEX idx_report_type ON report (report_type);
-CREATE INDEX idx_report_status ON report (status);
-CREATE INDEX idx_reporter ON report (reporter_id);
-CREATE INDEX idx_claim_status ON claim (claim_status);
-CREATE INDEX idx_claim_item ON claim (item_id);
-CREATE INDEX idx_notification_user ON notification (user_id);
-CREATE INDEX idx_notification_read ON notification (is_read);
+-- Composite indexes: equality filter first, then the keyset sort columns
+CREATE INDEX idx_report_item_reported ON report (item_id, reported_on, report_id);
+CREATE INDEX idx_report_reporter_reported ON report (reporter_id, reported_on);
+CREATE INDEX idx_report_type_reported ON report (report_type, reported_on, report_id);
+CREATE INDEX idx_report_status_reported ON report (status, reported_on, report_id);
+CREATE INDEX idx_report_reported ON report (reported_on, report_id);
+CREATE INDEX idx_claim_status_claimed ON claim (claim_status, claimed_on, claim_id);
+CREATE INDEX idx_claim_claimed ON claim (claimed_on, claim_id);
+CREATE INDEX idx_claim_item_status ON claim (item_id, claim_status);
+CREATE INDEX idx_user_created ON user_account (created_at, user_id);
+CREATE INDEX idx_notification_user_read_created ON notification (user_id, is_read, created_on, notification_id);
 CREATE INDEX idx_history_item ON history (item_id);
 
+-- Full-text indexes backing GET /items/search
+CREATE FULLTEXT INDEX ft_item_title_description ON item (title, description);
+CREATE FULLTEXT INDEX ft_report_details ON report (details);
+
 -- --------------------------------------------------
 -- Views
 -- --------------------------------------------------
@@ -0,0 +1,136 @@
+"""Baseline schema (the core tables as they were before migrations)
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18 10:00:00
+
+Databases created from an older lost_and_found_schema.sql or by an older
+create_all() already have these tables: ``alembic stamp 0001_baseline``
+them, then ``alembic upgrade head``. Everything added since (search
+indexes, image variants, item_summary, ...) comes from later revisions,
+which check what already exists before creating anything.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_baseline'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ITEM_STATUS = ("lost", "found", "claimed", "completed", "discarded")
+REPORT_TYPE = ("lost", "found")
+REPORT_STATUS = ("open", "in_review", "resolved")
+
+
+def upgrade() -> None:
+    op.create_table(
+        'role',
+        sa.Column('role_id', sa.SmallInteger(), autoincrement=True, nullable=False),
+        sa.Column('role_name', sa.String(length=30), nullable=False),
+        sa.PrimaryKeyConstraint('role_id'),
+        sa.UniqueConstraint('role_name'),
+    )
+    op.create_table(
+        'category',
+        sa.Column('category_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('category_name', sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint('category_id'),
+        sa.UniqueConstraint('category_name'),
+    )
+    op.create_table(
+        'location',
+        sa.Column('location_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('location_name', sa.String(length=100), nullable=False),
+        sa.Column('building', sa.String(length=100), nullable=True),
+        sa.Column('floor', sa.String(length=20), nullable=True),
+        sa.PrimaryKeyConstraint('location_id'),
+        sa.UniqueConstraint('location_name'),
+    )
+    op.create_table(
+        'user_account',
+        sa.Column('user_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('branch', sa.String(length=50), nullable=True),
+        sa.Column('roll_number', sa.String(length=30), nullable=False),
+        sa.Column('school', sa.String(length=100), nullable=True),
+        sa.Column('email', sa.String(length=150), nullable=True),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('role_id', sa.SmallInteger(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(['role_id'], ['role.role_id']),
+        sa.PrimaryKeyConstraint('user_id'),
+        sa.UniqueConstraint('roll_number'),
+    )
+    op.create_table(
+        'item',
+        sa.Column('item_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('title', sa.String(length=150), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_on', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+        sa.Column('current_status', sa.Enum(*ITEM_STATUS, name='item_status'), nullable=True),
+        sa.Column('last_status_change', sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(['category_id'], ['category.category_id']),
+        sa.ForeignKeyConstraint(['created_by'], ['user_account.user_id']),
+        sa.PrimaryKeyConstraint('item_id'),
+        sa.UniqueConstraint('title', 'created_by', name='uk_title_createdby'),
+    )
+    op.create_table(
+        'report',
+        sa.Column('report_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('reporter_id', sa.Integer(), nullable=False),
+        sa.Column('report_type', sa.Enum(*REPORT_TYPE, name='report_type'), nullable=True),
+        sa.Column('location_id', sa.Integer(), nullable=True),
+        sa.Column('reported_date', sa.Date(), nullable=True),
+        sa.Column('reported_on', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+        sa.Column('details', sa.Text(), nullable=True),
+        sa.Column('status', sa.Enum(*REPORT_STATUS, name='report_status'), nullable=True),
+        sa.ForeignKeyConstraint(['item_id'], ['item.item_id']),
+        sa.ForeignKeyConstraint(['location_id'], ['location.location_id']),
+        sa.ForeignKeyConstraint(['reporter_id'], ['user_account.user_id']),
+        sa.PrimaryKeyConstraint('report_id'),
+    )
+    op.create_table(
+        'item_image',
+        sa.Column('image_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('file_path', sa.String(length=255), nullable=False),
+        sa.Column('uploaded_on', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['item_id'], ['item.item_id']),
+        sa.PrimaryKeyConstraint('image_id'),
+    )
+    op.create_table(
+        'claim',
+        sa.Column('claim_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('claimer_id', sa.Integer(), nullable=False),
+        sa.Column('claim_text', sa.Text(), nullable=True),
+        sa.Column('claim_status', sa.Enum('pending', 'approved', 'rejected', name='claim_status'), nullable=True),
+        sa.Column('claimed_on', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+        sa.Column('decided_by', sa.Integer(), nullable=True),
+        sa.Column('decided_on', sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(['claimer_id'], ['user_account.user_id']),
+        sa.ForeignKeyConstraint(['decided_by'], ['user_account.user_id']),
+        sa.ForeignKeyConstraint(['item_id'], ['item.item_id']),
+        sa.PrimaryKeyConstraint('claim_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('claim')
+    op.drop_table('item_image')
+    op.drop_table('report')
+    op.drop_table('item')
+    op.drop_table('user_account')
+    op.drop_table('location')
+    op.drop_table('category')
+    op.drop_table('role')
@@ -0,0 +1,77 @@
+"""Composite indexes matching the list, dashboard and summary queries
+
+Revision ID: 0002_composite_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18 10:30:00
+
+Each index leads with the equality filter and ends with the keyset sort
+columns, so a filtered page is one index range scan in order instead of a
+filesort over every matching row:
+
+- claims list / admin pending claims: claim_status + claimed_on, claim_id
+- claim count per item (summary): item_id + claim_status
+- reports list: [report_type | status] + reported_on, report_id
+- "my reports": reporter_id + reported_on
+- latest report per item (summary): item_id + reported_on, report_id
+- users list: created_at, user_id
+
+The single-column indexes from lost_and_found_schema.sql that these
+supersede are dropped when present. Every dropped column still leads a
+composite index, so the foreign keys keep an index behind them.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_composite_indexes'
+down_revision: Union[str, None] = '0001_baseline'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('idx_claim_status_claimed', 'claim', ['claim_status', 'claimed_on', 'claim_id']),
+    ('idx_claim_claimed', 'claim', ['claimed_on', 'claim_id']),
+    ('idx_claim_item_status', 'claim', ['item_id', 'claim_status']),
+    ('idx_report_item_reported', 'report', ['item_id', 'reported_on', 'report_id']),
+    ('idx_report_reporter_reported', 'report', ['reporter_id', 'reported_on']),
+    ('idx_report_type_reported', 'report', ['report_type', 'reported_on', 'report_id']),
+    ('idx_report_status_reported', 'report', ['status', 'reported_on', 'report_id']),
+    ('idx_report_reported', 'report', ['reported_on', 'report_id']),
+    ('idx_user_created', 'user_account', ['created_at', 'user_id']),
+]
+
+# Hand-written single-column indexes made redundant by the above
+SUPERSEDED = [
+    ('idx_claim_status', 'claim', ['claim_status']),
+    ('idx_claim_item', 'claim', ['item_id']),
+    ('idx_report_type', 'report', ['report_type']),
+    ('idx_report_status', 'report', ['status']),
+    ('idx_reporter', 'report', ['reporter_id']),
+]
+
+
+def _existing(table):
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    # Create before dropping: MySQL refuses to drop the only index behind a
+    # foreign key.
+    for name, table, columns in INDEXES:
+        if name not in _existing(table):
+            op.create_index(name, table, columns)
+    for name, table, _ in SUPERSEDED:
+        if name in _existing(table):
+            op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    for name, table, columns in SUPERSEDED:
+        if name not in _existing(table):
+            op.create_index(name, table, columns)
+    for name, table, _ in INDEXES:
+        if name in _existing(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,73 @@
+"""Notification inbox
+
+Revision ID: 0003_notifications
+Revises: 0002_composite_indexes
+Create Date: 2026-10-18 12:00:00
+
+Creates the notification table, or brings the one from
+lost_and_found_schema.sql up to date: kind / item_id / claim_id /
+report_id columns, and an (user_id, is_read, created_on) index for the
+unread inbox in place of the separate user_id and is_read indexes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_notifications'
+down_revision: Union[str, None] = '0002_composite_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEW_COLUMNS = [
+    sa.Column('kind', sa.String(length=30), nullable=True),
+    sa.Column('item_id', sa.Integer(), nullable=True),
+    sa.Column('claim_id', sa.Integer(), nullable=True),
+    sa.Column('report_id', sa.Integer(), nullable=True),
+]
+INBOX_INDEX = ('idx_notification_user_read_created', ['user_id', 'is_read', 'created_on', 'notification_id'])
+SUPERSEDED = [
+    ('idx_notification_user', ['user_id']),
+    ('idx_notification_read', ['is_read']),
+]
+
+
+def _existing_indexes():
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes('notification')}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('notification'):
+        op.create_table(
+            'notification',
+            sa.Column('notification_id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('message', sa.Text(), nullable=False),
+            sa.Column('is_read', sa.Boolean(), nullable=True),
+            sa.Column('created_on', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['user_account.user_id']),
+            sa.PrimaryKeyConstraint('notification_id'),
+        )
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('notification')}
+    for column in NEW_COLUMNS:
+        if column.name not in columns:
+            op.add_column('notification', column.copy())
+
+    name, index_columns = INBOX_INDEX
+    if name not in _existing_indexes():
+        op.create_index(name, 'notification', index_columns)
+    for old, _ in SUPERSEDED:
+        if old in _existing_indexes():
+            op.drop_index(old, table_name='notification')
+
+
+def downgrade() -> None:
+    for old, index_columns in SUPERSEDED:
+        if old not in _existing_indexes():
+            op.create_index(old, 'notification', index_columns)
+    op.drop_index(INBOX_INDEX[0], table_name='notification')
+    for column in reversed(NEW_COLUMNS):
+        op.drop_column('notification', column.name)
@@ -0,0 +1,55 @@
+"""History and session audit tables
+
+Revision ID: 0004_audit_tables
+Revises: 0003_notifications
+Create Date: 2026-10-18 14:00:00
+
+Both tables already exist in databases created from
+lost_and_found_schema.sql; this creates them where they don't.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_audit_tables'
+down_revision: Union[str, None] = '0003_notifications'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('history'):
+        op.create_table(
+            'history',
+            sa.Column('history_id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('item_id', sa.Integer(), nullable=True),
+            sa.Column('action', sa.String(length=80), nullable=False),
+            sa.Column('action_details', sa.Text(), nullable=True),
+            sa.Column('action_by', sa.Integer(), nullable=True),
+            sa.Column('action_on', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+            sa.ForeignKeyConstraint(['action_by'], ['user_account.user_id']),
+            sa.ForeignKeyConstraint(['item_id'], ['item.item_id'], ondelete='SET NULL'),
+            sa.PrimaryKeyConstraint('history_id'),
+        )
+        op.create_index('idx_history_item', 'history', ['item_id'])
+    if not inspector.has_table('session_audit'):
+        op.create_table(
+            'session_audit',
+            sa.Column('session_id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('login_time', sa.TIMESTAMP(), nullable=True),
+            sa.Column('logout_time', sa.TIMESTAMP(), nullable=True),
+            sa.Column('ip_address', sa.String(length=45), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['user_account.user_id']),
+            sa.PrimaryKeyConstraint('session_id'),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('session_audit')
+    op.drop_index('idx_history_item', table_name='history')
+    op.drop_table('history')
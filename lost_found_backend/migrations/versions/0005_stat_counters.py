@@ -0,0 +1,45 @@
+"""Dashboard counters
+
+Revision ID: 0005_stat_counters
+Revises: 0004_audit_tables
+Create Date: 2026-10-18 16:00:00
+
+Adds item_summary.stat_keys and the stat_counter table behind the
+/dashboard/stats endpoints. Existing summary rows have no keys yet; run
+rebuild_item_summary.py once after upgrading to fill both. A database
+without item_summary yet gets the column when 0008_item_summary creates
+the table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_stat_counters'
+down_revision: Union[str, None] = '0004_audit_tables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table('item_summary') and \
+            'stat_keys' not in {c['name'] for c in inspector.get_columns('item_summary')}:
+        op.add_column('item_summary', sa.Column('stat_keys', sa.JSON(), nullable=True))
+    if not inspector.has_table('stat_counter'):
+        op.create_table(
+            'stat_counter',
+            sa.Column('scope', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('metric', sa.String(length=30), nullable=False),
+            sa.Column('bucket', sa.String(length=30), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('scope', 'metric', 'bucket'),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('stat_counter')
+    if sa.inspect(op.get_bind()).has_table('item_summary'):
+        op.drop_column('item_summary', 'stat_keys')
@@ -0,0 +1,43 @@
+"""FULLTEXT indexes behind GET /items/search
+
+Revision ID: 0006_fulltext_search
+Revises: 0005_stat_counters
+Create Date: 2026-10-18 18:00:00
+
+MATCH ... AGAINST needs a FULLTEXT index over exactly the searched
+columns: item (title, description) and report (details). Databases created
+from lost_and_found_schema.sql, or by the first version of 0001_baseline,
+already have them.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_fulltext_search'
+down_revision: Union[str, None] = '0005_stat_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ft_item_title_description', 'item', ['title', 'description']),
+    ('ft_report_details', 'report', ['details']),
+]
+
+
+def _existing(table):
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        if name not in _existing(table):
+            op.create_index(name, table, columns, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    for name, table, _ in INDEXES:
+        if name in _existing(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,37 @@
+"""Thumbnail and medium variant paths on item_image
+
+Revision ID: 0007_image_variants
+Revises: 0006_fulltext_search
+Create Date: 2026-10-18 18:10:00
+
+Existing images get NULL paths and are served at full size until
+``python backfill_thumbnails.py`` generates their variants.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_image_variants'
+down_revision: Union[str, None] = '0006_fulltext_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEW_COLUMNS = [
+    sa.Column('thumbnail_path', sa.String(length=255), nullable=True),
+    sa.Column('medium_path', sa.String(length=255), nullable=True),
+]
+
+
+def upgrade() -> None:
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('item_image')}
+    for column in NEW_COLUMNS:
+        if column.name not in columns:
+            op.add_column('item_image', column.copy())
+
+
+def downgrade() -> None:
+    for column in reversed(NEW_COLUMNS):
+        op.drop_column('item_image', column.name)
@@ -0,0 +1,64 @@
+"""item_summary projection
+
+Revision ID: 0008_item_summary
+Revises: 0007_image_variants
+Create Date: 2026-10-18 18:20:00
+
+Creates the item_summary table where it is missing (with the stat_keys
+column that 0005_stat_counters adds to an existing one). The new table
+starts empty: run ``python rebuild_item_summary.py`` once afterwards.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_item_summary'
+down_revision: Union[str, None] = '0007_image_variants'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ITEM_STATUS = ("lost", "found", "claimed", "completed", "discarded")
+REPORT_TYPE = ("lost", "found")
+REPORT_STATUS = ("open", "in_review", "resolved")
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('item_summary'):
+        return
+    op.create_table(
+        'item_summary',
+        sa.Column('item_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('title', sa.String(length=150), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('category_name', sa.String(length=50), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('creator_name', sa.String(length=100), nullable=True),
+        sa.Column('created_on', sa.TIMESTAMP(), nullable=True),
+        sa.Column('current_status', sa.Enum(*ITEM_STATUS, name='item_status'), nullable=True),
+        sa.Column('last_status_change', sa.TIMESTAMP(), nullable=True),
+        sa.Column('last_report_id', sa.Integer(), nullable=True),
+        sa.Column('last_report_type', sa.Enum(*REPORT_TYPE, name='report_type'), nullable=True),
+        sa.Column('last_report_status', sa.Enum(*REPORT_STATUS, name='report_status'), nullable=True),
+        sa.Column('last_report_date', sa.Date(), nullable=True),
+        sa.Column('last_location_id', sa.Integer(), nullable=True),
+        sa.Column('last_location_name', sa.String(length=100), nullable=True),
+        sa.Column('thumbnail_url', sa.String(length=255), nullable=True),
+        sa.Column('images', sa.JSON(), nullable=True),
+        sa.Column('pending_claims', sa.Integer(), nullable=False),
+        sa.Column('stat_keys', sa.JSON(), nullable=True),
+        sa.Column('refreshed_on', sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(['item_id'], ['item.item_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('item_id'),
+    )
+    op.create_index('idx_summary_created', 'item_summary', ['created_on', 'item_id'])
+    op.create_index('idx_summary_status_created', 'item_summary', ['current_status', 'created_on', 'item_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_summary_status_created', table_name='item_summary')
+    op.drop_index('idx_summary_created', table_name='item_summary')
+    op.drop_table('item_summary')
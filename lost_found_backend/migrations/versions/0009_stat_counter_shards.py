@@ -0,0 +1,65 @@
+"""Shard the site-wide dashboard counters
+
+Revision ID: 0009_stat_counter_shards
+Revises: 0008_item_summary
+Create Date: 2026-10-18 19:00:00
+
+Adds ``shard`` to the stat_counter primary key so concurrent writes spread
+the site-wide counters over several rows (see app/stats.py). The table is
+copied rather than altered in place, which also works on SQLite. Existing
+counts move to shard 0 unchanged; ``python rebuild_item_summary.py``
+spreads them out, but the totals are correct either way.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_stat_counter_shards'
+down_revision: Union[str, None] = '0008_item_summary'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create(name: str, sharded: bool):
+    columns = [
+        sa.Column('scope', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('metric', sa.String(length=30), nullable=False),
+        sa.Column('bucket', sa.String(length=30), nullable=False),
+    ]
+    key = ['scope', 'metric', 'bucket']
+    if sharded:
+        columns.append(sa.Column('shard', sa.SmallInteger(), autoincrement=False, nullable=False))
+        key.append('shard')
+    op.create_table(
+        name,
+        *columns,
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint(*key),
+    )
+
+
+def upgrade() -> None:
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('stat_counter')}
+    if 'shard' in columns:
+        return
+    _create('stat_counter_new', sharded=True)
+    op.execute(
+        "INSERT INTO stat_counter_new (scope, metric, bucket, shard, count) "
+        "SELECT scope, metric, bucket, 0, count FROM stat_counter WHERE count <> 0"
+    )
+    op.drop_table('stat_counter')
+    op.rename_table('stat_counter_new', 'stat_counter')
+
+
+def downgrade() -> None:
+    _create('stat_counter_old', sharded=False)
+    op.execute(
+        "INSERT INTO stat_counter_old (scope, metric, bucket, count) "
+        "SELECT scope, metric, bucket, SUM(count) FROM stat_counter "
+        "GROUP BY scope, metric, bucket HAVING SUM(count) <> 0"
+    )
+    op.drop_table('stat_counter')
+    op.rename_table('stat_counter_old', 'stat_counter')
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Item summary maintenance script.
+Rebuilds the item_summary projection from the item, report, image and claim
+tables, and the dashboard counters (stat_counter) derived from it (run once
+after creating the tables, or after editing those tables outside the API),
+or with --check reports rows and counters that have drifted from their
+source data without changing anything.
+"""
+import argparse
+import os
+import sys
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal
+from app import stats
+from app.summary import check, rebuild, refresh_item_summaries
+
+
+def run(batch_size: int, check_only: bool, fix: bool):
+    db = SessionLocal()
+    try:
+        if not check_only:
+            print("Rebuilding item_summary...")
+            total = rebuild(db, batch_size)
+            print(f"✓ {total} rows rebuilt")
+            return 0
+
+        print("Checking item_summary against source tables...")
+        problems = check(db, batch_size)
+        if not problems:
+            print("✓ item_summary is consistent")
+        else:
+            for item_id, problem in problems:
+                detail = problem if isinstance(problem, str) else "differs in " + ", ".join(problem)
+                print(f"  ✗ item {item_id}: {detail}")
+            print(f"✗ {len(problems)} inconsistent rows")
+            if fix:
+                refresh_item_summaries(db, [item_id for item_id, _ in problems])
+                db.commit()
+                print(f"✓ {len(problems)} rows repaired")
+
+        # After any repair above, which moves the counters with the rows
+        print("Checking stat_counter against item_summary...")
+        counters = stats.check(db)
+        if not counters:
+            print("✓ stat_counter is consistent")
+        else:
+            for key, stored, expected in counters:
+                print(f"  ✗ counter {key}: {stored}, expected {expected}")
+            print(f"✗ {len(counters)} inconsistent counters")
+            if fix:
+                total = stats.rebuild(db)
+                db.commit()
+                print(f"✓ stat_counter rebuilt ({total} rows)")
+
+        if (problems or counters) and not fix:
+            return 2
+        return 0
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=500, help="items per batch")
+    parser.add_argument("--check", action="store_true", help="only report inconsistent rows and counters (exit status 2 if any)")
+    parser.add_argument("--fix", action="store_true", help="with --check, recompute the inconsistent rows and counters")
+    args = parser.parse_args()
+    try:
+        sys.exit(run(args.batch_size, args.check, args.fix))
+    except Exception as e:
+        print(f"\n✗ Item summary maintenance failed: {e}")
+        sys.exit(1)
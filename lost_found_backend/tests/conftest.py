@@ -0,0 +1,89 @@
+# tests/conftest.py
+"""
+Shared fixtures: the app served by a TestClient on a throwaway database.
+
+The database is a temporary SQLite file (aiosqlite for the async engine)
+unless TEST_DATABASE_URL names another one, e.g. an empty MySQL schema for
+the tests that need MySQL. It is migrated with init_db.py like a real
+deployment. Settings that would slow the tests down or make them flaky
+(the hashing process pool, rate limits) are turned off before the app is
+imported.
+"""
+import itertools
+import os
+import re
+import sys
+import tempfile
+
+_tmpdir = tempfile.mkdtemp(prefix="lost_found_tests_")
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{_tmpdir}/test.db"
+os.environ["UPLOAD_DIR"] = os.path.join(_tmpdir, "uploads")
+os.environ.setdefault("HASH_WORKERS", "0")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("SERVER_TIMING", "true")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import init_db  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Category, Location, Role, UserAccount  # noqa: E402
+
+ROLES = {1: "student", 2: "staff", 3: "admin"}
+_SERVER_TIMING_QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def _seed():
+    with SessionLocal() as db:
+        if db.query(Role).count():
+            return
+        # Explicit ids: the SmallInteger key does not autoincrement on SQLite
+        db.add_all(Role(role_id=role_id, role_name=name) for role_id, name in ROLES.items())
+        db.add_all([Category(category_name="Electronics"), Category(category_name="Bags")])
+        db.add_all([Location(location_name="Library"), Location(location_name="Canteen")])
+        db.commit()
+
+
+@pytest.fixture(scope="session")
+def client():
+    init_db.migrate_database()
+    _seed()
+    with TestClient(app) as test_client:
+        yield test_client
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def signup(client):
+    """``signup(admin=False)`` registers a new user and returns auth headers."""
+    numbers = itertools.count(1)
+
+    def make_user(admin: bool = False):
+        roll = f"T{next(numbers):05d}"
+        response = client.post("/auth/register", json={"name": roll, "roll_number": roll, "password": "secret"})
+        assert response.status_code == 200, response.text
+        if admin:
+            with SessionLocal() as db:
+                user = db.query(UserAccount).filter_by(roll_number=roll).one()
+                user.role_id = next(i for i, name in ROLES.items() if name == "admin")
+                db.commit()
+        response = client.post("/auth/login", data={"username": roll, "password": "secret"})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return make_user
+
+
+@pytest.fixture(scope="session")
+def admin(signup):
+    return signup(admin=True)
+
+
+def query_count(response) -> int:
+    """SQL statements the request ran, from its Server-Timing header."""
+    match = _SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+    assert match, "response has no Server-Timing header"
+    return int(match.group(1))
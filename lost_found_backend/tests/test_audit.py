@@ -0,0 +1,97 @@
+# tests/test_audit.py
+"""
+Audit events are buffered in memory and written in multi-row batches, off
+the request path; a row the database rejects never blocks the rest.
+"""
+import time
+import uuid
+
+from sqlalchemy import event, func, select
+
+from app import audit as audit_module
+from app.audit import audit
+from app.database import SessionLocal, async_engine
+from app.models import History, SessionAudit
+
+
+def _history_rows(tag: str):
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(History).where(History.action_details == tag))
+
+
+def _wait_for(predicate, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+def test_recording_an_event_costs_well_under_a_millisecond(client, record_property):
+    events = 2000
+    tag = uuid.uuid4().hex
+
+    async def record():
+        started = time.perf_counter()
+        for _ in range(events):
+            await audit.history(None, "benchmark", tag)
+        return (time.perf_counter() - started) / events
+
+    per_event = client.portal.call(record)
+    record_property("audit_record_us", round(per_event * 1e6, 2))
+    assert per_event < 0.001
+    client.portal.call(audit.flush)
+    _wait_for(lambda: _history_rows(tag) == events)
+
+
+def test_events_are_written_in_multi_row_batches(client):
+    events = 2 * audit_module.AUDIT_BATCH_SIZE + 50
+    tag = uuid.uuid4().hex
+    inserts = []
+
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO history"):
+            inserts.append(statement)
+
+    async def record_and_flush():
+        for _ in range(events):
+            await audit.history(None, "batched", tag)
+        await audit.flush()
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_inserts)
+    try:
+        client.portal.call(record_and_flush)
+        # The background flusher may have taken some of the batches
+        _wait_for(lambda: _history_rows(tag) == events)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count_inserts)
+    assert len(inserts) == 3
+
+
+def test_rejected_row_is_dead_lettered_without_blocking_others(client):
+    tag = uuid.uuid4().hex
+    before = audit.metrics()["dead_lettered"]
+
+    async def record_and_flush():
+        await audit.history(None, "good", tag)
+        # action is NOT NULL: the database refuses this row every time
+        await audit.record("history", {"item_id": None, "action": None, "action_details": tag,
+                                       "action_by": None, "action_on": None})
+        await audit.history(None, "good", tag)
+        for _ in range(audit_module.AUDIT_MAX_ATTEMPTS):
+            await audit.flush()
+
+    client.portal.call(record_and_flush)
+    _wait_for(lambda: _history_rows(tag) == 2)
+    assert audit.metrics()["dead_lettered"] == before + 1
+    assert not any(row.get("action_details") == tag for _, row, _ in audit._pending)
+
+
+def test_login_is_audited(client, signup):
+    user_id = client.get("/auth/me", headers=signup()).json()["user_id"]
+
+    def logins():
+        with SessionLocal() as db:
+            return db.scalar(select(func.count()).select_from(SessionAudit).where(SessionAudit.user_id == user_id))
+
+    client.portal.call(audit.flush)
+    _wait_for(lambda: logins() == 1)
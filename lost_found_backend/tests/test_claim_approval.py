@@ -0,0 +1,53 @@
+# tests/test_claim_approval.py
+"""
+Competing approvals for one item: exactly one wins, the others get 409 and
+their claims end up rejected.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+CLAIMANTS = 8
+
+
+def _item_with_claims(client, signup, n: int):
+    owner = signup()
+    item_id = client.post("/items/", json={"title": "black wallet", "current_status": "found"}, headers=owner).json()["item_id"]
+    claim_ids = []
+    for _ in range(n):
+        response = client.post("/claims/", json={"item_id": item_id}, headers=signup())
+        assert response.status_code == 201, response.text
+        claim_ids.append(response.json()["claim_id"])
+    return item_id, claim_ids
+
+
+def test_concurrent_approvals_of_competing_claims(client, signup, admin, record_property):
+    item_id, claim_ids = _item_with_claims(client, signup, CLAIMANTS)
+    # Each approval comes from a different admin, as in the real race
+    admins = [admin] + [signup(admin=True) for _ in claim_ids[1:]]
+
+    def approve(args):
+        claim_id, headers = args
+        started = time.perf_counter()
+        response = client.post(f"/claims/{claim_id}/approve", headers=headers)
+        return response.status_code, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=CLAIMANTS) as pool:
+        results = list(pool.map(approve, zip(claim_ids, admins)))
+
+    codes = sorted(code for code, _ in results)
+    assert codes == [200] + [409] * (CLAIMANTS - 1)
+    record_property("max_approval_latency_ms", round(max(t for _, t in results) * 1000, 1))
+
+    statuses = [client.get(f"/claims/{cid}", headers=admin).json()["claim_status"] for cid in claim_ids]
+    assert statuses.count("approved") == 1
+    assert statuses.count("rejected") == CLAIMANTS - 1
+    assert client.get(f"/items/{item_id}").json()["current_status"] == "claimed"
+
+
+def test_approving_a_decided_claim_conflicts(client, signup, admin):
+    _, (first, second) = _item_with_claims(client, signup, 2)
+    assert client.post(f"/claims/{first}/approve", headers=admin).status_code == 200
+    assert client.post(f"/claims/{first}/approve", headers=admin).status_code == 409
+    # Rejected automatically when the first claim won
+    assert client.post(f"/claims/{second}/approve", headers=admin).status_code == 409
+    assert client.post(f"/claims/{second}/reject", headers=admin).status_code == 409
@@ -0,0 +1,94 @@
+# tests/test_concurrency.py
+"""
+The async database stack serves many concurrent clients from one event
+loop: requests wait on the connection pool, not on threadpool slots.
+Measured side by side with the same page served the old way, from a
+``def`` route on a sync Session in the default threadpool. Both rates are
+recorded, not compared: on SQLite aiosqlite goes through a thread per
+connection, so the gain over the blocking driver shows on MySQL.
+"""
+import time
+
+import anyio
+import httpx
+from fastapi import Depends, FastAPI
+
+from app import admission
+from app.database import SessionLocal
+from app.main import app
+from app.models import ItemSummary
+from app.queries import item_columns, summary_to_dict
+from app.responses import json_response
+
+CLIENTS = 500
+PAGE = "/items/?limit=20"
+
+
+def _sync_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Baseline: the items page as a blocking route, the way every route was
+# served before the async engine, behind the same middleware
+sync_app = FastAPI()
+sync_app.user_middleware = list(app.user_middleware)
+
+
+@sync_app.get("/items/")
+def read_items_sync(limit: int = 20, db=Depends(_sync_db)):
+    rows = db.execute(
+        item_columns().order_by(ItemSummary.created_on.desc(), ItemSummary.item_id.desc()).limit(limit)
+    ).all()
+    return json_response([summary_to_dict(row) for row in rows])
+
+
+async def _run_clients(target, hold_threadpool: bool):
+    """GET ``PAGE`` from CLIENTS concurrent clients; returns (responses, seconds)."""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    tokens = limiter.total_tokens
+    if hold_threadpool:
+        # Hold the threadpool's only token for the whole run: a handler
+        # that needed a worker thread would wait until the timeout
+        limiter.total_tokens = 1
+        await limiter.acquire()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=target), base_url="http://testserver") as http:
+            started = time.perf_counter()
+            responses = []
+
+            async def fetch():
+                responses.append(await http.get(PAGE))
+
+            with anyio.fail_after(60):
+                async with anyio.create_task_group() as tasks:
+                    for _ in range(CLIENTS):
+                        tasks.start_soon(fetch)
+            return responses, time.perf_counter() - started
+    finally:
+        if hold_threadpool:
+            limiter.release()
+        limiter.total_tokens = tokens
+
+
+def test_many_concurrent_clients(client, signup, monkeypatch, record_property):
+    owner = signup()
+    for i in range(5):
+        client.post("/items/", json={"title": f"keys {i}"}, headers=owner)
+    # Let every client in; shedding under overload is admission.py's job
+    # and not what is measured here
+    monkeypatch.setattr(admission.gate, "max_queue", CLIENTS)
+
+    # On the app's own event loop, where its engine and pool live
+    responses, elapsed = client.portal.call(_run_clients, app, True)
+    sync_responses, sync_elapsed = client.portal.call(_run_clients, sync_app, False)
+
+    assert [r.status_code for r in responses] == [200] * CLIENTS
+    assert [r.status_code for r in sync_responses] == [200] * CLIENTS
+    # Both serve the same page
+    assert sync_responses[0].json() == responses[0].json()
+    record_property("requests_per_second", round(CLIENTS / elapsed))
+    record_property("sync_requests_per_second", round(CLIENTS / sync_elapsed))
@@ -0,0 +1,131 @@
+# tests/test_hashing.py
+"""
+Password hashing runs off the event loop in a bounded process pool: a burst
+of logins must not hold up unrelated requests, and a burst larger than the
+pool and its queue is shed with 503 instead of piling up.
+"""
+import threading
+import time
+
+import anyio
+import httpx
+import pytest
+
+from app import hashing
+from app.main import app
+
+BURST = 12
+SAMPLES = 40
+ROLL = "H00001"
+
+
+def _p99(latencies):
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+def _item_latencies(client, n: int):
+    latencies = []
+    for _ in range(n):
+        started = time.perf_counter()
+        assert client.get("/items/?limit=20").status_code == 200
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def _login(client):
+    return client.post("/auth/login", data={"username": ROLL, "password": "secret"})
+
+
+@pytest.fixture(scope="module")
+def account(client):
+    client.post("/auth/register", json={"name": ROLL, "roll_number": ROLL, "password": "secret"})
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    """
+    A real process pool for one test (conftest turns it off for the rest of
+    the suite). Returns ``configure(workers, concurrency, max_pending)``.
+    """
+    def configure(workers: int, concurrency: int, max_pending: int):
+        hashing.shutdown_hash_pool()
+        monkeypatch.setattr(hashing, "HASH_WORKERS", workers)
+        monkeypatch.setattr(hashing, "HASH_CONCURRENCY", concurrency)
+        monkeypatch.setattr(hashing, "HASH_MAX_PENDING", max_pending)
+        # Rebuilt with the new concurrency on first use
+        monkeypatch.setattr(hashing, "_semaphore", None)
+
+    yield configure
+    hashing.shutdown_hash_pool()
+
+
+def test_login_burst_does_not_stall_other_requests(client, account, process_pool, record_property):
+    process_pool(workers=2, concurrency=2, max_pending=BURST)
+    stored = hashing.get_password_hash("secret")
+    started = time.perf_counter()
+    hashing.verify_password("secret", stored)
+    one_hash = time.perf_counter() - started
+
+    # The first login starts the spawned workers
+    started = time.perf_counter()
+    assert _login(client).status_code == 200
+    record_property("pool_start_ms", round((time.perf_counter() - started) * 1000, 1))
+
+    baseline = _item_latencies(client, SAMPLES)
+    before = hashing.hash_metrics()["completed"]
+
+    statuses = []
+
+    def login():
+        statuses.append(_login(client).status_code)
+
+    logins = [threading.Thread(target=login) for _ in range(BURST)]
+    for thread in logins:
+        thread.start()
+    during = _item_latencies(client, SAMPLES)
+    for thread in logins:
+        thread.join()
+
+    assert statuses == [200] * BURST
+    record_property("items_p99_ms_baseline", round(_p99(baseline) * 1000, 1))
+    record_property("items_p99_ms_during_logins", round(_p99(during) * 1000, 1))
+    record_property("hash_ms", round(one_hash * 1000, 1))
+    # Hashing on the event loop would hold every GET behind whole hashes
+    assert _p99(during) < one_hash, (
+        f"p99 {_p99(during) * 1000:.1f}ms during the burst vs {one_hash * 1000:.1f}ms per hash"
+    )
+    metrics = hashing.hash_metrics()
+    assert metrics["workers"] == 2
+    assert metrics["completed"] - before >= BURST
+    assert hashing._executor is not None
+
+
+def test_burst_beyond_the_queue_is_shed(client, account, process_pool):
+    concurrency, max_pending = 1, 2
+    process_pool(workers=1, concurrency=concurrency, max_pending=max_pending)
+    assert _login(client).status_code == 200  # start the worker
+    before = hashing.hash_metrics()["rejected"]
+
+    async def burst():
+        responses = []
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as http:
+            async def login():
+                responses.append(await http.post("/auth/login", data={"username": ROLL, "password": "secret"}))
+
+            with anyio.fail_after(60):
+                async with anyio.create_task_group() as tasks:
+                    for _ in range(BURST):
+                        tasks.start_soon(login)
+        return responses
+
+    # Concurrently on the app's event loop, where the hashing semaphore lives
+    responses = client.portal.call(burst)
+
+    statuses = [r.status_code for r in responses]
+    shed = [r for r in responses if r.status_code == 503]
+    assert set(statuses) <= {200, 503}, statuses
+    assert statuses.count(200) >= concurrency + max_pending
+    assert shed, statuses
+    assert all(r.headers.get("retry-after") == "1" for r in shed)
+    assert hashing.hash_metrics()["rejected"] - before == len(shed)
@@ -0,0 +1,144 @@
+# tests/test_index_usage.py
+"""
+EXPLAIN every statement the list and dashboard endpoints run and check that
+each table is read through an index, and that results come out of the
+index in order rather than being sorted afterwards.
+
+On SQLite (the default test database) the plans come from EXPLAIN QUERY
+PLAN: no bare ``SCAN <table>`` and no ``USE TEMP B-TREE FOR ORDER BY``. With
+TEST_DATABASE_URL pointing at MySQL, EXPLAIN must show no ``type ALL`` and
+no filesort on the paged statements.
+"""
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert, select
+
+from app import summary
+from app.database import SessionLocal, async_engine, engine
+from app.models import Claim, Item, Report, UserAccount
+
+ROWS = 3000
+USERS = 300
+
+LIST_ENDPOINTS = [
+    "/items/",
+    "/items/?status=found",
+    "/reports/",
+    "/reports/?report_type=lost",
+    "/reports/?status=open",
+    "/claims/",
+    "/claims/?status=pending",
+    "/users/",
+]
+DASHBOARD_ENDPOINTS = [
+    "/dashboard/stats/admin",
+    "/dashboard/stats/student",
+    "/users/dashboard/admin/pending_claims",
+]
+
+
+@pytest.fixture(scope="module")
+def populated(client, admin):
+    """Enough rows that a full scan is never the cheapest plan."""
+    user_id = client.get("/auth/me", headers=admin).json()["user_id"]
+    now = datetime.now()
+    with SessionLocal() as db:
+        db.execute(insert(UserAccount), [
+            {"name": f"user {i}", "roll_number": f"IDX{i:05d}", "password_hash": "-", "role_id": 1}
+            for i in range(USERS)
+        ])
+        user_ids = db.scalars(select(UserAccount.user_id)).all()
+        first = (db.scalar(select(Item.item_id).order_by(Item.item_id.desc()).limit(1)) or 0) + 1
+        db.execute(insert(Item), [
+            {"title": f"bottle {i}", "category_id": 1, "created_by": user_id,
+             "created_on": now - timedelta(minutes=i), "current_status": ("lost", "found")[i % 2]}
+            for i in range(ROWS)
+        ])
+        item_ids = range(first, first + ROWS)
+        db.execute(insert(Report), [
+            {"item_id": item_id, "reporter_id": user_ids[i % len(user_ids)], "report_type": ("lost", "found")[i % 2],
+             "location_id": 1, "reported_on": now - timedelta(minutes=i),
+             "status": ("open", "in_review", "resolved")[i % 3]}
+            for i, item_id in enumerate(item_ids)
+        ])
+        db.execute(insert(Claim), [
+            {"item_id": item_id, "claimer_id": user_ids[i % len(user_ids)], "claimed_on": now - timedelta(minutes=i),
+             "claim_status": ("pending", "approved", "rejected")[i % 3]}
+            for i, item_id in enumerate(item_ids)
+        ])
+        db.commit()
+        summary.rebuild(db)
+        for table in ("item", "item_summary", "report", "claim", "user_account", "stat_counter"):
+            db.connection().exec_driver_sql(f"ANALYZE{' TABLE' if _mysql() else ''} {table}")
+        db.commit()
+
+
+def _mysql():
+    return engine.dialect.name == "mysql"
+
+
+def _statements(client, headers, path):
+    """The SELECTs (with parameters) a request runs."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        response = client.get(path, headers=headers)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+    assert response.status_code == 200, response.text
+    return captured
+
+
+def _explain(statement, parameters):
+    prefix = "EXPLAIN " if _mysql() else "EXPLAIN QUERY PLAN "
+    with engine.connect() as conn:
+        return [dict(row) for row in conn.exec_driver_sql(prefix + statement, parameters).mappings()]
+
+
+# "SCAN report" or "SCAN cu LEFT-JOIN", but not "SCAN report USING INDEX ..."
+_SQLITE_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)(?!\()(\S+)(?!.* USING )")
+
+
+def _full_scans(plan):
+    if not _mysql():
+        return [match.group(1) for row in plan if (match := _SQLITE_SCAN.match(row["detail"]))]
+    return [
+        row["table"] for row in plan
+        # <derivedN> / <subqueryN> rows are materialised results, not tables
+        if row["table"] and not row["table"].startswith("<") and row["type"] == "ALL"
+    ]
+
+
+def _sorts(plan):
+    if not _mysql():
+        return [row["detail"] for row in plan if "TEMP B-TREE FOR ORDER BY" in row["detail"]]
+    # A filesort is reported on the first (driving) table of the plan
+    return [plan[0]["Extra"]] if "filesort" in (plan[0]["Extra"] or "").lower() else []
+
+
+@pytest.mark.parametrize("path", LIST_ENDPOINTS + DASHBOARD_ENDPOINTS)
+def test_queries_use_indexes(client, admin, populated, path):
+    for statement, parameters in _statements(client, admin, path):
+        plan = _explain(statement, parameters)
+        assert not _full_scans(plan), f"{path}: full scan in {plan} for {statement}"
+
+
+@pytest.mark.parametrize("path", LIST_ENDPOINTS + DASHBOARD_ENDPOINTS)
+def test_results_are_read_in_index_order(client, admin, populated, path):
+    statements = _statements(client, admin, path)
+    if _mysql():
+        # Checked on the page queries (the ones with a LIMIT) only
+        statements = [(s, p) for s, p in statements if "LIMIT" in s.upper()]
+        if path in DASHBOARD_ENDPOINTS:
+            pytest.skip("dashboard statements are not paged")
+    assert statements, f"{path}: no statement to check"
+    for statement, parameters in statements:
+        plan = _explain(statement, parameters)
+        assert not _sorts(plan), f"{path}: sort step in {plan} for {statement}"
@@ -0,0 +1,75 @@
+# tests/test_query_counts.py
+"""
+The list endpoints must run a fixed number of SQL statements per page,
+however many rows the page holds (no per-row lazy loads).
+"""
+import io
+
+import pytest
+from PIL import Image
+
+from .conftest import query_count
+
+LIST_ENDPOINTS = ["/items/", "/reports/", "/claims/", "/users/"]
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _add_rows(client, signup, admin, n: int):
+    """``n`` items, each with an image, a report and a claim by different users."""
+    for i in range(n):
+        owner = signup()
+        item = client.post("/items/", json={"title": f"umbrella {i}", "category_id": 1}, headers=owner)
+        assert item.status_code == 201, item.text
+        item_id = item.json()["item_id"]
+        image = client.post(
+            f"/items/{item_id}/images",
+            files={"file": ("photo.png", _png(), "image/png")},
+            headers=owner,
+        )
+        assert image.status_code == 201, image.text
+        report = client.post(
+            "/reports/",
+            json={"item_id": item_id, "report_type": "lost", "location_id": 1, "details": "left behind"},
+            headers=owner,
+        )
+        assert report.status_code == 200, report.text
+        claim = client.post("/claims/", json={"item_id": item_id}, headers=signup())
+        assert claim.status_code == 201, claim.text
+
+
+def _counts(client, admin, limit: int):
+    counts = {}
+    for path in LIST_ENDPOINTS:
+        response = client.get(f"{path}?limit={limit}", headers=admin)
+        assert response.status_code == 200, response.text
+        counts[path] = (query_count(response), len(response.json()))
+    return counts
+
+
+@pytest.fixture(scope="module")
+def page_counts(client, signup, admin):
+    # Other test modules share the database, so the page size is fixed by
+    # the limit rather than by how many rows exist
+    _add_rows(client, signup, admin, 12)
+    _counts(client, admin, 2)  # warm the principal and reference data caches
+    return _counts(client, admin, 2), _counts(client, admin, 12)
+
+
+@pytest.mark.parametrize("path", LIST_ENDPOINTS)
+def test_list_query_count_does_not_grow_with_rows(page_counts, path):
+    small, large = page_counts
+    small_queries, small_rows = small[path]
+    large_queries, large_rows = large[path]
+    assert (small_rows, large_rows) == (2, 12)
+    assert large_queries == small_queries, f"{path}: {small_queries} queries for {small_rows} rows, {large_queries} for {large_rows}"
+
+
+@pytest.mark.parametrize("path", LIST_ENDPOINTS)
+def test_list_query_count_is_small(page_counts, path):
+    _, large = page_counts
+    assert large[path][0] <= 4
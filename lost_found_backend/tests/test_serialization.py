@@ -0,0 +1,81 @@
+# tests/test_serialization.py
+"""
+Response bodies are built straight from column rows and encoded by orjson,
+skipping response_model validation. They must still match the response
+schemas, and the fast path must beat validating and encoding with the
+stdlib.
+"""
+import io
+import json
+import time
+from typing import List
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from PIL import Image
+from pydantic import TypeAdapter
+
+from app.database import SessionLocal
+from app.models import Claim, ItemSummary
+from app.queries import claim_rows, claim_to_dict, item_columns, summary_to_dict
+from app.responses import dumps
+from app.schemas import Claim as ClaimSchema, Item as ItemSchema
+
+ITEMS = TypeAdapter(List[ItemSchema])
+CLAIMS = TypeAdapter(List[ClaimSchema])
+
+
+@pytest.fixture(scope="module")
+def sample_rows(client, signup):
+    """One fully populated item row and claim row from the database."""
+    owner = signup()
+    item_id = client.post("/items/", json={"title": "laptop", "category_id": 1, "description": "grey"}, headers=owner).json()["item_id"]
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(buffer, format="PNG")
+    client.post(f"/items/{item_id}/images", files={"file": ("a.png", buffer.getvalue(), "image/png")}, headers=owner)
+    client.post("/reports/", json={"item_id": item_id, "report_type": "lost", "location_id": 1}, headers=owner)
+    claim_id = client.post("/claims/", json={"item_id": item_id, "claim_text": "mine"}, headers=signup()).json()["claim_id"]
+    with SessionLocal() as db:
+        item = db.execute(item_columns().where(ItemSummary.item_id == item_id)).one()
+        claim = db.execute(claim_rows().where(Claim.claim_id == claim_id)).one()
+    return item, claim
+
+
+def test_list_bodies_match_response_models(client, admin, sample_rows):
+    ITEMS.validate_json(client.get("/items/?limit=50").content)
+    CLAIMS.validate_json(client.get("/claims/", headers=admin).content)
+
+
+def _best_of(n, fn):
+    best = None
+    for _ in range(n):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None or elapsed < best else best
+    return best, result
+
+
+@pytest.mark.parametrize("kind, count", [("items", 1_000), ("claims", 10_000)])
+def test_fast_path_beats_validated_stdlib_encoding(sample_rows, record_property, kind, count):
+    item, claim = sample_rows
+    rows, to_dict, adapter = {
+        "items": ([item] * count, summary_to_dict, ITEMS),
+        "claims": ([claim] * count, claim_to_dict, CLAIMS),
+    }[kind]
+
+    def fast():
+        return dumps([to_dict(row) for row in rows])
+
+    def validated():
+        # What FastAPI does for a handler returning plain data with a response_model
+        models = adapter.validate_python([to_dict(row) for row in rows])
+        return json.dumps(jsonable_encoder(models)).encode()
+
+    fast_seconds, fast_body = _best_of(3, fast)
+    slow_seconds, slow_body = _best_of(3, validated)
+    record_property(f"{kind}_fast_ms", round(fast_seconds * 1000, 1))
+    record_property(f"{kind}_validated_ms", round(slow_seconds * 1000, 1))
+    # Same data either way
+    assert adapter.validate_json(fast_body) == adapter.validate_json(slow_body)
+    assert fast_seconds < slow_seconds
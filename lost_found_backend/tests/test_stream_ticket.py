@@ -0,0 +1,50 @@
+# tests/test_stream_ticket.py
+"""
+Browsers open the notification stream with a short-lived ticket in the
+query string, never with their access token; the ticket opens nothing else.
+"""
+from datetime import timedelta
+
+from app.auth import STREAM_TICKET_SCOPE, create_access_token, get_stream_user
+from app.database import AsyncSessionLocal
+
+
+def _user_id(client, headers):
+    return client.get("/auth/me", headers=headers).json()["user_id"]
+
+
+async def _stream_user(ticket):
+    async with AsyncSessionLocal() as db:
+        return await get_stream_user(ticket, db)
+
+
+def test_ticket_names_the_user(client, signup):
+    headers = signup()
+    response = client.post("/notifications/stream-ticket", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["expires_in"] == 60
+
+    user = client.portal.call(_stream_user, response.json()["ticket"])
+    assert user.user_id == _user_id(client, headers)
+
+
+def test_stream_refuses_access_tokens_in_the_query(client, signup):
+    access_token = signup()["Authorization"][7:]
+    assert client.get("/notifications/stream").status_code == 401
+    assert client.get(f"/notifications/stream?ticket={access_token}").status_code == 401
+    # The old parameter is ignored
+    assert client.get(f"/notifications/stream?token={access_token}").status_code == 401
+
+
+def test_ticket_is_not_an_access_token(client, signup):
+    ticket = client.post("/notifications/stream-ticket", headers=signup()).json()["ticket"]
+    assert client.get("/auth/me", headers={"Authorization": f"Bearer {ticket}"}).status_code == 401
+    assert client.get("/notifications/stream", headers={"Authorization": f"Bearer {ticket}"}).status_code == 401
+
+
+def test_expired_ticket_is_refused(client, signup):
+    user_id = _user_id(client, signup())
+    expired = create_access_token(
+        {"sub": str(user_id), "scope": STREAM_TICKET_SCOPE}, expires_delta=timedelta(seconds=-1)
+    )
+    assert client.get(f"/notifications/stream?ticket={expired}").status_code == 401
@@ -0,0 +1,109 @@
+# tests/test_uploads.py
+"""
+Image uploads: streamed to disk in chunks, capped partway through, checked
+by magic bytes, and only visible under their final name once complete.
+"""
+import asyncio
+import io
+import os
+import tracemalloc
+
+import pytest
+from PIL import Image
+from starlette.datastructures import Headers, UploadFile
+
+from app import uploads
+
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new("RGB", (16, 16), "blue").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _stored_files():
+    return set(os.listdir(uploads.UPLOAD_DIR))
+
+
+@pytest.fixture
+def item(client, signup):
+    owner = signup()
+    item_id = client.post("/items/", json={"title": "scarf"}, headers=owner).json()["item_id"]
+    return item_id, owner
+
+
+def test_upload_is_stored_under_its_final_name(client, item):
+    item_id, owner = item
+    before = _stored_files()
+    response = client.post(f"/items/{item_id}/images", files={"file": ("a.bin", _png(), "image/png")}, headers=owner)
+    assert response.status_code == 201, response.text
+    name = response.json()["file_path"].rsplit("/", 1)[-1]
+    assert name.endswith(".png")
+    new = _stored_files() - before
+    assert name in new
+    assert not [f for f in new if f.endswith(".part")]
+
+
+def test_file_type_comes_from_magic_bytes(client, item):
+    item_id, owner = item
+    before = _stored_files()
+    response = client.post(
+        f"/items/{item_id}/images",
+        files={"file": ("photo.png", b"#!/bin/sh\necho not an image\n", "image/png")},
+        headers=owner,
+    )
+    assert response.status_code == 415
+    assert _stored_files() == before
+
+
+def test_oversized_upload_rejected_by_content_length(client, item):
+    item_id, owner = item
+    body = PNG_MAGIC + b"\0" * (uploads.MAX_UPLOAD_BYTES + 1)
+    response = client.post(f"/items/{item_id}/images", files={"file": ("big.png", body, "image/png")}, headers=owner)
+    assert response.status_code == 413
+
+
+def test_oversized_upload_aborted_while_streaming(client, item, monkeypatch):
+    item_id, owner = item
+    # Below the middleware's cap, so the limit inside save_upload trips
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_BYTES", 2 * uploads.UPLOAD_CHUNK_SIZE)
+    before = _stored_files()
+    body = PNG_MAGIC + b"\0" * (3 * uploads.UPLOAD_CHUNK_SIZE)
+    response = client.post(f"/items/{item_id}/images", files={"file": ("big.png", body, "image/png")}, headers=owner)
+    assert response.status_code == 413
+    assert _stored_files() == before
+
+
+def test_concurrent_large_uploads_use_bounded_memory(tmp_path, record_property):
+    """Six uploads at the size cap (20 MB by default) at once stay within a few chunks each."""
+    size, concurrent = uploads.MAX_UPLOAD_BYTES, 6
+    source = tmp_path / "large.png"
+    with open(source, "wb") as f:
+        f.write(PNG_MAGIC)
+        f.truncate(size)
+
+    async def upload_all():
+        files = [
+            UploadFile(open(source, "rb"), filename="large.png", headers=Headers({"content-type": "image/png"}))
+            for _ in range(concurrent)
+        ]
+        return await asyncio.gather(*(uploads.save_upload(f) for f in files))
+
+    tracemalloc.start()
+    try:
+        names = asyncio.run(upload_all())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    try:
+        for name in names:
+            assert os.path.getsize(os.path.join(uploads.UPLOAD_DIR, name)) == size
+    finally:
+        for name in names:
+            os.remove(os.path.join(uploads.UPLOAD_DIR, name))
+    record_property("peak_mb", round(peak / 1024 / 1024, 1))
+    # Reading whole files would need size * concurrent (120 MB by default)
+    assert peak < concurrent * 4 * uploads.UPLOAD_CHUNK_SIZE
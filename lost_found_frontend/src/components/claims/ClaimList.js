@@ -1,26 +1,32 @@
 import React, { useState, useEffect } from 'react';
 import { Card, Table, Badge, Button, Form, Row, Col } from 'react-bootstrap';
 import { useNavigate } from 'react-router-dom';
-import { getClaims } from '../../services/claimService';
+import { getClaimsPage } from '../../services/claimService';
 import { useAuth } from '../../contexts/AuthContext';
 import Loading from '../common/Loading';
 
+const claimParams = (statusFilter) => {
+  const params = {};
+  if (statusFilter) params.status = statusFilter;
+  return params;
+};
+
 const ClaimList = () => {
   const [claims, setClaims] = useState([]);
   const [loading, setLoading] = useState(true);
   const [filter, setFilter] = useState('');
   const [statusFilter, setStatusFilter] = useState('');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const navigate = useNavigate();
   const { isAdmin } = useAuth();
 
   useEffect(() => {
     const fetchClaims = async () => {
       try {
-        const params = {};
-        if (statusFilter) params.status = statusFilter;
-        
-        const response = await getClaims(params);
-        setClaims(response);
+        const page = await getClaimsPage(claimParams(statusFilter));
+        setClaims(page.data);
+        setNextCursor(page.nextCursor);
       } catch (error) {
         console.error('Failed to fetch claims:', error);
       } finally {
@@ -31,6 +37,19 @@ const ClaimList = () => {
     fetchClaims();
   }, [statusFilter]);
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await getClaimsPage({ ...claimParams(statusFilter), cursor: nextCursor });
+      setClaims((loaded) => [...loaded, ...page.data]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Failed to fetch claims:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const getStatusBadge = (status) => {
     let variant = 'secondary';
     if (status === 'pending') variant = 'warning';
@@ -125,6 +144,14 @@ const ClaimList = () => {
         ) : (
           <p>No claims found matching your criteria.</p>
         )}
+
+        {nextCursor && (
+          <div className="text-center">
+            <Button variant="outline-secondary" onClick={loadMore} disabled={loadingMore}>
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </Button>
+          </div>
+        )}
       </Card.Body>
     </Card>
   );
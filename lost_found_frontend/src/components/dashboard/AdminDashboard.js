@@ -1,10 +1,15 @@
 import React, { useState, useEffect } from 'react';
 import { Card, Table, Badge, Button } from 'react-bootstrap';
 import api from '../../services/api';
+import { getAdminStats } from '../../services/dashboardService';
+import { useNotifications } from '../../hooks/useNotifications';
 import Loading from '../common/Loading';
+import NotificationPanel from './NotificationPanel';
+import StatsSummary from './StatsSummary';
 
 const AdminDashboard = () => {
   const [pendingClaims, setPendingClaims] = useState([]);
+  const [stats, setStats] = useState(null);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
@@ -20,13 +25,57 @@ const AdminDashboard = () => {
     };
 
     fetchPendingClaims();
+    getAdminStats()
+      .then(setStats)
+      .catch((error) => console.error('Failed to fetch dashboard stats:', error));
   }, []);
 
+  // Keep the queue depth in step with pushed events between stats loads
+  const adjustPending = (delta) => {
+    setStats((current) => current && {
+      ...current,
+      pending_claims: Math.max(current.pending_claims + delta, 0),
+    });
+  };
+
+  const removeClaim = (claimId) => {
+    setPendingClaims((current) => current.filter((c) => c.claim_id !== claimId));
+  };
+
+  // Patch the pending list from pushed events instead of re-fetching it
+  const handleEvent = async (kind, payload) => {
+    if (kind === 'claim_decided') {
+      removeClaim(payload.claim_id);
+      adjustPending(-1);
+    } else if (kind === 'claim_new') {
+      adjustPending(1);
+      try {
+        const [claim, item] = await Promise.all([
+          api.get(`/claims/${payload.claim_id}`),
+          api.get(`/items/${payload.item_id}`),
+        ]);
+        const row = {
+          claim_id: claim.data.claim_id,
+          item_id: claim.data.item_id,
+          title: claim.data.item_title,
+          claimer_id: claim.data.claimer_id,
+          claimer_name: claim.data.claimer_name,
+          claimed_on: claim.data.claimed_on,
+          current_status: item.data.current_status,
+        };
+        setPendingClaims((current) => [row, ...current.filter((c) => c.claim_id !== row.claim_id)]);
+      } catch (error) {
+        console.error('Failed to fetch new claim:', error);
+      }
+    }
+  };
+
+  const { notifications, markRead, markAllRead } = useNotifications(handleEvent);
+
   const handleApproveClaim = async (claimId) => {
     try {
       await api.post(`/claims/${claimId}/approve`);
-      const updated = await api.get('/users/dashboard/admin/pending_claims');
-      setPendingClaims(updated.data);
+      removeClaim(claimId);
     } catch (error) {
       console.error('Failed to approve claim:', error);
     }
@@ -40,6 +89,23 @@ const AdminDashboard = () => {
     <Card>
       <Card.Header as="h5">Admin Dashboard</Card.Header>
       <Card.Body>
+        <NotificationPanel
+          notifications={notifications}
+          onMarkRead={markRead}
+          onMarkAllRead={markAllRead}
+        />
+
+        {stats && (
+          <StatsSummary
+            groups={[
+              { title: 'Pending Queue', counts: { pending_claims: stats.pending_claims } },
+              { title: 'Items', counts: stats.items_by_status },
+              { title: 'Reports', counts: { ...stats.reports_by_type, ...stats.reports_by_status } },
+              { title: 'Claims', counts: stats.claims_by_status },
+            ]}
+          />
+        )}
+
         <h5>Pending Claims</h5>
 
         {pendingClaims.length > 0 ? (
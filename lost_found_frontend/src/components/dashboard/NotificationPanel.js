@@ -0,0 +1,41 @@
+import React from 'react';
+import { ListGroup, Button, Badge } from 'react-bootstrap';
+
+const NotificationPanel = ({ notifications, onMarkRead, onMarkAllRead }) => {
+  if (notifications.length === 0) {
+    return null;
+  }
+
+  return (
+    <div className="mb-4">
+      <div className="d-flex justify-content-between align-items-center mb-2">
+        <h5 className="mb-0">
+          Notifications <Badge bg="danger">{notifications.length}</Badge>
+        </h5>
+        <Button variant="link" size="sm" onClick={onMarkAllRead}>
+          Mark all as read
+        </Button>
+      </div>
+      <ListGroup>
+        {notifications.map((n) => (
+          <ListGroup.Item
+            key={n.notification_id}
+            className="d-flex justify-content-between align-items-center"
+          >
+            <span>
+              {n.item_id ? <a href={`/items/${n.item_id}`}>{n.message}</a> : n.message}
+              <small className="text-muted ms-2">
+                {new Date(n.created_on).toLocaleString()}
+              </small>
+            </span>
+            <Button variant="outline-secondary" size="sm" onClick={() => onMarkRead(n.notification_id)}>
+              Dismiss
+            </Button>
+          </ListGroup.Item>
+        ))}
+      </ListGroup>
+    </div>
+  );
+};
+
+export default NotificationPanel;
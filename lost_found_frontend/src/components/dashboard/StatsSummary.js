@@ -0,0 +1,27 @@
+import React from 'react';
+import { Card, Col, ListGroup, Row } from 'react-bootstrap';
+
+const label = (key) => key.replace(/_/g, ' ');
+
+// Counters from /dashboard/stats/*, one card per group ({ title, counts })
+const StatsSummary = ({ groups }) => (
+  <Row className="mb-4">
+    {groups.map(({ title, counts }) => (
+      <Col key={title} md={6} lg={3} className="mb-3">
+        <Card className="h-100">
+          <Card.Header>{title}</Card.Header>
+          <ListGroup variant="flush">
+            {Object.entries(counts).map(([key, count]) => (
+              <ListGroup.Item key={key} className="d-flex justify-content-between">
+                <span className="text-capitalize">{label(key)}</span>
+                <strong>{count}</strong>
+              </ListGroup.Item>
+            ))}
+          </ListGroup>
+        </Card>
+      </Col>
+    ))}
+  </Row>
+);
+
+export default StatsSummary;
@@ -3,10 +3,15 @@ import { Card, Table, Badge, Button, Alert } from 'react-bootstrap';
 import { useAuth } from '../../contexts/AuthContext';
 import api from '../../services/api';
 import { updateReportStatus } from '../../services/reportService';
+import { getStudentStats } from '../../services/dashboardService';
+import { useNotifications } from '../../hooks/useNotifications';
 import Loading from '../common/Loading';
+import NotificationPanel from './NotificationPanel';
+import StatsSummary from './StatsSummary';
 
 const StudentDashboard = () => {
   const [dashboardData, setDashboardData] = useState([]);
+  const [stats, setStats] = useState(null);
   const [loading, setLoading] = useState(true);
   const [updating, setUpdating] = useState(false);
   const [message, setMessage] = useState({ type: '', text: '' });
@@ -24,10 +29,30 @@ const StudentDashboard = () => {
     }
   };
 
+  const fetchStats = () => {
+    getStudentStats()
+      .then(setStats)
+      .catch((error) => console.error('Failed to fetch dashboard stats:', error));
+  };
+
   useEffect(() => {
     fetchDashboardData();
+    fetchStats();
   }, []);
 
+  const patchRows = (match, changes) => {
+    setDashboardData((current) => current.map((row) => (match(row) ? { ...row, ...changes } : row)));
+  };
+
+  // Item status changes arrive as notifications; patch the affected rows
+  const handleEvent = (kind, payload) => {
+    if (kind === 'item_claimed' || kind === 'claim_approved') {
+      patchRows((row) => row.item_id === payload.item_id, { current_status: 'claimed' });
+    }
+  };
+
+  const { notifications, markRead, markAllRead } = useNotifications(handleEvent);
+
   const getStatusBadge = (status) => {
     let variant = 'secondary';
     if (status === 'lost') variant = 'danger';
@@ -65,10 +90,12 @@ const StudentDashboard = () => {
     setMessage({ type: '', text: '' });
     
     try {
-      await updateReportStatus(reportId, 'resolved');
+      const report = await updateReportStatus(reportId, 'resolved');
       setMessage({ type: 'success', text: 'Report marked as completed successfully!' });
-      // Refresh dashboard data
-      await fetchDashboardData();
+      // Resolving a report completes its item
+      patchRows((row) => row.report_id === reportId, { status: 'resolved' });
+      patchRows((row) => row.item_id === report.item_id, { current_status: 'completed' });
+      fetchStats();
     } catch (error) {
       console.error('Failed to update report status:', error);
       setMessage({ type: 'danger', text: error.response?.data?.detail || 'Failed to update report status' });
@@ -88,6 +115,23 @@ const StudentDashboard = () => {
         <h5>Welcome, {user?.name}!</h5>
         <p>Here's a summary of your lost and found reports:</p>
         
+        <NotificationPanel
+          notifications={notifications}
+          onMarkRead={markRead}
+          onMarkAllRead={markAllRead}
+        />
+
+        {stats && (
+          <StatsSummary
+            groups={[
+              { title: 'My Items', counts: stats.items_by_status },
+              { title: 'My Reports', counts: stats.reports_by_status },
+              { title: 'Report Types', counts: stats.reports_by_type },
+              { title: 'My Claims', counts: stats.claims_by_status },
+            ]}
+          />
+        )}
+
         {message.text && (
           <Alert variant={message.type} dismissible onClose={() => setMessage({ type: '', text: '' })}>
             {message.text}
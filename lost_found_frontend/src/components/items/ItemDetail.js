@@ -193,15 +193,19 @@ const ItemDetail = () => {
                 <h5 className="text-primary mb-3"><i className="bi bi-images me-2"></i>Images</h5>
                 {item.images && item.images.length > 0 ? (
                   <div className="d-grid gap-2">
-                    {item.images.map((image) => (
+                    {item.images.map((image) => {
+                      // Prefer the resized rendition; fall back to the original
+                      const path = image.medium_path || image.file_path;
+                      return (
                       <img
                         key={image.image_id}
-                        src={image.file_path.startsWith('http') ? image.file_path : `http://127.0.0.1:8000${image.file_path}`}
+                        src={path.startsWith('http') ? path : `http://127.0.0.1:8000${path}`}
                         alt={item.title}
                         className="item-image"
                         style={{ width: '100%', maxHeight: '300px', objectFit: 'cover' }}
                       />
-                    ))}
+                      );
+                    })}
                   </div>
                 ) : (
                   <div className="text-center p-4 bg-light rounded">
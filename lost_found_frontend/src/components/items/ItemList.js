@@ -1,24 +1,38 @@
 import React, { useState, useEffect } from 'react';
 import { Card, Table, Badge, Button, Form, Row, Col } from 'react-bootstrap';
 import { useNavigate } from 'react-router-dom';
-import { getItems } from '../../services/itemService';
+import { getItemsPage, searchItems } from '../../services/itemService';
 import Loading from '../common/Loading';
 
+// The table only needs the card fields
+const itemParams = (statusFilter) => {
+  const params = { view: 'card' };
+  if (statusFilter) params.status = statusFilter;
+  return params;
+};
+
 const ItemList = () => {
   const [items, setItems] = useState([]);
   const [loading, setLoading] = useState(true);
   const [filter, setFilter] = useState('');
   const [statusFilter, setStatusFilter] = useState('');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const navigate = useNavigate();
 
   useEffect(() => {
     const fetchItems = async () => {
       try {
-        const params = {};
-        if (statusFilter) params.status = statusFilter;
-        
-        const response = await getItems(params);
-        setItems(response);
+        const query = filter.trim();
+        if (query) {
+          // Search results are ranked by relevance and come in one page
+          setItems(await searchItems({ ...itemParams(statusFilter), q: query }));
+          setNextCursor(null);
+        } else {
+          const page = await getItemsPage(itemParams(statusFilter));
+          setItems(page.data);
+          setNextCursor(page.nextCursor);
+        }
       } catch (error) {
         console.error('Failed to fetch items:', error);
       } finally {
@@ -26,8 +40,23 @@ const ItemList = () => {
       }
     };
 
-    fetchItems();
-  }, [statusFilter]);
+    // Debounce so typing doesn't fire a request per keystroke
+    const timer = setTimeout(fetchItems, 300);
+    return () => clearTimeout(timer);
+  }, [statusFilter, filter]);
+
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await getItemsPage({ ...itemParams(statusFilter), cursor: nextCursor });
+      setItems((loaded) => [...loaded, ...page.data]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Failed to fetch items:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   useEffect(() => {
     const sp = new URLSearchParams(window.location.search);
@@ -48,11 +77,6 @@ const ItemList = () => {
     return <Badge bg={variant} className="status-badge">{status}</Badge>;
   };
 
-  const filteredItems = items.filter(item => 
-    item.title.toLowerCase().includes(filter.toLowerCase()) ||
-    (item.description && item.description.toLowerCase().includes(filter.toLowerCase()))
-  );
-
   if (loading) {
     return <Loading />;
   }
@@ -90,7 +114,7 @@ const ItemList = () => {
           </Col>
         </Row>
         
-        {filteredItems.length > 0 ? (
+        {items.length > 0 ? (
           <Table striped bordered hover responsive>
             <thead>
               <tr>
@@ -103,7 +127,7 @@ const ItemList = () => {
               </tr>
             </thead>
             <tbody>
-              {filteredItems.map((item) => (
+              {items.map((item) => (
                 <tr key={item.item_id}>
                   <td>{item.title}</td>
                   <td>{item.category_name || 'N/A'}</td>
@@ -134,6 +158,14 @@ const ItemList = () => {
         ) : (
           <p>No items found matching your criteria.</p>
         )}
+
+        {nextCursor && (
+          <div className="text-center">
+            <Button variant="outline-secondary" onClick={loadMore} disabled={loadingMore}>
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </Button>
+          </div>
+        )}
       </Card.Body>
     </Card>
   );
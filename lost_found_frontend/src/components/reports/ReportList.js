@@ -1,26 +1,32 @@
 import React, { useState, useEffect } from 'react';
 import { Card, Table, Badge, Button, Form, Row, Col } from 'react-bootstrap';
 import { useNavigate } from 'react-router-dom';
-import { getReports } from '../../services/reportService';
+import { getReportsPage } from '../../services/reportService';
 import Loading from '../common/Loading';
 
+const reportParams = (typeFilter, statusFilter) => {
+  const params = {};
+  if (typeFilter) params.report_type = typeFilter;
+  if (statusFilter) params.status = statusFilter;
+  return params;
+};
+
 const ReportList = () => {
   const [reports, setReports] = useState([]);
   const [loading, setLoading] = useState(true);
   const [filter, setFilter] = useState('');
   const [typeFilter, setTypeFilter] = useState('');
   const [statusFilter, setStatusFilter] = useState('');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const navigate = useNavigate();
 
   useEffect(() => {
     const fetchReports = async () => {
       try {
-        const params = {};
-        if (typeFilter) params.report_type = typeFilter;
-        if (statusFilter) params.status = statusFilter;
-        
-        const response = await getReports(params);
-        setReports(response);
+        const page = await getReportsPage(reportParams(typeFilter, statusFilter));
+        setReports(page.data);
+        setNextCursor(page.nextCursor);
       } catch (error) {
         console.error('Failed to fetch reports:', error);
       } finally {
@@ -31,6 +37,19 @@ const ReportList = () => {
     fetchReports();
   }, [typeFilter, statusFilter]);
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await getReportsPage({ ...reportParams(typeFilter, statusFilter), cursor: nextCursor });
+      setReports((loaded) => [...loaded, ...page.data]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Failed to fetch reports:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const getReportTypeBadge = (type) => {
     let variant = 'secondary';
     if (type === 'lost') variant = 'danger';
@@ -134,6 +153,14 @@ const ReportList = () => {
         ) : (
           <p>No reports found matching your criteria.</p>
         )}
+
+        {nextCursor && (
+          <div className="text-center">
+            <Button variant="outline-secondary" onClick={loadMore} disabled={loadingMore}>
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </Button>
+          </div>
+        )}
       </Card.Body>
     </Card>
   );
@@ -0,0 +1,53 @@
+import { useCallback, useEffect, useRef, useState } from 'react';
+import {
+  getNotifications,
+  markAllNotificationsRead,
+  markNotificationRead,
+  openNotificationStream,
+} from '../services/notificationService';
+
+// Unread inbox kept current by the notification stream. onEvent(kind, payload)
+// lets a dashboard patch its own lists instead of re-fetching them.
+export const useNotifications = (onEvent) => {
+  const [notifications, setNotifications] = useState([]);
+  const onEventRef = useRef(onEvent);
+  onEventRef.current = onEvent;
+
+  const loadInbox = useCallback(async () => {
+    try {
+      setNotifications(await getNotifications({ limit: 20 }));
+    } catch (error) {
+      console.error('Failed to fetch notifications:', error);
+    }
+  }, []);
+
+  useEffect(() => {
+    // The inbox is reloaded on every (re)connect to pick up anything
+    // published while the stream was down.
+    const close = openNotificationStream((kind, payload) => {
+      if (payload.notification_id) {
+        setNotifications((current) => [
+          payload,
+          ...current.filter((n) => n.notification_id !== payload.notification_id),
+        ]);
+      }
+      if (onEventRef.current) {
+        onEventRef.current(kind, payload);
+      }
+    }, loadInbox);
+    loadInbox();
+    return close;
+  }, [loadInbox]);
+
+  const markRead = async (notificationId) => {
+    await markNotificationRead(notificationId);
+    setNotifications((current) => current.filter((n) => n.notification_id !== notificationId));
+  };
+
+  const markAllRead = async () => {
+    await markAllNotificationsRead();
+    setNotifications([]);
+  };
+
+  return { notifications, markRead, markAllRead };
+};
@@ -34,4 +34,7 @@ api.interceptors.response.use(
   }
 );
 
+// Token for the next page of a cursor-paginated list, or null on the last page
+export const nextCursor = (response) => response.headers['x-next-cursor'] || null;
+
 export default api;
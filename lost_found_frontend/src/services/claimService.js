@@ -1,10 +1,16 @@
-import api from './api';
+import api, { nextCursor } from './api';
 
 export const getClaims = async (params = {}) => {
   const response = await api.get('/claims', { params });
   return response.data;
 };
 
+// One page of claims; pass nextCursor back as params.cursor for the next
+export const getClaimsPage = async (params = {}) => {
+  const response = await api.get('/claims', { params });
+  return { data: response.data, nextCursor: nextCursor(response) };
+};
+
 export const getClaim = async (claimId) => {
   const response = await api.get(`/claims/${claimId}`);
   return response.data;
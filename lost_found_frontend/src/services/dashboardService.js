@@ -0,0 +1,11 @@
+import api from './api';
+
+export const getStudentStats = async () => {
+  const response = await api.get('/dashboard/stats/student');
+  return response.data;
+};
+
+export const getAdminStats = async (days = 30) => {
+  const response = await api.get('/dashboard/stats/admin', { params: { days } });
+  return response.data;
+};
@@ -1,10 +1,21 @@
-import api from './api';
+import api, { nextCursor } from './api';
 
 export const getItems = async (params = {}) => {
   const response = await api.get('/items/', { params });
   return response.data;
 };
 
+// One page of items; pass nextCursor back as params.cursor for the next
+export const getItemsPage = async (params = {}) => {
+  const response = await api.get('/items/', { params });
+  return { data: response.data, nextCursor: nextCursor(response) };
+};
+
+export const searchItems = async (params = {}) => {
+  const response = await api.get('/items/search', { params });
+  return response.data;
+};
+
 export const getItem = async (itemId) => {
   const response = await api.get(`/items/${itemId}`);
   return response.data;
@@ -0,0 +1,103 @@
+import api from './api';
+import { API_BASE_URL } from '../utils/constants';
+
+// Event kinds pushed on the notification stream
+export const NOTIFICATION_EVENTS = [
+  'claim_new',
+  'claim_approved',
+  'claim_rejected',
+  'claim_decided',
+  'item_claimed',
+  'match',
+];
+
+export const getNotifications = async (params = {}) => {
+  const response = await api.get('/notifications/', { params });
+  return response.data;
+};
+
+export const getUnreadCount = async () => {
+  const response = await api.get('/notifications/unread-count');
+  return response.data.unread;
+};
+
+export const markNotificationRead = async (notificationId) => {
+  await api.post(`/notifications/${notificationId}/read`);
+};
+
+export const markAllNotificationsRead = async () => {
+  await api.post('/notifications/read-all');
+};
+
+export const getStreamTicket = async () => {
+  const response = await api.post('/notifications/stream-ticket');
+  return response.data.ticket;
+};
+
+// Matches the retry interval the server sends on the stream
+const RECONNECT_MS = 5000;
+
+// Opens the server-sent event stream. onEvent(kind, payload) is called for
+// every event, onOpen on every (re)connect. Each connection is opened with a
+// short-lived stream ticket rather than the access token, which would end up
+// in server logs. Returns a function that closes it.
+export const openNotificationStream = (onEvent, onOpen) => {
+  if (!localStorage.getItem('token') || typeof EventSource === 'undefined') {
+    return () => {};
+  }
+
+  let source = null;
+  let timer = null;
+  let closed = false;
+
+  const reconnect = () => {
+    if (!closed) {
+      timer = setTimeout(connect, RECONNECT_MS);
+    }
+  };
+
+  const connect = async () => {
+    let ticket;
+    try {
+      ticket = await getStreamTicket();
+    } catch (error) {
+      // Signed out: nothing to reconnect as
+      if (error.response?.status !== 401) {
+        reconnect();
+      }
+      return;
+    }
+    if (closed) {
+      return;
+    }
+
+    source = new EventSource(
+      `${API_BASE_URL}/notifications/stream?ticket=${encodeURIComponent(ticket)}`
+    );
+    NOTIFICATION_EVENTS.forEach((kind) => {
+      source.addEventListener(kind, (e) => onEvent(kind, JSON.parse(e.data)));
+    });
+    if (onOpen) {
+      source.onopen = onOpen;
+    }
+    // EventSource retries a dropped connection with the same URL; once the
+    // ticket has expired the server refuses it and the source gives up, so
+    // start again with a new ticket.
+    const current = source;
+    current.onerror = () => {
+      if (current.readyState === EventSource.CLOSED) {
+        current.close();
+        reconnect();
+      }
+    };
+  };
+
+  connect();
+  return () => {
+    closed = true;
+    clearTimeout(timer);
+    if (source) {
+      source.close();
+    }
+  };
+};
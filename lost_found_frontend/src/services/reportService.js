@@ -1,4 +1,4 @@
-import api from './api';
+import api, { nextCursor } from './api';
 
 // Fetch all items
 export const getItems = async (params = {}) => {
@@ -67,6 +67,12 @@ export const getReports = async (params = {}) => {
   }
 };
 
+// One page of reports; pass nextCursor back as params.cursor for the next
+export const getReportsPage = async (params = {}) => {
+  const response = await api.get('/reports', { params });
+  return { data: response.data, nextCursor: nextCursor(response) };
+};
+
 export const getReport = async (reportId) => {
   const response = await api.get(`/reports/${reportId}`);
   return response.data;